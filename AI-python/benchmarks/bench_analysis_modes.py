@@ -0,0 +1,78 @@
+"""
+Benchmark: /analyze latency in each analysis mode against its target.
+
+Run from AI-python/:
+
+    python -m benchmarks.bench_analysis_modes [--pages 20] [--repeat 3] [--ml]
+
+Each mode runs what /analyze runs for it on the same synthetic lease PDF:
+extraction on the PDF worker processes (first pages only in quick mode,
+tables in deep mode), then DocumentAnalysisService.analyze_document with
+auto-classification. Targets are in services.analysis_modes. Without --ml the
+models aren't loaded, so deep mode's summary falls back to the extractive one
+and its time excludes BART; pass --ml to load them (slow, needs the weights).
+"""
+
+import argparse
+import time
+
+from benchmarks.corpus import make_lease_pdf
+from config.settings import get_settings
+from services.analysis_modes import AnalysisMode, analysis_profile
+from services.analysis_service import DocumentAnalysisService
+from services.pdf_plumber_extractor import extract_document_content
+from services.worker_pools import get_worker_pools
+
+
+def analyze(pdf: bytes, mode: AnalysisMode, service: DocumentAnalysisService, ml_service):
+    settings = get_settings()
+    profile = analysis_profile(mode.value)
+    start = time.perf_counter()
+    content = extract_document_content(
+        pdf, profile.tables, False, get_worker_pools().pdf, settings.pdf_workers,
+        settings.pdf_page_timeout, settings.pdf_min_pages_per_shard, None, False, profile.max_pages
+    )
+    extracted = time.perf_counter()
+    analysis = service.analyze_document(content["text"], "general", ml_service, mode.value)
+    return extracted - start, time.perf_counter() - extracted, analysis
+
+
+def main(pages: int, repeat: int, ml: bool):
+    ml_service = None
+    if ml:
+        from services.ml_service import MLService
+        ml_service = MLService()
+        ml_service.load_models()
+
+    pdf = make_lease_pdf(pages, table_rows=8, table_every=4)
+    service = DocumentAnalysisService()
+    service.start_executors()
+    try:
+        # Warm the PDF workers and the pattern registry before timing
+        analyze(pdf, AnalysisMode.QUICK, service, ml_service)
+
+        print(f"{pages}-page lease, best of {repeat}{'' if ml else ', models not loaded'}")
+        for mode in AnalysisMode:
+            runs = [analyze(pdf, mode, service, ml_service) for _ in range(repeat)]
+            extract_seconds, analyze_seconds, analysis = min(runs, key=lambda run: run[0] + run[1])
+            total = extract_seconds + analyze_seconds
+            target = analysis_profile(mode.value).latency_target
+            metadata = analysis.analysis_metadata
+            stages = [name for name in metadata["stage_timings"] if name != "classification"]
+            print(f"  {mode.value:<8} extract {extract_seconds:6.2f}s  analyze {analyze_seconds:6.2f}s  "
+                  f"total {total:6.2f}s  target {target:5.1f}s  {'ok' if total <= target else 'OVER'}  "
+                  f"{metadata['word_count']} words, {len(analysis.risks)} risks, "
+                  f"{len(analysis.clauses)} clauses, {len(analysis.entities)} entities")
+            print(f"           stages: {', '.join(sorted(stages))}")
+    finally:
+        service.shutdown_executors()
+        get_worker_pools().shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--ml", action="store_true")
+    args = parser.parse_args()
+    main(args.pages, args.repeat, args.ml)
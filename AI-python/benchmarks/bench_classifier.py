@@ -0,0 +1,103 @@
+"""
+Benchmark: DocumentClassifier's one-pass engine against the per-type loop it replaced.
+
+Run from AI-python/:
+
+    python -m benchmarks.bench_classifier [--repeat 5]
+
+The per-type loop is reproduced here as the reference. Both score the same
+documents (synthetic leases, and one-paragraph documents built from each
+type's own indicators) and must agree exactly on every type's score. The
+scaling rows pad the 19 patterned types with generated indicators for every
+other DocumentType, showing how each approach grows with the type count.
+"""
+
+import argparse
+import re
+import time
+from typing import Any, Dict, List
+
+from benchmarks.corpus import make_lease_text
+from services.classification_engine import ClassificationEngine
+from services.document_type import DocumentClassifier, DocumentType
+from services.pattern_registry import CompiledPattern, DEFAULT_FLAGS, get_pattern_registry
+from services.prepared_document import PreparedDocument
+
+
+def legacy_scores(text: str, classification_patterns: Dict[Any, Dict[str, Any]]) -> Dict[Any, float]:
+    """The scoring loop classify_document used before the engine"""
+    text_lower = text.lower()
+    scores = {}
+    for doc_type, patterns in classification_patterns.items():
+        score = 0
+        for compiled in patterns["strong_indicators"]:
+            score += len(compiled.regex.findall(text_lower)) * 3
+        for compiled in patterns["moderate_indicators"]:
+            score += len(compiled.regex.findall(text_lower)) * 2
+        for word in patterns["context_words"]:
+            score += min(text_lower.count(word), 5)
+        scores[doc_type] = min(score / (len(text.split()) * 0.01), 1.0)
+    return scores
+
+
+def padded_patterns(classification_patterns: Dict[Any, Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+    """The real patterns plus generated ones for every DocumentType without any"""
+    def compile_all(patterns: List[str]) -> List[CompiledPattern]:
+        return [CompiledPattern(re.compile(pattern, DEFAULT_FLAGS), "bench") for pattern in patterns]
+
+    padded = dict(classification_patterns)
+    for doc_type in DocumentType:
+        if doc_type in padded or doc_type is DocumentType.GENERAL:
+            continue
+        words = doc_type.value.split("_")
+        padded[doc_type] = {
+            "strong_indicators": compile_all([r"\s+".join(words), r"this\s+" + r"\s+".join(words)]),
+            "moderate_indicators": compile_all([rf"{word}\s+(?:terms|provisions)" for word in words]),
+            "context_words": words + ["party", "notice"],
+        }
+    return padded
+
+
+def build_documents() -> Dict[str, str]:
+    documents = {f"lease-{pages}p": make_lease_text(pages) for pages in (1, 10, 100)}
+    for doc_type, patterns in DocumentClassifier.CLASSIFICATION_PATTERNS.items():
+        phrases = [re.sub(r"\\s\+|\\s\*", " ", re.sub(r"\(\?:([^|)]*)[^)]*\)\??", r"\1", pattern))
+                   for pattern in patterns["strong_indicators"] + patterns["moderate_indicators"]]
+        documents[doc_type.value] = ". ".join(phrases + patterns["context_words"]) + "."
+    return documents
+
+
+def best_time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat: int):
+    registry = get_pattern_registry()
+    patterns = registry.get_classification_patterns()
+    documents = build_documents()
+
+    for label, type_patterns in (("patterned types", patterns), ("all types", padded_patterns(patterns))):
+        engine = ClassificationEngine(type_patterns)
+        for text in documents.values():
+            legacy = list(legacy_scores(text, type_patterns).values())
+            assert engine.score(PreparedDocument(text))[0].tolist() == legacy, "engine scores differ"
+
+        print(f"{label}: {len(type_patterns)} types")
+        for name in ("lease-1p", "lease-10p", "lease-100p"):
+            text = documents[name]
+            legacy_seconds = best_time(lambda: legacy_scores(text, type_patterns), repeat)
+            engine_seconds = best_time(lambda: engine.score(PreparedDocument(text)), repeat)
+            print(f"  {name:<10} loop {legacy_seconds * 1000:8.2f} ms  engine {engine_seconds * 1000:8.2f} ms  "
+                  f"x{legacy_seconds / engine_seconds:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.repeat)
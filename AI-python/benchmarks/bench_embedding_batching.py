@@ -0,0 +1,85 @@
+"""
+Benchmark: embedding throughput vs latency under micro-batching.
+
+Run from AI-python/ (downloads the embedding model on first use):
+
+    python -m benchmarks.bench_embedding_batching [--clients 32] [--duration 10]
+
+`clients` closed-loop callers each embed one paragraph at a time through an
+EmbeddingBatcher on a single inference thread, as /embed does. The first row
+(batch size 1) is the unbatched baseline; the others vary the batch window.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from sentence_transformers import SentenceTransformer
+
+from benchmarks.corpus import make_paragraphs
+from config.settings import MODEL_CONFIGS, get_settings
+from services.embedding_batcher import EmbeddingBatcher
+from services.ml_service import MLService
+from services.worker_pools import BoundedExecutor
+
+
+async def client(batcher: EmbeddingBatcher, texts: List[str], deadline: float, latencies: List[float]):
+    i = 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await batcher.embed(texts[i % len(texts)])
+        latencies.append(time.perf_counter() - start)
+        i += 1
+
+
+async def run(ml_service: MLService, texts: List[str], clients: int, duration: float,
+              batch_size: int, window_ms: float) -> str:
+    pool = BoundedExecutor("inference", ThreadPoolExecutor(max_workers=1), 1, clients)
+    batcher = EmbeddingBatcher(
+        ml_service.get_embeddings, pool,
+        max_batch_size=batch_size, max_wait_ms=window_ms, max_pending=clients
+    )
+    latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        client(batcher, texts[n::clients] or texts, deadline, latencies) for n in range(clients)
+    ))
+    await batcher.close()
+    pool.shutdown()
+
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    stats = batcher.stats()
+    return (f"batch<={batch_size:<3} window={window_ms:>5.1f}ms  "
+            f"{len(latencies) / duration:8.1f} req/s  "
+            f"p50={statistics.median(latencies) * 1000:7.1f}ms  p95={p95 * 1000:7.1f}ms  "
+            f"avg batch={stats['avg_batch_size']}")
+
+
+def main(clients: int, duration: float, windows: List[float]):
+    settings = get_settings()
+    ml_service = MLService()
+    ml_service.embedder = SentenceTransformer(
+        MODEL_CONFIGS["embedding"]["model_name"],
+        device=MODEL_CONFIGS["embedding"]["device"]
+    )
+    texts = make_paragraphs(max(256, clients * 4))
+    ml_service.get_embeddings(texts[:8])  # warm up
+
+    print(f"{clients} concurrent clients, {duration:.0f}s per row")
+    print(asyncio.run(run(ml_service, texts, clients, duration, 1, 0.0)))
+    for window_ms in windows:
+        print(asyncio.run(run(ml_service, texts, clients, duration, settings.embedding_batch_size, window_ms)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--windows", type=float, nargs="+", default=[0.0, 2.0, 5.0, 10.0, 20.0],
+                        help="batch windows to try, in milliseconds")
+    args = parser.parse_args()
+    main(args.clients, args.duration, args.windows)
@@ -0,0 +1,72 @@
+"""
+Benchmark: embedding a re-upload-heavy workload with and without the embedding cache.
+
+Run from AI-python/:
+
+    python -m benchmarks.bench_embedding_cache [--documents 20] [--unique 8] [--pages 5]
+
+The workload is `documents` synthetic leases drawn from `unique` distinct
+ones, as happens when the same contracts are uploaded again. Every document
+is chunked and its chunks embedded with MLService.get_embedding_matrix, in
+four configurations: no cache; a cold cache; the same cache again (in-process
+LRU hits); and a fresh cache over the same directory (vector file hits, as
+after a restart). Cached embeddings must equal uncached ones.
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from benchmarks.corpus import make_lease_text
+from config.settings import MODEL_CONFIGS
+from services.document_chunker import DocumentChunker
+from services.embedding_cache import EmbeddingCache
+from services.ml_service import MLService
+
+
+def embed_all(service: MLService, documents):
+    start = time.perf_counter()
+    matrices = [service.get_embedding_matrix([chunk.text for chunk in chunks]) for chunks in documents]
+    return time.perf_counter() - start, matrices
+
+
+def main(documents: int, unique: int, pages: int):
+    config = MODEL_CONFIGS["embedding"]
+    service = MLService()
+    service.embedder = SentenceTransformer(config["model_name"], device=config["device"])
+    chunker = DocumentChunker()
+    corpus = [chunker.chunk(make_lease_text(pages, seed=i % unique)) for i in range(documents)]
+    chunk_count = sum(len(chunks) for chunks in corpus)
+    print(f"{documents} documents ({unique} distinct), {chunk_count} chunks")
+
+    service.embedding_cache = None
+    baseline_seconds, baseline = embed_all(service, corpus)
+    print(f"  no cache        {baseline_seconds:7.2f}s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        def new_cache():
+            return EmbeddingCache(config["model_name"], config["normalize_embeddings"], 4096, directory)
+
+        service.embedding_cache = new_cache()
+        for label in ("cold cache", "warm LRU", "vector file"):
+            if label == "vector file":
+                service.embedding_cache = new_cache()
+            seconds, matrices = embed_all(service, corpus)
+            for matrix, expected in zip(matrices, baseline):
+                assert np.allclose(matrix, expected, atol=1e-5), "cached embeddings differ"
+            stats = service.embedding_cache.stats()
+            print(f"  {label:<15} {seconds:7.2f}s  x{baseline_seconds / seconds:6.1f}  "
+                  f"hit rate {stats['hit_rate']:.2f}  memory {stats['memory_bytes'] / 1e6:.1f} MB  "
+                  f"disk {stats['disk_bytes'] / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--unique", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=5)
+    args = parser.parse_args()
+    main(args.documents, args.unique, args.pages)
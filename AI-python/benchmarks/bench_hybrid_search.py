@@ -0,0 +1,114 @@
+"""
+Benchmark: lexical, vector and hybrid search latency against corpus size.
+
+Run from AI-python/:
+
+    python -m benchmarks.bench_hybrid_search [--sizes 10000 100000 1000000] [--queries 200] [--dim 768] [--words 200]
+
+Each corpus is synthetic chunks of `words` words drawn from a Zipf-distributed
+30k-word vocabulary, each opening with its own "Section N.M" reference and a
+third of them naming a multi-word LEGAL_TERMS term, added to the lexical
+index in documents of 100 chunks as /analyze adds them. Chunk embeddings are
+clustered vectors as in bench_vector_search. Queries are clause references,
+defined terms and word runs taken from random chunks; the hybrid row is
+HybridSearcher.search end to end (both retrievers, fusion), excluding query
+embedding.
+
+Memory is dominated by the vector matrix: 1M chunks at 768 dimensions is
+3 GB (more while it doubles), so pass --dim 384 on smaller machines.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_vector_search import make_corpus, percentiles
+from config.settings import get_settings
+from data.legal_terms import LEGAL_TERMS
+from services.document_chunker import TextChunk
+from services.hybrid_search import HybridSearcher
+from services.lexical_index import LexicalIndex
+from services.prepared_document import PreparedDocument
+from services.vector_store import VectorStore
+
+VOCABULARY = 30_000
+DOCUMENT_CHUNKS = 100
+PHRASES = [term for term in LEGAL_TERMS if " " in term]
+
+
+def make_chunks(document: int, words: int, rng: np.random.Generator, zipf: np.ndarray):
+    texts, chunks, offset = [], [], 0
+    for i, row in enumerate(rng.choice(VOCABULARY, size=(DOCUMENT_CHUNKS, words), p=zipf)):
+        body = " ".join(f"w{word}" for word in row)
+        phrase = f" The {PHRASES[rng.integers(len(PHRASES))]} applies." if i % 3 == 0 else ""
+        text = f"Section {document}.{i + 1}{phrase} {body}"
+        texts.append(text)
+        chunks.append(TextChunk(i, text, offset, offset + len(text), i // 4 + 1, words))
+        offset += len(text) + 1
+    return PreparedDocument("\n".join(texts)), chunks
+
+
+def make_query(chunk: TextChunk, kind: int, rng: np.random.Generator) -> str:
+    words = chunk.text.split()
+    if kind == 0:
+        return " ".join(words[:2])  # "Section 812.7"
+    if kind == 1 and " The " in chunk.text:
+        return chunk.text.split(" The ")[1].split(" applies.")[0]
+    start = rng.integers(2, len(words) - 4)
+    return " ".join(words[start:start + 4])
+
+
+def timed(fn, queries):
+    seconds = []
+    for args in queries:
+        start = time.perf_counter()
+        fn(*args)
+        seconds.append(time.perf_counter() - start)
+    return percentiles(seconds)
+
+
+def main(sizes, query_count: int, dim: int, words: int):
+    settings = get_settings()
+    rng = np.random.default_rng(0)
+    zipf = 1.0 / np.arange(1, VOCABULARY + 1)
+    zipf /= zipf.sum()
+    for size in sizes:
+        lexical = LexicalIndex(settings.bm25_k1, settings.bm25_b)
+        vectors = VectorStore(None, settings.vector_store_ivf_threshold, settings.vector_store_nprobe)
+        searcher = HybridSearcher(lexical, vectors, settings.hybrid_rrf_k, settings.hybrid_candidates)
+        samples = []
+        lexical_seconds = vector_seconds = 0.0
+        for document in range(size // DOCUMENT_CHUNKS):
+            prepared, chunks = make_chunks(document, words, rng, zipf)
+            embeddings = make_corpus(len(chunks), 8, rng, dim)
+            start = time.perf_counter()
+            lexical.add(f"doc-{document}", prepared, chunks)
+            lexical_seconds += time.perf_counter() - start
+            start = time.perf_counter()
+            vectors.add(f"doc-{document}", chunks, embeddings)
+            vector_seconds += time.perf_counter() - start
+            if rng.random() < query_count / (size // DOCUMENT_CHUNKS):
+                pick = rng.integers(len(chunks))
+                samples.append((chunks[pick], embeddings[pick]))
+        stats = lexical.stats()
+        print(f"{size:>9} chunks: lexical index {lexical_seconds:6.1f}s ({size / lexical_seconds:,.0f} chunks/s, "
+              f"{stats['terms']:,} terms, {stats['postings']:,} postings), "
+              f"vector index {vector_seconds:6.1f}s, {vectors.stats()['ivf_lists']} IVF lists")
+
+        queries = [(make_query(chunk, i % 3, rng), embedding) for i, (chunk, embedding) in enumerate(samples)]
+        # Indexes bound as defaults: the del below frees them before the next size is built
+        print(f"    lexical  {timed(lambda text, _, index=lexical: index.search(text, 10), queries)}")
+        print(f"    vector   {timed(lambda _, embedding, index=vectors: index.search(embedding, 10, include_text=False), queries)}")
+        print(f"    hybrid   {timed(lambda text, embedding, index=searcher: index.search(text, embedding, 10, include_text=False), queries)}")
+        del lexical, vectors, searcher
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--words", type=int, default=200)
+    args = parser.parse_args()
+    main(args.sizes, args.queries, args.dim, args.words)
@@ -0,0 +1,79 @@
+"""
+Benchmark: peak RSS of PDF extraction, streaming vs holding every page.
+
+Run from AI-python/ (Linux/macOS):
+
+    python -m benchmarks.bench_pdf_memory [--pages 600] [--budget-mb 64]
+
+Each mode runs in a fresh process. The reported figure is peak RSS above the
+process's peak just before extraction started (interpreter, imports and the
+PDF bytes already loaded):
+
+    unreleased  walks pdf.pages keeping every page's caches, as before
+    extract     PdfPlumberExtractor.extract(), which releases each page but
+                still returns all tables as DataFrames
+    stream      PdfPlumberExtractor.iter_pages(), consumed page by page
+
+The streaming mode fails the run if it exceeds --budget-mb.
+"""
+
+import argparse
+import multiprocessing
+import resource
+import sys
+import time
+
+from benchmarks.corpus import make_lease_pdf
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_mode(mode: str, pdf: bytes) -> tuple:
+    from services.pdf_plumber_extractor import PdfPlumberExtractor, open_pdf
+
+    extractor = PdfPlumberExtractor()
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+
+    if mode == "unreleased":
+        with open_pdf(pdf) as document:
+            texts, tables = [], []
+            for page in document.pages:
+                texts.append(page.extract_text())
+                tables.extend(page.extract_tables(extractor.table_settings))
+    elif mode == "extract":
+        extractor.extract(pdf, text=True, tables=True)
+    else:
+        chars = 0
+        for page in extractor.iter_pages(pdf, text=True, tables=True):
+            chars += len(page["text"] or "")
+
+    return peak_rss_mb() - baseline, time.perf_counter() - start
+
+
+def main(pages: int, budget_mb: float):
+    pdf = make_lease_pdf(pages, table_rows=8, table_every=2)
+    print(f"{pages} pages, {len(pdf) / 1e6:.1f} MB PDF")
+
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for mode in ("unreleased", "extract", "stream"):
+        with context.Pool(1) as pool:
+            results[mode] = pool.apply(run_mode, (mode, pdf))
+        print(f"{mode:<10}  peak RSS +{results[mode][0]:7.1f} MB  in {results[mode][1]:.1f}s")
+
+    if results["stream"][0] > budget_mb:
+        raise SystemExit(f"streaming peak RSS +{results['stream'][0]:.1f} MB exceeds the {budget_mb} MB budget")
+    print(f"streaming stays within the {budget_mb} MB budget")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=600)
+    parser.add_argument("--budget-mb", type=float, default=64.0)
+    args = parser.parse_args()
+    main(args.pages, args.budget_mb)
@@ -0,0 +1,60 @@
+"""
+Benchmark: page-sharded PDF extraction scaling from 1 to N worker processes.
+
+Run from AI-python/:
+
+    python -m benchmarks.bench_pdf_parallel [--pages 120] [--max-workers 4] [--table-rows 6]
+
+Each row extracts text and tables from the same synthetic PDF, sharding its
+pages across a fresh spawn-based process pool, and checks the merged result
+matches the serial extract().
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.corpus import make_lease_pdf
+from services.pdf_plumber_extractor import PdfPlumberExtractor, extract_page_range
+
+
+def comparable(result):
+    return result["text"], [table["raw_data"] for table in result["tables"]]
+
+
+def main(pages: int, max_workers: int, table_rows: int, repeat: int):
+    pdf = make_lease_pdf(pages, table_rows=table_rows, table_every=2)
+    extractor = PdfPlumberExtractor()
+
+    start = time.perf_counter()
+    serial = extractor.extract(pdf, text=True, tables=True)
+    serial_seconds = time.perf_counter() - start
+    print(f"{pages} pages, {serial['table_count']} tables, {os.cpu_count()} CPUs")
+    print(f"serial extract(): {serial_seconds:.2f}s")
+
+    for workers in range(1, max_workers + 1):
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            # Start the workers and import pdfplumber before timing
+            list(executor.map(extract_page_range, [pdf] * workers, [0] * workers, [1] * workers))
+
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result = extractor.extract_parallel(pdf, executor, workers, text=True, tables=True, min_pages_per_shard=1)
+                timings.append(time.perf_counter() - start)
+            assert comparable(result) == comparable(serial), "sharded result differs from serial"
+
+        best = min(timings)
+        print(f"{workers} worker(s): {best:.2f}s  speedup x{serial_seconds / best:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=120)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--table-rows", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.pages, args.max_workers, args.table_rows, args.repeat)
@@ -0,0 +1,47 @@
+"""
+Risk identification: one finditer per pattern vs. MultiPatternScanner.
+
+Run from AI-python/:  python -m benchmarks.bench_risk_scanner [pages]
+"""
+
+import sys
+import time
+
+from benchmarks.corpus import make_lease_text
+from services.pattern_registry import get_pattern_registry
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    text = make_lease_text(pages)
+    registry = get_pattern_registry()
+    patterns = registry.get_patterns_by_document_type("lease")
+    scanner = registry.get_risk_scanner("lease")
+
+    def per_pattern():
+        return [(c.pattern, m.span()) for c in patterns for m in c.regex.finditer(text)]
+
+    def scanned():
+        return [(c.pattern, m.span()) for c, m in scanner.scan(text)]
+
+    assert per_pattern() == scanned(), "scanner output differs from per-pattern finditer"
+
+    baseline = best_of(per_pattern)
+    combined = best_of(scanned)
+    print(f"{pages}-page lease: {len(text):,} chars, {len(patterns)} risk patterns "
+          f"({scanner.anchored_count} anchored), {len(scanned())} matches")
+    print(f"  per-pattern finditer : {baseline * 1000:8.1f} ms")
+    print(f"  multi-pattern scanner: {combined * 1000:8.1f} ms  ({baseline / combined:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
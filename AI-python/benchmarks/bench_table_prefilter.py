@@ -0,0 +1,67 @@
+"""
+Benchmark: table extraction with and without the per-page table prefilter.
+
+Run from AI-python/:
+
+    python -m benchmarks.bench_table_prefilter [--pages 60] [--table-every 6]
+
+The corpus is a document of plain text pages with a ruled table on every
+table_every-th page, and one whose every line is ruled (horizontal edges
+only). Both text+tables (as /analyze does) and tables alone (as
+extract_with_coordinates does) are timed, and the tables found must be
+identical with the prefilter on and off.
+"""
+
+import argparse
+import time
+from collections import Counter
+from typing import Dict
+
+from benchmarks.corpus import make_lease_pages, make_pdf_bytes
+from services.pdf_plumber_extractor import PdfPlumberExtractor
+
+
+def build_corpus(pages: int, table_every: int) -> Dict[str, bytes]:
+    return {
+        "plain+tables": make_pdf_bytes(
+            make_lease_pages(pages, paragraphs_per_page=6), table_rows=8, table_every=table_every
+        ),
+        "underlined": make_pdf_bytes(make_lease_pages(pages, paragraphs_per_page=6, seed=1), underline=True),
+    }
+
+
+def time_extract(pdf: bytes, prefilter: bool, text: bool, repeat: int):
+    extractor = PdfPlumberExtractor(table_prefilter=prefilter)
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = extractor.extract(pdf, text=text, tables=True)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(pages: int, table_every: int, repeat: int):
+    for name, pdf in build_corpus(pages, table_every).items():
+        for text in (True, False):
+            off_seconds, off = time_extract(pdf, False, text, repeat)
+            on_seconds, on = time_extract(pdf, True, text, repeat)
+            assert [t["raw_data"] for t in on["tables"]] == [t["raw_data"] for t in off["tables"]], \
+                "prefilter changed the tables found"
+
+            detection = on["table_detection"]
+            reasons = Counter(decision["reason"] for decision in detection["decisions"])
+            print(f"{name:<13} {'text+tables' if text else 'tables only':<12} "
+                  f"off {off_seconds:6.2f}s  on {on_seconds:6.2f}s  "
+                  f"skipped {detection['pages_skipped']}/{detection['pages_checked']} pages "
+                  f"({dict(reasons)}), {on['table_count']} tables")
+            print(f"{'':<26} table detection: off {off['table_detection']['detection_seconds']:.3f}s, "
+                  f"on {detection['detection_seconds']:.3f}s + prefilter {detection['prefilter_seconds']:.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--table-every", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+    main(args.pages, args.table_every, args.repeat)
@@ -0,0 +1,74 @@
+"""
+Benchmark: page text from pdfium versus pdfplumber on the same corpus.
+
+Run from AI-python/:
+
+    python -m benchmarks.bench_text_engines [--pages 60] [--repeat 3]
+
+Each corpus document is extracted with every engine in services.text_engines,
+text only (as /summarize and /embed need) and text+tables (as /analyze with
+extract_tables does; tables come from pdfplumber whichever engine reads the
+text). Word overlap is measured against pdfplumber's text, and pages that fell
+back from pdfium to pdfplumber are counted.
+"""
+
+import argparse
+import re
+import time
+from collections import Counter
+from typing import Dict
+
+from benchmarks.corpus import make_lease_pdf
+from services.pdf_plumber_extractor import PdfPlumberExtractor
+from services.text_engines import TEXT_ENGINES
+
+WORD = re.compile(r"\w+")
+
+
+def build_corpus(pages: int) -> Dict[str, bytes]:
+    return {
+        "plain": make_lease_pdf(pages),
+        "tables": make_lease_pdf(pages, table_rows=8, table_every=2, seed=1),
+    }
+
+
+def word_overlap(text: str, reference: str) -> float:
+    """Share of the reference's words (with multiplicity) that text also has"""
+    words, reference_words = Counter(WORD.findall(text)), Counter(WORD.findall(reference))
+    return sum((words & reference_words).values()) / max(1, sum(reference_words.values()))
+
+
+def time_extract(pdf: bytes, engine: str, tables: bool, repeat: int):
+    extractor = PdfPlumberExtractor(text_engine=engine)
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = extractor.extract(pdf, text=True, tables=tables)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(pages: int, repeat: int):
+    for name, pdf in build_corpus(pages).items():
+        for tables in (False, True):
+            results = {engine: time_extract(pdf, engine, tables, repeat) for engine in TEXT_ENGINES}
+            reference_seconds, reference = results["pdfplumber"]
+            label = "text+tables" if tables else "text only"
+            for engine, (seconds, result) in results.items():
+                line = (f"{name:<7} {label:<12} {engine:<10} {seconds:6.2f}s  x{reference_seconds / seconds:5.2f}  "
+                        f"{len(result['text']):7d} chars  "
+                        f"word overlap {word_overlap(result['text'], reference['text']):.3f}  "
+                        f"pages by engine {result['text_engines']}")
+                if tables:
+                    line += f"  {result['table_count']} tables"
+                    assert [t["raw_data"] for t in result["tables"]] == \
+                        [t["raw_data"] for t in reference["tables"]], "text engine changed the tables found"
+                print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.pages, args.repeat)
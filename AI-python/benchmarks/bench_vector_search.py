@@ -0,0 +1,87 @@
+"""
+Benchmark: vector store query latency and IVF recall against corpus size.
+
+Run from AI-python/:
+
+    python -m benchmarks.bench_vector_search [--sizes 10000 100000 250000] [--queries 200] [--nprobe 8 16 32]
+
+Each corpus is synthetic 768-dimensional chunk embeddings drawn around
+topic centers (cosine about 0.37 to their center, like chunks of the same kind
+of clause), indexed in memory in documents of 1000 chunks. Queries are
+perturbed corpus vectors. Exact search scores every row; IVF search is timed
+at each nprobe, and its recall@k is the share of the exact top k it returns.
+IVF rows are skipped for corpora under the store's ivf_threshold, since the
+store searches those exactly.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from config.settings import get_settings
+from services.document_chunker import TextChunk
+from services.type_centroids import unit_rows
+from services.vector_store import VectorStore
+
+DIM = 768
+DOCUMENT_CHUNKS = 1000
+
+
+def make_corpus(size: int, topics: int, rng: np.random.Generator, dim: int = DIM) -> np.ndarray:
+    centers = unit_rows(rng.standard_normal((topics, dim)).astype(np.float32))
+    noise = rng.standard_normal((size, dim)).astype(np.float32) * (2.5 / np.sqrt(dim))
+    return unit_rows(centers[rng.integers(0, topics, size)] + noise)
+
+
+def percentiles(seconds):
+    p50, p95 = np.percentile(np.asarray(seconds) * 1000, [50, 95])
+    return f"p50 {p50:7.2f} ms  p95 {p95:7.2f} ms"
+
+
+def main(sizes, queries: int, nprobes, top_k: int):
+    threshold = get_settings().vector_store_ivf_threshold
+    rng = np.random.default_rng(0)
+    chunks = [TextChunk(i, "", i, i + 1, None, 1) for i in range(DOCUMENT_CHUNKS)]
+    for size in sizes:
+        corpus = make_corpus(size, max(16, size // 500), rng)
+        store = VectorStore(None, threshold)
+        start = time.perf_counter()
+        for offset in range(0, size, DOCUMENT_CHUNKS):
+            block = corpus[offset:offset + DOCUMENT_CHUNKS]
+            store.add(f"doc-{offset}", chunks[:len(block)], block)
+        stats = store.stats()
+        print(f"{size:>9} chunks: indexed in {time.perf_counter() - start:6.1f}s, "
+              f"{stats['matrix_bytes'] / 1e6:.0f} MB, {stats['ivf_lists']} IVF lists")
+
+        picks = rng.integers(0, size, queries)
+        query_vectors = unit_rows(corpus[picks] + rng.standard_normal((queries, DIM)).astype(np.float32) * (1.0 / np.sqrt(DIM)))
+        exact_hits, exact_seconds = [], []
+        for query in query_vectors:
+            start = time.perf_counter()
+            hits = store.search(query, top_k, exact=True, include_text=False)
+            exact_seconds.append(time.perf_counter() - start)
+            exact_hits.append({(hit.doc_id, hit.chunk_index) for hit in hits})
+        print(f"    exact          {percentiles(exact_seconds)}")
+
+        if not stats["ivf_lists"]:
+            continue
+        for nprobe in nprobes:
+            store.nprobe = nprobe
+            seconds, recall = [], []
+            for query, expected in zip(query_vectors, exact_hits):
+                start = time.perf_counter()
+                hits = store.search(query, top_k, include_text=False)
+                seconds.append(time.perf_counter() - start)
+                recall.append(len(expected & {(hit.doc_id, hit.chunk_index) for hit in hits}) / len(expected))
+            print(f"    ivf nprobe={nprobe:<3} {percentiles(seconds)}  recall@{top_k} {np.mean(recall):.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 250_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+    main(args.sizes, args.queries, args.nprobe, args.top_k)
@@ -0,0 +1,154 @@
+"""
+Synthetic legal text used by the benchmarks.
+
+Paragraphs are written to hit a realistic mix of risk, clause, compliance and
+legal-term patterns. make_lease_text() frames pages exactly like
+PdfPlumberExtractor.extract_structured_content so page-aware code sees real input.
+"""
+
+import random
+from typing import List
+
+LEASE_PARAGRAPHS = [
+    "This Lease Agreement is entered into between the Landlord and the Tenant for the premises located at "
+    "12 Main Street. The monthly rent is $2,500.00 payable on the first day of each month.",
+    "Tenant shall provide a security deposit of $5,000 which shall be refunded within 30 days after the lease "
+    "term ends. A late fee of $75 applies to any payment received after the fifth day of the month.",
+    "Tenant agrees to unlimited liability for damage to the premises and provides a personal guarantee. "
+    "A cross-default provision applies to all obligations and an acceleration clause is included.",
+    "Liquidated damages of $10,000 shall apply on abandonment. Penalties may include treble damages for willful "
+    "violations. The parties agree to a waiver of jury trial in any proceeding.",
+    "Tenant shall indemnify and hold harmless Landlord from any and all claims and damages. Any dispute shall be "
+    "resolved by binding arbitration under the governing law of the State of Delaware.",
+    "Notice must be given at least 60 days prior to expiry. This agreement is subject to automatic renewal. "
+    "Time is of the essence. Force majeure events excuse performance.",
+    "Maintenance responsibility lies with the tenant, who is responsible for repair of fixtures. Common area "
+    "maintenance fees are additional rent. Rent increase of 3% annually under the escalation clause.",
+    "Tenant must comply with all federal, state and local regulations and law. Tenant shall deliver the annual "
+    "report within 10 days. The option expires in 2 months unless exercised in writing.",
+    "This is a triple net lease with percentage rent and a right of first refusal on adjacent space. The use "
+    "clause limits occupancy to retail. Security interest in substantially all fixtures is granted.",
+    "The parties acknowledge the entire agreement, severability, counterparts and that headings are for "
+    "convenience only. The lease binds successors and assigns of each party.",
+    "Landlord may enter the premises upon reasonable notice to perform inspections. Tenant shall not sublet "
+    "without prior written consent, and any assignment requires approval of Landlord.",
+    "Insurance: Tenant shall carry liability coverage with a deductible of $1,000 and name Landlord as an "
+    "additional insured. An easement for utilities is reserved. Escrow of taxes may be required.",
+]
+
+
+def make_paragraphs(count: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [rng.choice(LEASE_PARAGRAPHS) for _ in range(count)]
+
+
+def make_lease_pages(pages: int = 100, paragraphs_per_page: int = 8, seed: int = 0) -> List[str]:
+    """Return page texts for a synthetic lease of roughly 450 words per page"""
+    rng = random.Random(seed)
+    return [
+        "\n".join(rng.choice(LEASE_PARAGRAPHS) for _ in range(paragraphs_per_page))
+        for _ in range(pages)
+    ]
+
+
+def make_lease_text(pages: int = 100, paragraphs_per_page: int = 8, seed: int = 0) -> str:
+    page_texts = make_lease_pages(pages, paragraphs_per_page, seed)
+    return "\n\n".join(f"--- Page {i + 1} ---\n{page}" for i, page in enumerate(page_texts))
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _wrap(paragraph: str, width: int = 95) -> List[str]:
+    lines, line = [], ""
+    for word in paragraph.split():
+        if line and len(line) + len(word) + 1 > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}".strip()
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _page_stream(page_text: str, table_rows: int, underline: bool = False) -> bytes:
+    ops = ["BT /F1 9 Tf 11 TL 40 800 Td"]
+    line_count = 0
+    for paragraph in page_text.split("\n"):
+        for line in _wrap(paragraph):
+            ops.append(f"({_pdf_escape(line)}) Tj T*")
+            line_count += 1
+    ops.append("ET")
+
+    if underline:
+        # Ruled lines under every text line, like a form or lined stationery: horizontal
+        # edges only, so nothing a "lines" table strategy could turn into cells
+        for i in range(line_count):
+            y = 800 - 11 * i - 2
+            for x in range(40, 560, 65):
+                ops.append(f"{x} {y} m {x + 60} {y} l S")
+
+    if table_rows:
+        # A ruled grid with cell text, which pdfplumber's "lines" strategy detects as a table
+        top = 800 - 11 * (line_count + 2)
+        cols = [40, 200, 300, 400, 520]
+        headers = ["Description", "Quantity", "Unit Price", "Total"]
+        rows = [headers] + [[f"Item {i + 1}", str(i + 1), "$100.00", f"${(i + 1) * 100}.00"] for i in range(table_rows)]
+        height = 16
+        bottom = top - height * len(rows)
+        for r in range(len(rows) + 1):
+            y = top - r * height
+            ops.append(f"{cols[0]} {y} m {cols[-1]} {y} l S")
+        for x in cols:
+            ops.append(f"{x} {top} m {x} {bottom} l S")
+        for r, row in enumerate(rows):
+            y = top - r * height - 11
+            for c, cell in enumerate(row):
+                ops.append(f"BT /F1 9 Tf {cols[c] + 4} {y} Td ({_pdf_escape(cell)}) Tj ET")
+    return "\n".join(ops).encode("latin-1", "replace")
+
+
+def make_pdf_bytes(page_texts: List[str], table_rows: int = 0, table_every: int = 1,
+                   underline: bool = False) -> bytes:
+    """
+    Build a born-digital PDF with one text page per entry in page_texts.
+
+    When table_rows > 0, every table_every-th page also gets a ruled invoice-style
+    table with that many body rows. underline rules every text line.
+    """
+    objects: List[bytes] = []
+    page_count = len(page_texts)
+    # 1: catalog, 2: pages, 3: font, then (page, contents) pairs
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(page_count))
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for i, page_text in enumerate(page_texts):
+        rows = table_rows if table_rows and i % table_every == 0 else 0
+        stream = _page_stream(page_text, rows, underline)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def make_lease_pdf(pages: int = 20, table_rows: int = 0, table_every: int = 1, seed: int = 0,
+                   underline: bool = False) -> bytes:
+    return make_pdf_bytes(
+        make_lease_pages(pages, paragraphs_per_page=6, seed=seed), table_rows, table_every, underline
+    )
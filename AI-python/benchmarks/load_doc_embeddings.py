@@ -0,0 +1,112 @@
+"""
+Concurrency test: parallel /analyze -> embed pairs get their own document's embedding.
+
+Start the API (uvicorn main:app), then run from AI-python/:
+
+    python -m benchmarks.load_doc_embeddings [--url http://localhost:8000] [--documents 24] [--concurrency 12]
+
+Every document is a different synthetic lease. A reference embedding for
+each is taken first, one analyze/embed pair at a time. Then all pairs run
+concurrently three ways, and every embedding is checked against its
+document's reference:
+
+    by id    /analyze, then /documents/{doc_id}/embeddings
+    bulk     every /analyze, then one /documents/embeddings call
+    legacy   /analyze, then /embed (reads the "last" document, so pairs race)
+
+By id and bulk must match every document; the legacy row shows the race they
+replace. The exit status is non-zero when by id or bulk get any wrong.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from benchmarks.corpus import make_lease_pdf
+
+
+async def analyze(client: httpx.AsyncClient, pdf: bytes) -> str:
+    response = await client.post("/analyze", files={"file": ("lease.pdf", pdf, "application/pdf")},
+                                 data={"document_type": "lease", "analysis_mode": "quick"})
+    response.raise_for_status()
+    return response.json()["doc_id"]
+
+
+async def embed_by_id(client: httpx.AsyncClient, pdf: bytes) -> Optional[List[float]]:
+    doc_id = await analyze(client, pdf)
+    response = await client.post(f"/documents/{doc_id}/embeddings")
+    return response.json()["embedding"] if response.status_code == 200 else None
+
+
+async def embed_legacy(client: httpx.AsyncClient, pdf: bytes) -> Optional[List[float]]:
+    await analyze(client, pdf)
+    response = await client.post("/embed")
+    return response.json()["embedding"] if response.status_code == 200 else None
+
+
+async def embed_bulk(client: httpx.AsyncClient, pdfs: List[bytes], limit: asyncio.Semaphore) -> List[Optional[List[float]]]:
+    async def limited(pdf: bytes) -> str:
+        async with limit:
+            return await analyze(client, pdf)
+
+    doc_ids = await asyncio.gather(*(limited(pdf) for pdf in pdfs))
+    response = await client.post("/documents/embeddings", json={"doc_ids": doc_ids})
+    response.raise_for_status()
+    by_id: Dict[str, List[float]] = {item["doc_id"]: item["embedding"] for item in response.json()["embeddings"]}
+    return [by_id.get(doc_id) for doc_id in doc_ids]
+
+
+def count_correct(embeddings: List[Optional[List[float]]], reference: List[List[float]]) -> Dict[str, int]:
+    counts = {"correct": 0, "wrong document": 0, "missing": 0}
+    for embedding, expected in zip(embeddings, reference):
+        if embedding is None:
+            counts["missing"] += 1
+        elif np.allclose(embedding, expected, atol=1e-5):
+            counts["correct"] += 1
+        else:
+            counts["wrong document"] += 1
+    return counts
+
+
+async def main(url: str, documents: int, concurrency: int, pages: int) -> bool:
+    pdfs = [make_lease_pdf(pages, seed=seed) for seed in range(documents)]
+    limit = asyncio.Semaphore(concurrency)
+
+    async def pair(fn, pdf: bytes):
+        async with limit:
+            return await fn(client, pdf)
+
+    async with httpx.AsyncClient(base_url=url, timeout=httpx.Timeout(300.0)) as client:
+        reference = [await embed_by_id(client, pdf) for pdf in pdfs]
+        if any(embedding is None for embedding in reference):
+            raise SystemExit("Reference embedding failed")
+
+        ok = True
+        for label, run in (
+            ("by id", lambda: asyncio.gather(*(pair(embed_by_id, pdf) for pdf in pdfs))),
+            ("bulk", lambda: embed_bulk(client, pdfs, limit)),
+            ("legacy", lambda: asyncio.gather(*(pair(embed_legacy, pdf) for pdf in pdfs))),
+        ):
+            start = time.perf_counter()
+            embeddings = await run()
+            seconds = time.perf_counter() - start
+            counts = count_correct(embeddings, reference)
+            print(f"{label:<7} {documents} documents, {concurrency} in flight: {seconds:6.2f}s  {counts}")
+            if label != "legacy" and counts["correct"] != documents:
+                ok = False
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--documents", type=int, default=24)
+    parser.add_argument("--concurrency", type=int, default=12)
+    parser.add_argument("--pages", type=int, default=3)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(main(args.url, args.documents, args.concurrency, args.pages)) else 1)
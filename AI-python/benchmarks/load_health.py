@@ -0,0 +1,94 @@
+"""
+Load test: /health latency while /analyze is saturated.
+
+Start the API (uvicorn main:app), then run from AI-python/:
+
+    python -m benchmarks.load_health [--url http://localhost:8000] [--concurrency 24] [--duration 30]
+
+The test first samples /health on an idle server, then keeps `concurrency`
+/analyze uploads in flight for `duration` seconds while sampling /health again.
+With the CPU-bound work on worker pools, /health latency should stay flat and
+excess /analyze requests should be shed with 503 rather than queue forever.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from typing import List
+
+import httpx
+
+from benchmarks.corpus import make_lease_pdf
+
+
+def describe(samples: List[float]) -> str:
+    if not samples:
+        return "no samples"
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (f"n={len(samples)} p50={statistics.median(samples) * 1000:.1f}ms "
+            f"p95={p95 * 1000:.1f}ms max={ordered[-1] * 1000:.1f}ms")
+
+
+async def sample_health(client: httpx.AsyncClient, stop: asyncio.Event, interval: float) -> List[float]:
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/health")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def analyze_loop(client: httpx.AsyncClient, stop: asyncio.Event, pdf: bytes, statuses: Counter):
+    while not stop.is_set():
+        try:
+            response = await client.post(
+                "/analyze",
+                files={"file": ("lease.pdf", pdf, "application/pdf")},
+                data={"document_type": "lease"}
+            )
+            statuses[response.status_code] += 1
+            if response.status_code == 503:
+                await asyncio.sleep(float(response.headers.get("Retry-After", "1")) / 10)
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] += 1
+
+
+async def main(url: str, concurrency: int, duration: float, pages: int, interval: float):
+    pdf = make_lease_pdf(pages)
+    timeout = httpx.Timeout(300.0)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout) as health_client, \
+            httpx.AsyncClient(base_url=url, timeout=timeout, limits=httpx.Limits(max_connections=concurrency)) as load_client:
+        stop = asyncio.Event()
+        idle_task = asyncio.create_task(sample_health(health_client, stop, interval))
+        await asyncio.sleep(min(5.0, duration / 3))
+        stop.set()
+        idle = await idle_task
+
+        stop = asyncio.Event()
+        statuses: Counter = Counter()
+        loaders = [asyncio.create_task(analyze_loop(load_client, stop, pdf, statuses)) for _ in range(concurrency)]
+        loaded_task = asyncio.create_task(sample_health(health_client, stop, interval))
+        await asyncio.sleep(duration)
+        stop.set()
+        loaded = await loaded_task
+        await asyncio.gather(*loaders)
+
+    print(f"/analyze: {concurrency} concurrent uploads of a {pages}-page PDF for {duration:.0f}s -> {dict(statuses)}")
+    print(f"/health idle  : {describe(idle)}")
+    print(f"/health loaded: {describe(loaded)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=24)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.1, help="seconds between /health probes")
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.concurrency, args.duration, args.pages, args.interval))
@@ -11,23 +11,88 @@ class Settings(BaseSettings):
     # Model Configuration
     embedding_model: str = "sentence-transformers/all-mpnet-base-v2"
     summarization_model: str = "facebook/bart-large-cnn"
-    classification_model: str = "microsoft/DialoGPT-medium"
     spacy_model: str = "en_core_web_sm"
     
     # Processing Configuration
     max_text_length: int = 50000
     max_summary_length: int = 300
     min_summary_length: int = 50
+    summary_chunk_tokens: int = 900  # BART reads at most 1024 tokens per input
+    summary_token_budget: int = 16000  # longer documents are sampled evenly down to this
+    summary_batch_size: int = 4
+    summary_max_levels: int = 4
     embedding_batch_size: int = 32
+    embedding_batch_window_ms: float = 5.0  # how long a lone request waits for others to batch with
+    embedding_max_pending: int = 256
+    embedding_cache_enabled: bool = True
+    embedding_cache_memory_entries: int = 4096  # in-process LRU in front of the vector file
+    embedding_cache_dir: Optional[str] = "/tmp/embedding_cache"  # None caches in memory only
+    embedding_cache_max_vectors: int = 100_000  # vector file capacity; the oldest are overwritten past it
+    chunk_max_words: int = 250  # keeps chunks inside the embedding model's 384-token window
+    chunk_overlap_words: int = 50
+    
+    upload_in_memory_max_bytes: int = 32 * 1024 * 1024  # larger uploads are spooled to one temp file
+    
+    # Document Classification
+    classifier_mode: str = "hybrid"  # "regex", or "hybrid" to blend in similarity to type centroids
+    type_centroids_path: str = "data/type_centroids.npz"  # built by scripts/build_type_centroids.py
+    classification_embedding_weight: float = 0.5
+    classification_max_chunks: int = 4  # leading chunks embedded per document
     
     # Analysis Configuration
+    analysis_mode: str = "deep"  # default for /analyze: "quick", "standard" or "deep"
+    quick_analysis_pages: int = 3  # quick mode reads only this many leading pages
+    risk_levels_from_severity: bool = False  # grade risks by their pattern's severity_score, not as medium
     risk_confidence_threshold: float = 0.5
     clause_context_window: int = 200
     financial_amount_threshold: float = 0.0
     
+    # Concurrency Configuration
+    parallel_analysis: bool = True
+    analysis_process_workers: int = 4
+    parallel_analysis_min_chars: int = 20000  # smaller texts aren't worth the IPC round-trip
+    
+    # Worker Pool Configuration (max_pending counts running plus queued tasks)
+    inference_workers: int = 1
+    inference_max_pending: int = 8
+    pdf_workers: int = 2
+    pdf_max_pending: int = 16
+    pdf_min_pages_per_shard: int = 8  # each PDF is split into at most pdf_workers page ranges of this size
+    pdf_page_timeout: float = 60.0  # seconds before a page is skipped
+    table_prefilter: bool = True  # skip table detection on pages without ruling lines
+    pdf_text_engine: str = "pdfium"  # "pdfium" (fast text layer, pdfplumber fallback) or "pdfplumber"
+    analysis_workers: int = 2
+    analysis_max_pending: int = 16
+    pool_retry_after: int = 5  # seconds, sent with 503 when a pool is saturated
+    
+    # OCR Configuration (pages whose text layer is empty or near-empty)
+    ocr_enabled: bool = True
+    ocr_min_chars: int = 20  # pages with fewer non-space characters are OCRed
+    ocr_dpi: int = 300
+    ocr_language: str = "eng"
+    ocr_cache_entries: int = 1024
+    
     # Cache Configuration
     enable_caching: bool = True
     cache_ttl: int = 3600  # 1 hour
+    cache_backend: str = "memory"  # "memory" or "sqlite"
+    cache_max_entries: int = 512
+    cache_path: str = "/tmp/analysis_cache.sqlite3"
+    
+    # Document Store (extracted documents awaiting /embed; entries expire after cache_ttl)
+    memory_store_max_bytes: int = 256 * 1024 * 1024  # least recently used documents are spilled or dropped past this
+    memory_store_spill_dir: Optional[str] = None  # e.g. "/tmp/memory_store"; unset drops evicted documents
+    memory_store_spill_max_bytes: int = 1024 * 1024 * 1024
+    
+    # Search (/search fuses BM25 over every analyzed document with vectors from /documents/{doc_id}/index)
+    vector_store_dir: Optional[str] = "/tmp/vector_store"  # None keeps the index in memory only
+    vector_store_ivf_threshold: int = 100_000  # live chunks past which searches use a clustered index
+    vector_store_nprobe: int = 16  # clusters scored per IVF search; higher trades latency for recall
+    lexical_index_max_chunks: int = 1_000_000  # the oldest analyzed documents are dropped past this
+    bm25_k1: float = 1.2
+    bm25_b: float = 0.75
+    hybrid_rrf_k: int = 60  # reciprocal-rank fusion constant
+    hybrid_candidates: int = 50  # chunks each retriever ranks for fusion
     
     # Logging Configuration
     log_level: str = "INFO"
@@ -43,6 +108,7 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
+        extra = "ignore"  # settings removed since (e.g. CLASSIFICATION_MODEL) may linger in .env files
 
 # Global settings instance
 _settings = None
@@ -66,11 +132,6 @@ MODEL_CONFIGS = {
         "max_length": 300,
         "min_length": 50,
         "do_sample": False
-    },
-    "classification": {
-        "model_name": "microsoft/DialoGPT-medium",
-        "device": "cpu",
-        "return_all_scores": True
     }
 }
 
@@ -1,18 +1,36 @@
 import os
+import time
 from fastapi import FastAPI, File, Form,  Query, UploadFile, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 import pathlib
+from dataclasses import asdict
+from typing import Optional
 from models.schemas import (
     TextRequest, DocumentAnalysisRequest, ComprehensiveAnalysis,
-    EmbedResponse, SummaryResponse
+    EmbedResponse, SummaryResponse, SummaryLevelTiming,
+    DocumentEmbedResponse, BulkEmbedRequest, BulkEmbedResponse,
+    IndexResponse, SearchRequest, SearchResult, SearchResponse
 )
 from services import memory_store
 from services.ml_service import MLService
 from services.analysis_service import DocumentAnalysisService
-from config.settings import get_settings
-from services.pdf_plumber_extractor import PdfPlumberExtractor
-from services.memory_store import MemoryStore
+from services.analysis_modes import AnalysisMode, analysis_profile
+from config.settings import get_settings, MODEL_CONFIGS
+from services.pdf_plumber_extractor import extract_document_content
+from services.text_engines import TEXT_ENGINES
+from services.page_ocr import get_page_ocr
+from services.memory_store import MemoryStore, SpillStore
 from services import memory_store
+from services.worker_pools import BoundedExecutor, PoolSaturatedError, get_worker_pools
+from services.embedding_batcher import EmbeddingBatcher
+from services.document_chunker import DocumentChunker
+from services.embedding_formats import BINARY_DTYPES, encode_binary, iter_ndjson
+from services.analysis_cache import CachedAnalysis, get_analysis_cache
+from services.upload_ingest import ingest_upload
+from services.vector_store import get_vector_store
+from services.lexical_index import get_lexical_index
+from services.prepared_document import PreparedDocument, normalize_text
+from services.hybrid_search import SEARCH_MODES, HybridSearcher
 from uuid import uuid4
 
 # Initialize FastAPI app
@@ -26,13 +44,65 @@ app = FastAPI(
 settings = get_settings()
 ml_service = MLService()
 analysis_service = DocumentAnalysisService()
+worker_pools = get_worker_pools()
+embedding_batcher = EmbeddingBatcher(
+    ml_service.get_embeddings,
+    worker_pools.inference,
+    max_batch_size=settings.embedding_batch_size,
+    max_wait_ms=settings.embedding_batch_window_ms,
+    max_pending=settings.embedding_max_pending
+)
+
+analysis_cache = get_analysis_cache()
+document_chunker = DocumentChunker(settings.chunk_max_words, settings.chunk_overlap_words)
+vector_store = get_vector_store()
+lexical_index = get_lexical_index()
+
+hybrid_searcher = HybridSearcher(
+    lexical_index, vector_store, settings.hybrid_rrf_k, settings.hybrid_candidates
+)
+
+def index_lexically(doc_id: str, document: PreparedDocument, text_length: int) -> int:
+    """
+    Add the chunks of a document's first text_length characters (its stored
+    text, without the table summaries analysis appends) to the lexical index,
+    so /search finds it before any /index call
+    """
+    return lexical_index.add(doc_id, document, document_chunker.chunk(document.text[:text_length]))
+
+def pool_saturated(e: PoolSaturatedError) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=str(e),
+        headers={"Retry-After": str(settings.pool_retry_after)}
+    )
+
+async def run_in_pool(pool: BoundedExecutor, fn, *args):
+    """Run blocking work on a worker pool, answering 503 when the pool is saturated"""
+    try:
+        return await pool.run(fn, *args)
+    except PoolSaturatedError as e:
+        raise pool_saturated(e)
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize ML models on startup"""
+    if settings.memory_store_spill_dir:
+        # Spills of earlier server processes; their indexes are gone
+        removed = SpillStore.remove_stale(settings.memory_store_spill_dir)
+        if removed:
+            print(f"Removed {removed} stale document spill directories")
     print("Loading ML models...")
     ml_service.load_models()
     print("All models loaded successfully!")
+    analysis_service.start_executors()
+    print("Analysis workers started")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await embedding_batcher.close()
+    analysis_service.shutdown_executors()
+    worker_pools.shutdown()
 
 
 
@@ -41,9 +111,19 @@ async def analyze_document(
     file: UploadFile = File(...),
     document_type: str = Form("general"),
     extract_tables: bool = Form(False),
-    detect_invoice_tables: bool = Form(False)
+    detect_invoice_tables: bool = Form(False),
+    text_engine: Optional[str] = Form(None),
+    analysis_mode: Optional[str] = Form(None)
 ):
-    """Perform comprehensive document analysis with optional table extraction"""
+    """
+    Analyze a document with optional table extraction.
+    
+    analysis_mode picks the depth ("quick", "standard" or "deep"; see
+    services.analysis_modes), defaulting to Settings.analysis_mode, which is
+    "deep": callers that send no mode keep the BART summary (when models are
+    loaded), and now also get tables, entities and dates. Quick extracts only
+    the first pages; the cheaper tiers are opt-in.
+    """
     
     # Add logging and validation
     print(f"Received file: {file.filename}, size: {file.size}, content_type: {file.content_type}")
@@ -53,80 +133,85 @@ async def analyze_document(
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
     
-    temp_file_path = None
+    text_engine = text_engine or settings.pdf_text_engine
+    if text_engine not in TEXT_ENGINES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid text_engine '{text_engine}'. Use one of: {', '.join(TEXT_ENGINES)}"
+        )
+    
+    analysis_mode = analysis_mode or settings.analysis_mode
+    if analysis_mode not in AnalysisMode._value2member_map_:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid analysis_mode '{analysis_mode}'. Use one of: {', '.join(mode.value for mode in AnalysisMode)}"
+        )
+    profile = analysis_profile(analysis_mode)
+    extract_tables = extract_tables or profile.tables
+    
+    upload = None
     
     try:
-        # 1️⃣ Read file
-        contents = await file.read()
-        print(f"File contents read, length: {len(contents)}")
-        
-        if not contents:
-            raise HTTPException(status_code=400, detail="Empty file uploaded")
-        
-        # 2️⃣ Generate UUID-based filename to avoid conflicts
+        # 1️⃣ Read file, hashing as it streams; only large uploads are spooled to disk
         file_extension = pathlib.Path(file.filename).suffix if file.filename else ""
-        unique_filename = f"{uuid4()}{file_extension}"
-        temp_file_path = f"/tmp/{unique_filename}"
-        
-        # Save temporary file
-        with open(temp_file_path, "wb") as f:
-            f.write(contents)
-        print(f"Temporary file saved: {temp_file_path}")
+        upload = await ingest_upload(file, settings.upload_in_memory_max_bytes, file_extension)
+        print(f"File contents read, length: {upload.size}, in memory: {upload.content is not None}")
         
-        # 3️⃣ Initialize enhanced PDF extractor
-        print("Initializing PDF extractor...")
-        pdf_extractor = PdfPlumberExtractor()
+        if not upload.size:
+            raise HTTPException(status_code=400, detail="Empty file uploaded")
         
-        # 4️⃣ Extract content based on requirements
-        extracted_content = {}
-        table_summaries = []
+        # Same bytes and options as an earlier upload: reuse that analysis
+        cache_key = None
+        if analysis_cache:
+            cache_key = analysis_cache.key_for_digest(
+                upload.sha256, document_type, extract_tables, detect_invoice_tables, text_engine, analysis_mode
+            )
+            cached = analysis_cache.get(cache_key)
+            if cached:
+                doc_id = str(uuid4())
+                await run_in_pool(
+                    worker_pools.analysis, memory_store.save, doc_id, {"text": cached.text, "pages": cached.pages}
+                )
+                document = PreparedDocument(cached.text)
+                await run_in_pool(worker_pools.analysis, index_lexically, doc_id, document, len(document))
+                print(f"Analysis cache hit, document saved with ID: {doc_id}")
+                return cached.analysis.model_copy(update={"doc_id": doc_id})
         
-        if extract_tables or detect_invoice_tables:
-            print("Extracting structured content (text + tables)...")
-            structured_content = pdf_extractor.extract_structured_content(temp_file_path)
-            
-            text = structured_content["text"].strip()
-            extracted_content["text"] = text
-            extracted_content["tables"] = structured_content["tables"]
-            extracted_content["table_count"] = structured_content["table_count"]
-            extracted_content["pages"] = structured_content["pages"]
-            
-            print(f"Structured extraction completed: {len(text)} chars, {extracted_content['table_count']} tables")
-            
-            # Generate table summaries
-            for table_info in extracted_content["tables"]:
-                df = table_info["dataframe"]
-                summary = f"Table from Page {table_info['page']}: {len(df)} rows, {len(df.columns)} columns"
-                
-                # Add column names if available
-                if not df.empty:
-                    columns = [str(col) for col in df.columns if col and str(col).strip()]
-                    if columns:
-                        summary += f" (Columns: {', '.join(columns[:5])}{'...' if len(columns) > 5 else ''})"
-                
-                table_summaries.append(summary)
-            
-            # 5️⃣ Additional invoice table detection if requested
-            if detect_invoice_tables:
-                print("Detecting invoice-specific tables...")
-                invoice_tables = pdf_extractor.find_invoice_tables(temp_file_path)
-                extracted_content["invoice_tables"] = invoice_tables
-                extracted_content["invoice_table_count"] = len(invoice_tables)
-                print(f"Found {len(invoice_tables)} potential invoice tables")
-        else:
-            print("Extracting text only...")
-            text = pdf_extractor.extract_text(temp_file_path).strip()
-            extracted_content["text"] = text
-            extracted_content["tables"] = []
-            extracted_content["table_count"] = 0
-            extracted_content["invoice_table_count"] = 0
+        # 3️⃣ Extract text (and tables if requested), sharding page ranges
+        # across the PDF worker processes from an analysis thread
+        print("Extracting document content...")
+        extracted_content = await run_in_pool(
+            worker_pools.analysis,
+            extract_document_content,
+            upload.source,
+            extract_tables,
+            detect_invoice_tables,
+            worker_pools.pdf,
+            settings.pdf_workers,
+            settings.pdf_page_timeout,
+            settings.pdf_min_pages_per_shard,
+            text_engine,
+            settings.ocr_enabled,
+            profile.max_pages
+        )
+        table_summaries = extracted_content.pop("table_summaries")
+        print(f"Extraction completed: {len(extracted_content['text'])} chars, "
+              f"{extracted_content['table_count']} tables, "
+              f"{extracted_content.get('invoice_table_count', 0)} invoice tables, "
+              f"text pages by engine: {extracted_content['text_engines']}")
+        if "ocr" in extracted_content:
+            ocr = extracted_content["ocr"]
+            print(f"OCR: {ocr['pages_ocred']} pages OCRed, {ocr['cache_hits']} from cache, "
+                  f"{ocr['ocr_seconds']:.2f}s OCR, {ocr['render_seconds']:.2f}s rendering")
         
         if not extracted_content["text"]:
             raise HTTPException(status_code=400, detail="No text could be extracted from the document")
+        # Stored as analyzed, so search offsets from either index line up with the stored text
+        extracted_content["text"] = normalize_text(extracted_content["text"])
         
         # 6️⃣ Generate document ID and save
         doc_id = str(uuid4())
-        memory_store.save(doc_id, extracted_content)
+        await run_in_pool(worker_pools.analysis, memory_store.save, doc_id, extracted_content)
         print(f"Document saved with ID: {doc_id}")
         
         # 7️⃣ Prepare text for analysis
@@ -136,13 +221,18 @@ async def analyze_document(
         if table_summaries:
             analysis_text += "\n\n--- TABLE SUMMARIES ---\n"
             analysis_text += "\n".join(table_summaries)
+        # One set of tokens and legal terms for the analysis and the lexical index
+        document = PreparedDocument(analysis_text)
         
-        # 8️⃣ Perform analysis
+        # 8️⃣ Perform analysis off the event loop
         print("Starting analysis...")
-        analysis_result = analysis_service.analyze_document(
-            text=analysis_text,
-            document_type=document_type,
-            ml_service=ml_service
+        analysis_result = await run_in_pool(
+            worker_pools.analysis,
+            analysis_service.analyze_document,
+            document,
+            document_type,
+            ml_service,
+            analysis_mode
         )
         
         # 9️⃣ Create enhanced analysis result with table information
@@ -155,7 +245,8 @@ async def analyze_document(
             "has_tables": extracted_content.get("table_count", 0) > 0,
             "invoice_tables_detected": extracted_content.get("invoice_table_count", 0),
             "has_invoice_tables": extracted_content.get("invoice_table_count", 0) > 0,
-            "table_summaries": table_summaries
+            "table_summaries": table_summaries,
+            "doc_id": doc_id
         })
         
         # Recreate the analysis result with table fields
@@ -163,6 +254,18 @@ async def analyze_document(
         
         print("Analysis completed successfully")
         
+        # Only analyzed documents are searchable; a failed analysis leaves nothing indexed
+        await run_in_pool(
+            worker_pools.analysis, index_lexically, doc_id, document, len(extracted_content["text"])
+        )
+        
+        if cache_key:
+            analysis_cache.set(cache_key, CachedAnalysis(
+                analysis=enhanced_analysis,
+                text=extracted_content["text"],
+                pages=extracted_content.get("pages", 0)
+            ))
+        
         return enhanced_analysis
         
     except HTTPException:
@@ -175,26 +278,238 @@ async def analyze_document(
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
     
     finally:
-        # 🔟 Clean up temporary file
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
-            print(f"Cleaned up temporary file: {temp_file_path}")
+        # 🔟 Clean up the spool file, if the upload needed one
+        if upload and upload.path:
+            print(f"Cleaned up temporary file: {upload.path}")
+            upload.cleanup()
 
 @app.post("/embed", response_model=EmbedResponse)
 async def embed_text():
-    record = memory_store.get_last()
+    """
+    Embed the last analyzed document, then drop it from the store.
+    
+    Concurrent uploads race for "last"; use /documents/{doc_id}/embeddings
+    with the doc_id /analyze returns instead.
+    """
+    doc_id = memory_store.get_last_doc_id()
+    record = await run_in_pool(worker_pools.analysis, memory_store.get, doc_id) if doc_id else None
     
     if not record:
         raise HTTPException(status_code=404, detail="No text found to embed.")
     
     text = record["text"]   # ✅ Extract the string
     
-    embedding = ml_service.get_embedding(text)
+    # Concurrent /embed calls share one encoder forward pass
+    try:
+        embedding = await embedding_batcher.embed(text)
+    except PoolSaturatedError as e:
+        raise pool_saturated(e)
     
-    memory_store.delete_last()
+    memory_store.delete(doc_id)
     
     return EmbedResponse(embedding=embedding)
 
+@app.post("/embed/chunks")
+async def embed_chunks(
+    format: str = Query("ndjson", description="ndjson, float32 or float16"),
+    include_text: bool = Query(True, description="Include chunk text alongside offsets")
+):
+    """
+    Embed the whole last analyzed document as page- and clause-aware chunks.
+
+    format=ndjson streams one JSON object per chunk. format=float32/float16
+    returns application/octet-stream: a uint32 little-endian header length,
+    a JSON header (dtype, dim, count, model, chunks) and the count x dim matrix.
+    Like /embed, prefer /documents/{doc_id}/embeddings/chunks.
+    """
+    doc_id = memory_store.get_last_doc_id()
+    return await chunk_embeddings_response(doc_id, format, include_text, keep=False)
+
+@app.post("/documents/embeddings", response_model=BulkEmbedResponse)
+async def embed_documents(request: BulkEmbedRequest):
+    """
+    Embed many analyzed documents by ID in batched forward passes.
+    
+    IDs not in the store are listed under "missing" rather than failing the
+    request; the documents found are dropped from the store unless keep.
+    """
+    records = await run_in_pool(worker_pools.analysis, memory_store.get_many, request.doc_ids)
+    found = [doc_id for doc_id, record in records.items() if record]
+    
+    embeddings = []
+    if found:
+        try:
+            embeddings = await run_in_pool(
+                worker_pools.inference,
+                ml_service.get_embeddings,
+                [records[doc_id]["text"] for doc_id in found]
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    if not request.keep:
+        for doc_id in found:
+            memory_store.delete(doc_id)
+    
+    model = MODEL_CONFIGS["embedding"]["model_name"]
+    return BulkEmbedResponse(
+        embeddings=[
+            DocumentEmbedResponse(doc_id=doc_id, embedding=embedding, model_used=model)
+            for doc_id, embedding in zip(found, embeddings)
+        ],
+        missing=[doc_id for doc_id, record in records.items() if not record]
+    )
+
+@app.post("/documents/{doc_id}/embeddings", response_model=DocumentEmbedResponse)
+async def embed_document(
+    doc_id: str,
+    keep: bool = Query(False, description="Keep the document in the store after embedding")
+):
+    """Embed one analyzed document by the doc_id /analyze returned"""
+    record = await run_in_pool(worker_pools.analysis, memory_store.get, doc_id)
+    if not record:
+        raise HTTPException(status_code=404, detail=f"Document '{doc_id}' not found; it may have expired or been embedded already.")
+    
+    # Concurrent requests, for any documents, share one encoder forward pass
+    try:
+        embedding = await embedding_batcher.embed(record["text"])
+    except PoolSaturatedError as e:
+        raise pool_saturated(e)
+    
+    if not keep:
+        memory_store.delete(doc_id)
+    
+    return DocumentEmbedResponse(
+        doc_id=doc_id,
+        embedding=embedding,
+        model_used=MODEL_CONFIGS["embedding"]["model_name"]
+    )
+
+@app.post("/documents/{doc_id}/embeddings/chunks")
+async def embed_document_chunks(
+    doc_id: str,
+    format: str = Query("ndjson", description="ndjson, float32 or float16"),
+    include_text: bool = Query(True, description="Include chunk text alongside offsets"),
+    keep: bool = Query(False, description="Keep the document in the store after embedding")
+):
+    """Chunk embeddings of one analyzed document, in the formats of /embed/chunks"""
+    return await chunk_embeddings_response(doc_id, format, include_text, keep)
+
+@app.post("/documents/{doc_id}/index", response_model=IndexResponse)
+async def index_document(
+    doc_id: str,
+    keep: bool = Query(False, description="Keep the document in the store after indexing")
+):
+    """Chunk and embed one analyzed document into the vector store searched by /search"""
+    record = await run_in_pool(worker_pools.analysis, memory_store.get, doc_id)
+    if not record:
+        raise HTTPException(status_code=404, detail=f"Document '{doc_id}' not found; it may have expired or been embedded already.")
+    
+    chunks = await run_in_pool(worker_pools.analysis, document_chunker.chunk, record["text"])
+    try:
+        embeddings = await run_in_pool(
+            worker_pools.inference,
+            ml_service.get_embedding_matrix,
+            [chunk.text for chunk in chunks]
+        )
+        indexed = await run_in_pool(worker_pools.analysis, vector_store.add, doc_id, chunks, embeddings)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if not keep:
+        memory_store.delete(doc_id)
+    
+    return IndexResponse(doc_id=doc_id, chunks=indexed)
+
+@app.post("/search", response_model=SearchResponse)
+async def search_documents(request: SearchRequest):
+    """
+    Chunks of analyzed documents matching the query, best first.
+    
+    Hybrid mode fuses BM25 over every analyzed document with vector
+    similarity over the documents indexed by /documents/{doc_id}/index.
+    """
+    query = request.query.strip()
+    if not query:
+        raise HTTPException(status_code=400, detail="Query is empty.")
+    if request.mode not in SEARCH_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid mode '{request.mode}'. Use one of: {', '.join(SEARCH_MODES)}"
+        )
+    
+    # Lexical search needs no embedding, nor does an empty vector store
+    embedding = None
+    if request.mode != "lexical" and vector_store.live_rows:
+        # Queries share encoder forward passes with concurrent /embed calls
+        try:
+            embedding = await embedding_batcher.embed(query)
+        except PoolSaturatedError as e:
+            raise pool_saturated(e)
+    
+    start = time.perf_counter()
+    hits = await run_in_pool(
+        worker_pools.analysis,
+        hybrid_searcher.search,
+        query, embedding, request.top_k, request.doc_ids, request.exact, request.include_text, request.mode
+    )
+    return SearchResponse(
+        results=[SearchResult(**hit.to_dict(request.include_text)) for hit in hits],
+        took_ms=round((time.perf_counter() - start) * 1000, 3)
+    )
+
+@app.delete("/documents/{doc_id}")
+async def delete_document(doc_id: str):
+    """Drop an analyzed document from the store and from the search indexes"""
+    stored = memory_store.delete(doc_id)
+    indexed = await run_in_pool(worker_pools.analysis, vector_store.delete, doc_id)
+    indexed = await run_in_pool(worker_pools.analysis, lexical_index.delete, doc_id) or indexed
+    if not (stored or indexed):
+        raise HTTPException(status_code=404, detail=f"Document '{doc_id}' not found")
+    return {"doc_id": doc_id, "deleted": True}
+
+async def chunk_embeddings_response(doc_id: Optional[str], format: str, include_text: bool, keep: bool):
+    if format != "ndjson" and format not in BINARY_DTYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported format '{format}'")
+    
+    record = await run_in_pool(worker_pools.analysis, memory_store.get, doc_id) if doc_id else None
+    
+    if not record:
+        raise HTTPException(status_code=404, detail="No text found to embed.")
+    
+    chunks = await run_in_pool(worker_pools.analysis, document_chunker.chunk, record["text"])
+    if not chunks:
+        raise HTTPException(status_code=400, detail="Document has no text to embed.")
+    
+    try:
+        embeddings = await run_in_pool(
+            worker_pools.inference,
+            ml_service.get_embedding_matrix,
+            [chunk.text for chunk in chunks]
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if not keep:
+        memory_store.delete(doc_id)
+    
+    model = MODEL_CONFIGS["embedding"]["model_name"]
+    if format == "ndjson":
+        return StreamingResponse(
+            iter_ndjson(chunks, embeddings, model, include_text),
+            media_type="application/x-ndjson"
+        )
+    return Response(
+        content=encode_binary(chunks, embeddings, format, model, include_text),
+        media_type="application/octet-stream"
+    )
+
 # @app.post("/chat")
 # async def chat_endpoint(request: ChatRequest):
 #     def generate_response():
@@ -202,10 +517,10 @@ async def embed_text():
 #         question_embedding = ml_service.get_embedding(request.text)
         
 #         # 2. Find relevant documents using vector similarity
-#         relevant_docs = vector_store.similarity_search(question_embedding, top_k=3)
+#         relevant_chunks = vector_store.similarity_search(question_embedding, top_k=3)
         
 #         # 3. Create context-aware prompt
-#         context = "\n".join([doc.content for doc in relevant_docs])
+#         context = "\n".join([chunk.text for chunk in relevant_chunks])
 #         enhanced_prompt = f"""
 #         Context: {context}
         
@@ -235,8 +550,17 @@ async def summarize_text(request: TextRequest):
         raise HTTPException(status_code=400, detail="Text is empty.")
     
     try:
-        summary = ml_service.summarize_text(text)
-        return SummaryResponse(summary=summary)
+        result = await run_in_pool(worker_pools.inference, ml_service.summarize_document, text)
+        return SummaryResponse(
+            summary=result.summary,
+            original_length=len(text),
+            summary_length=len(result.summary),
+            compression_ratio=round(len(result.summary) / len(text), 4),
+            levels=[SummaryLevelTiming(**asdict(level)) for level in result.levels],
+            sampled=result.sampled
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Summarization failed: {str(e)}")
 
@@ -246,7 +570,15 @@ async def health_check():
     return {
         "status": "healthy",
         "models_loaded": ml_service.models_loaded,
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "worker_pools": worker_pools.stats(),
+        "embedding_batcher": embedding_batcher.stats(),
+        "analysis_cache": analysis_cache.stats() if analysis_cache else None,
+        "page_ocr": get_page_ocr().stats(),
+        "memory_store": memory_store.stats(),
+        "embedding_cache": ml_service.embedding_cache.stats() if ml_service.embedding_cache else None,
+        "vector_store": vector_store.stats(),
+        "lexical_index": lexical_index.stats()
     }
 
 @app.get("/")
@@ -255,7 +587,7 @@ async def root():
     return {
         "message": "Legal Document Analysis API",
         "version": "1.0.0",
-        "endpoints": ["/embed", "/summarize", "/analyze", "/health"]
+        "endpoints": ["/embed", "/embed/chunks", "/summarize", "/analyze", "/search", "/health"]
     }
 
 if __name__ == "__main__":
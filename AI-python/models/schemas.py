@@ -39,6 +39,8 @@ class KeyTerm(BaseModel):
     category: str = Field(..., description="Term category")
     context: Optional[str] = Field(None, description="Context where term appears")
     importance: Optional[str] = Field(None, description="Importance level")
+    location: Optional[int] = Field(None, description="Position of first occurrence in document")
+    occurrences: Optional[int] = Field(None, description="Number of times the term appears")
 
 class ActionItem(BaseModel):
     id: str = Field(..., description="Unique identifier")
@@ -81,16 +83,67 @@ class ComprehensiveAnalysis(BaseModel):
     invoice_tables_detected: int = Field(0)
     has_invoice_tables: bool = Field(False)
     table_summaries: List[str] = []
+    entities: List[Dict] = Field(default_factory=list, description="Named entities (deep mode)")
+    dates: List[Dict] = Field(default_factory=list, description="Dates and deadlines (deep mode)")
+    doc_id: Optional[str] = Field(None, description="ID of the extracted document, for /documents/{doc_id}/embeddings")
 
 class EmbedResponse(BaseModel):
     embedding: List[float] = Field(..., description="Text embedding vector")
     model_used: Optional[str] = Field(None, description="Model used for embedding")
 
+class DocumentEmbedResponse(EmbedResponse):
+    doc_id: str = Field(..., description="Document the embedding belongs to")
+
+class BulkEmbedRequest(BaseModel):
+    doc_ids: List[str] = Field(..., description="IDs returned by /analyze")
+    keep: bool = Field(False, description="Keep the documents in the store after embedding")
+
+class BulkEmbedResponse(BaseModel):
+    embeddings: List[DocumentEmbedResponse] = Field(default_factory=list, description="One per document found, in request order")
+    missing: List[str] = Field(default_factory=list, description="IDs not in the store (never analyzed, expired or already consumed)")
+
+class IndexResponse(BaseModel):
+    doc_id: str = Field(..., description="Document indexed")
+    chunks: int = Field(..., description="Chunks added to the vector store")
+
+class SearchRequest(BaseModel):
+    query: str = Field(..., description="Text to find similar chunks for")
+    top_k: int = Field(5, ge=1, le=100, description="Number of chunks to return")
+    doc_ids: Optional[List[str]] = Field(None, description="Search only these documents")
+    exact: bool = Field(False, description="Score every chunk instead of using the clustered index")
+    include_text: bool = Field(True, description="Include chunk text alongside offsets")
+    mode: str = Field("hybrid", description="hybrid (BM25 and vectors, rank-fused), vector or lexical")
+
+class SearchResult(BaseModel):
+    doc_id: str
+    chunk_index: int
+    score: float = Field(..., description="Fused score in hybrid mode; cosine similarity or BM25 otherwise")
+    start: int = Field(..., description="Character offset of the chunk in its document's text")
+    end: int
+    page: Optional[int] = None
+    text: Optional[str] = None
+    vector_rank: Optional[int] = Field(None, description="Rank by cosine similarity, when the vector search found it")
+    vector_score: Optional[float] = None
+    lexical_rank: Optional[int] = Field(None, description="Rank by BM25, when the lexical search found it")
+    lexical_score: Optional[float] = None
+
+class SearchResponse(BaseModel):
+    results: List[SearchResult] = Field(default_factory=list, description="Best match first")
+    took_ms: float = Field(..., description="Time spent searching, excluding embedding the query")
+
+class SummaryLevelTiming(BaseModel):
+    level: int = Field(..., description="0 for the chunk summaries, then one per reduce pass")
+    inputs: int = Field(..., description="Texts summarized at this level")
+    input_tokens: int = Field(..., description="Tokens fed to the model at this level")
+    seconds: float = Field(..., description="Wall time of the level")
+
 class SummaryResponse(BaseModel):
     summary: str = Field(..., description="Generated summary")
     original_length: Optional[int] = Field(None, description="Original text length")
     summary_length: Optional[int] = Field(None, description="Summary length")
     compression_ratio: Optional[float] = Field(None, description="Compression ratio")
+    levels: Optional[List[SummaryLevelTiming]] = Field(None, description="Per-level map-reduce timings")
+    sampled: Optional[bool] = Field(None, description="Whether the text exceeded the summary token budget")
 
 class DocumentMetadata(BaseModel):
     document_type: str
@@ -0,0 +1,97 @@
+"""
+Build the per-DocumentType centroid file used by hybrid classification.
+
+Run from AI-python/:
+
+    python -m scripts.build_type_centroids --examples EXAMPLES [--out data/type_centroids.npz]
+
+EXAMPLES is either a JSONL file of {"document_type": ..., "text": ...} lines,
+or a directory with one subdirectory per DocumentType value holding that
+type's example documents as .txt or .pdf files. Each example is embedded the
+way /analyze embeds a document (its first Settings.classification_max_chunks
+chunks, averaged), with the embedding model from MODEL_CONFIGS; a type's
+centroid is the normalized mean of its examples. Types with no examples are
+left out and fall back to regex scoring.
+"""
+
+import argparse
+import json
+import os
+from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from config.settings import get_settings, MODEL_CONFIGS
+from services.document_chunker import DocumentChunker
+from services.document_type import DocumentType
+from services.pdf_plumber_extractor import extract_document_content
+from services.prepared_document import PreparedDocument
+from services.type_centroids import TypeCentroids, document_vector, head_chunks
+
+
+def iter_examples(path: str) -> Iterator[Tuple[str, str]]:
+    """(document type value, text) of each labeled example"""
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    example = json.loads(line)
+                    yield example["document_type"], example["text"]
+        return
+    for doc_type in sorted(os.listdir(path)):
+        type_dir = os.path.join(path, doc_type)
+        if not os.path.isdir(type_dir):
+            continue
+        for name in sorted(os.listdir(type_dir)):
+            file_path = os.path.join(type_dir, name)
+            if name.lower().endswith(".txt"):
+                with open(file_path, encoding="utf-8", errors="replace") as f:
+                    yield doc_type, f.read()
+            elif name.lower().endswith(".pdf"):
+                with open(file_path, "rb") as f:
+                    yield doc_type, extract_document_content(f.read(), extract_tables=False)["text"]
+
+
+def main(examples: str, out: str, max_chunks: int, min_examples: int):
+    settings = get_settings()
+    config = MODEL_CONFIGS["embedding"]
+    chunker = DocumentChunker(settings.chunk_max_words, settings.chunk_overlap_words)
+    embedder = SentenceTransformer(config["model_name"], device=config["device"])
+
+    vectors: Dict[str, List[np.ndarray]] = defaultdict(list)
+    for doc_type, text in iter_examples(examples):
+        if doc_type not in DocumentType._value2member_map_:
+            raise SystemExit(f"Unknown document type {doc_type!r}")
+        texts = head_chunks(PreparedDocument(text), chunker, max_chunks)
+        if not texts:
+            continue
+        embeddings = embedder.encode(texts, batch_size=settings.embedding_batch_size,
+                                     normalize_embeddings=config["normalize_embeddings"])
+        vectors[doc_type].append(document_vector(embeddings))
+
+    too_few = sorted(doc_type for doc_type, type_vectors in vectors.items() if len(type_vectors) < min_examples)
+    if too_few:
+        print(f"Skipping types with fewer than {min_examples} examples: {', '.join(too_few)}")
+    kept = {doc_type: np.stack(type_vectors) for doc_type, type_vectors in vectors.items()
+            if doc_type not in too_few}
+    if not kept:
+        raise SystemExit("No document type has enough examples")
+
+    centroids = TypeCentroids.build(kept, config["model_name"])
+    centroids.save(out)
+    print(f"Wrote {len(centroids.doc_types)} centroids ({centroids.dim} dims) to {out}")
+    for doc_type, self_similarity in zip(centroids.doc_types, centroids.self_similarity):
+        print(f"  {doc_type:<32} {len(kept[doc_type]):5d} examples  self-similarity {self_similarity:.3f}")
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--examples", required=True)
+    parser.add_argument("--out", default=settings.type_centroids_path)
+    parser.add_argument("--max-chunks", type=int, default=settings.classification_max_chunks)
+    parser.add_argument("--min-examples", type=int, default=3)
+    args = parser.parse_args()
+    main(args.examples, args.out, args.max_chunks, args.min_examples)
@@ -1,8 +1,15 @@
 # services/__init__.py
+from config.settings import get_settings
 from .memory_store import MemoryStore
 
-# Create the global instance
-memory_store = MemoryStore()
+# Create the global instance, bounded by the settings' memory budget
+_settings = get_settings()
+memory_store = MemoryStore(
+    _settings.memory_store_max_bytes,
+    _settings.cache_ttl,
+    _settings.memory_store_spill_dir,
+    _settings.memory_store_spill_max_bytes
+)
 
 # Export it so it can be imported
 __all__ = ['memory_store']
\ No newline at end of file
@@ -0,0 +1,244 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from config.settings import get_settings
+from models.schemas import ComprehensiveAnalysis
+from services.pattern_registry import pattern_data_version
+from services.type_centroids import type_centroids_version
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Storage for cache entries: string values with a TTL, evicted least recently used first"""
+
+    name = "base"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: str):
+        ...
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class InMemoryCacheBackend(CacheBackend):
+    name = "memory"
+
+    def __init__(self, max_entries: int = 512, ttl: int = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Entries in a SQLite file, so they survive restarts and are shared by workers on one host"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, max_entries: int = 512, ttl: int = 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl, now)
+            )
+            self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+@dataclass
+class CachedAnalysis:
+    """An /analyze result along with the extracted text that /embed reads afterwards"""
+    analysis: ComprehensiveAnalysis
+    text: str
+    pages: int = 0
+
+
+class AnalysisCache:
+    """
+    Caches analysis results by content: the SHA-256 of the uploaded bytes, the
+    request options, the settings analysis depends on and the pattern data
+    and type centroid versions. Re-uploading the same PDF
+    skips extraction, summarization and pattern matching.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+        self._lock = Lock()
+
+    @staticmethod
+    def make_key(content: bytes, document_type: str, extract_tables: bool, detect_invoice_tables: bool,
+                 text_engine: str = "", analysis_mode: str = "") -> str:
+        return AnalysisCache.key_for_digest(
+            hashlib.sha256(content).hexdigest(), document_type, extract_tables, detect_invoice_tables,
+            text_engine, analysis_mode
+        )
+
+    @staticmethod
+    def key_for_digest(content_sha256: str, document_type: str, extract_tables: bool,
+                       detect_invoice_tables: bool, text_engine: str = "", analysis_mode: str = "") -> str:
+        # Engines lay text out differently, and modes analyze to different depths,
+        # so each gets its own analysis; so do settings that change what analysis
+        # reads (OCR, the table prefilter, the quick mode's page count) or how it classifies
+        settings = get_settings()
+        options = (f"{document_type}|{int(extract_tables)}|{int(detect_invoice_tables)}|{text_engine}|"
+                   f"{int(settings.table_prefilter)}|{analysis_mode}|{pattern_data_version()}|"
+                   f"{int(settings.ocr_enabled)}|"
+                   f"{settings.quick_analysis_pages}|{settings.classifier_mode}|"
+                   f"{type_centroids_version(settings.type_centroids_path)}")
+        return f"{content_sha256}:{hashlib.sha256(options.encode()).hexdigest()[:16]}"
+
+    def get(self, key: str) -> Optional[CachedAnalysis]:
+        try:
+            value = self.backend.get(key)
+            entry = json.loads(value) if value is not None else None
+            cached = CachedAnalysis(
+                analysis=ComprehensiveAnalysis.model_validate(entry["analysis"]),
+                text=entry["text"],
+                pages=entry.get("pages", 0)
+            ) if entry else None
+        except Exception as e:
+            # A broken cache must never fail the request
+            logger.warning(f"Analysis cache read failed: {e}")
+            cached = None
+            with self._lock:
+                self._errors += 1
+
+        with self._lock:
+            if cached is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return cached
+
+    def set(self, key: str, cached: CachedAnalysis):
+        try:
+            self.backend.set(key, json.dumps({
+                "analysis": cached.analysis.model_dump(mode="json"),
+                "text": cached.text,
+                "pages": cached.pages
+            }))
+        except Exception as e:
+            logger.warning(f"Analysis cache write failed: {e}")
+            with self._lock:
+                self._errors += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "backend": self.backend.name,
+                "entries": len(self.backend),
+                "hits": self._hits,
+                "misses": self._misses,
+                "errors": self._errors,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0
+            }
+
+
+_analysis_cache = None
+
+def get_analysis_cache() -> Optional[AnalysisCache]:
+    """The shared analysis cache, or None when caching is disabled"""
+    global _analysis_cache
+    settings = get_settings()
+    if not settings.enable_caching:
+        return None
+    if _analysis_cache is None:
+        if settings.cache_backend == "sqlite":
+            backend = SQLiteCacheBackend(settings.cache_path, settings.cache_max_entries, settings.cache_ttl)
+        elif settings.cache_backend == "memory":
+            backend = InMemoryCacheBackend(settings.cache_max_entries, settings.cache_ttl)
+        else:
+            raise ValueError(f"Unknown cache_backend '{settings.cache_backend}'")
+        _analysis_cache = AnalysisCache(backend)
+    return _analysis_cache
@@ -0,0 +1,69 @@
+import logging
+from dataclasses import dataclass
+from enum import Enum
+from typing import FrozenSet, Optional
+
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+REGEX_STAGES = frozenset({
+    "risks", "clauses", "key_terms", "financial_impact", "compliance_items",
+    "action_items", "recommendations", "confidence_score"
+})
+
+
+class AnalysisMode(str, Enum):
+    """
+    How much of the analysis /analyze runs. Latency targets are wall time for
+    /analyze on a 20-page born-digital PDF on one CPU core with the models
+    loaded, checked by benchmarks/bench_analysis_modes.py:
+
+        quick     < 0.5 s   document type, critical/high risks and an
+                            extractive summary from the first
+                            Settings.quick_analysis_pages pages only
+        standard  < 2 s     every regex stage over the whole document, with
+                            an extractive summary
+        deep      < 60 s    standard plus the BART summary, tables, entities
+                            and dates (BART dominates; ~3 s per summary chunk)
+    """
+    QUICK = "quick"
+    STANDARD = "standard"
+    DEEP = "deep"
+
+
+@dataclass(frozen=True)
+class AnalysisProfile:
+    """The work one analysis mode does; anything not listed is never started"""
+    mode: AnalysisMode
+    stages: FrozenSet[str]
+    ml_summary: bool = False
+    severe_risks_only: bool = False
+    max_pages: Optional[int] = None
+    tables: bool = False
+    embedding_classification: bool = True  # blend in type centroid similarity (hybrid classifier_mode)
+    latency_target: float = 0.0  # seconds
+
+
+def analysis_profile(mode: str) -> AnalysisProfile:
+    """Profile for a mode name; raises ValueError for an unknown mode"""
+    mode = AnalysisMode(mode)
+    if mode is AnalysisMode.QUICK:
+        return AnalysisProfile(
+            mode,
+            frozenset({"summary", "risks", "confidence_score"}),
+            severe_risks_only=True,
+            max_pages=get_settings().quick_analysis_pages,
+            # Regex only: embedding scores would queue behind any BART summary on the inference pool
+            embedding_classification=False,
+            latency_target=0.5
+        )
+    if mode is AnalysisMode.STANDARD:
+        return AnalysisProfile(mode, REGEX_STAGES | {"summary"}, latency_target=2.0)
+    return AnalysisProfile(
+        mode,
+        REGEX_STAGES | {"summary", "entities", "dates"},
+        ml_summary=True,
+        tables=True,
+        latency_target=60.0
+    )
@@ -1,7 +1,13 @@
 import re
-from typing import List, Dict, Optional
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from threading import Lock
+from typing import List, Dict, Optional, Union
 from datetime import datetime, timedelta
 from collections import defaultdict
+from dataclasses import asdict
 
 from models.schemas import (
     Risk, Clause, KeyTerm, ActionItem, FinancialItem, 
@@ -10,21 +16,37 @@ from models.schemas import (
 from data.legal_terms import LEGAL_TERMS
 from data.risk_patterns import RISK_PATTERNS
 from data.clause_patterns import CLAUSE_PATTERNS
+from services.analysis_modes import AnalysisProfile, analysis_profile
 from services.document_type import DocumentClassifier
+from services.pattern_registry import get_pattern_registry
+from services.prepared_document import PreparedDocument
+from services.stage_executor import Stage, StageExecutor
+from services.type_centroids import get_embedding_type_scorer
+from services.worker_pools import BoundedExecutor, PoolSaturatedError, get_worker_pools
 from services.extractors.financial_extractor import FinancialExtractor
 from services.extractors.date_extractor import DateExtractor
 from services.extractors.entity_extractor import EntityExtractor
 from config.settings import get_settings
 import logging
 
-from utils.action_items_utils import create_action_item_with_deadline, get_action_items_for_document_type, get_deadline_patterns, get_risk_action_template, get_time_multiplier
-from utils.clause_utils import get_document_specific_clauses
-from utils.compliance_utils import get_compliance_patterns_for_document_type
+from utils.action_items_utils import create_action_item_with_deadline, get_action_items_for_document_type, get_risk_action_template, get_time_multiplier
 from utils.recommendation_utils import get_clause_based_recommendations, get_document_type_recommendations, get_financial_recommendations, get_general_recommendations, get_risk_based_recommendations, sort_recommendations_by_priority
-from utils.risk_utils import get_patterns_by_document_type, get_risk_level_from_score
+from utils.risk_utils import get_risk_level_from_score
 
 logger = logging.getLogger(__name__)
 
+# Per-process service used by regex stages running in the analysis process pool
+_worker_service = None
+
+def _init_worker_service():
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = DocumentAnalysisService()
+
+def _run_in_worker(method_name: str, *args):
+    _init_worker_service()
+    return getattr(_worker_service, method_name)(*args)
+
 class DocumentAnalysisService:
     """Main service for comprehensive document analysis"""
     
@@ -34,58 +56,202 @@ class DocumentAnalysisService:
         self.date_extractor = DateExtractor()
         self.entity_extractor = EntityExtractor()
         self.document_classifier = DocumentClassifier  # <- your classifier class, not an instance
+        self.pattern_registry = get_pattern_registry()
+        self._executor_lock = Lock()
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+    
+    def start_executors(self):
+        """Create the stage executors and spawn the analysis worker processes up front"""
+        if not self.settings.parallel_analysis:
+            return
+        pool = self._get_process_pool()
+        if pool is not None:
+            for future in [pool.submit(_init_worker_service) for _ in range(self.settings.analysis_process_workers)]:
+                future.result()
+    
+    def shutdown_executors(self):
+        self._discard_process_pool()
+    
+    def _get_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.settings.analysis_process_workers <= 0:
+            return None
+        with self._executor_lock:
+            if self._process_pool is None:
+                # spawn, not fork: the parent may already hold torch's threads
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.settings.analysis_process_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker_service
+                )
+            return self._process_pool
+    
+    def _discard_process_pool(self):
+        with self._executor_lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+                self._process_pool = None
+    
+    def _get_stage_executors(self, document: PreparedDocument) -> Dict[str, Union[Executor, BoundedExecutor]]:
+        """Executors for this document; stages whose executor is missing run inline"""
+        if not self.settings.parallel_analysis:
+            return {}
+        # Summaries share the inference threads with /summarize and /embed, so the
+        # model never runs on more threads than Settings.inference_workers, and
+        # count against its pending cap: a saturated pool fails the analysis with
+        # PoolSaturatedError rather than queueing behind it
+        executors = {"summary": get_worker_pools().inference}
+        if len(document) >= self.settings.parallel_analysis_min_chars:
+            pool = self._get_process_pool()
+            if pool is not None:
+                executors["process"] = pool
+        return executors
+    
+    def _embedding_type_scores(self, document: PreparedDocument, ml_service) -> Optional[Dict]:
+        """Similarity of the document's first chunks to each type's centroid, when hybrid classification can run"""
+        scorer = get_embedding_type_scorer()
+        if scorer is None or ml_service is None or not ml_service.models_loaded:
+            return None
+        try:
+            # One batched call on the inference threads, which the model never outgrows,
+            # within their pending cap like every other inference caller
+            return get_worker_pools().inference.submit(
+                scorer.score, document, ml_service.get_embedding_matrix
+            ).result()
+        except PoolSaturatedError:
+            raise
+        except Exception as e:
+            logger.warning(f"Embedding classification failed, using regex patterns only: {e}")
+            return None
+    
+    def _build_stages(self, document: PreparedDocument, document_type: str, ml_service,
+                      use_process_pool: bool, profile: AnalysisProfile) -> List[Stage]:
+        """
+        The analysis DAG, cut down to the profile's stages. Extraction stages only
+        read the document and run concurrently; action items, recommendations and
+        confidence wait for the stages they use, and read a stage the profile
+        leaves out as empty.
+        """
+        def regex_stage(name: str, method: str, args: tuple, deps: tuple = ()) -> Stage:
+            if use_process_pool:
+                return Stage(name, partial(_run_in_worker, method), args, deps, executor="process")
+            return Stage(name, getattr(self, method), args, deps)
+        
+        if profile.ml_summary:
+            summary = Stage("summary", self._summarize, (document, ml_service), executor="summary")
+        else:
+            # Cheap enough to run inline once the other stages are submitted
+            summary = Stage("summary", self._generate_extractive_summary, (document,))
+        
+        stages = [
+            regex_stage("risks", "_identify_risks", (document, document_type, profile.severe_risks_only)),
+            regex_stage("clauses", "_extract_clauses", (document, document_type)),
+            regex_stage("key_terms", "_extract_key_terms", (document,)),
+            regex_stage("financial_impact", "_extract_financial_impact", (document,)),
+            regex_stage("compliance_items", "_extract_compliance_items", (document, document_type)),
+            regex_stage("action_items", "_generate_action_items", (document, document_type), deps=("risks", "clauses")),
+            Stage(
+                "recommendations",
+                lambda risks, clauses, financial_impact: self._generate_recommendations(
+                    risks, clauses, document_type, financial_impact
+                ),
+                deps=("risks", "clauses", "financial_impact")
+            ),
+            Stage(
+                "confidence_score",
+                self._calculate_confidence_score,
+                (document,),
+                deps=("risks", "clauses", "key_terms", "financial_impact")
+            ),
+            regex_stage("entities", "_extract_entities", (document,)),
+            regex_stage("dates", "_extract_dates", (document,)),
+            summary,
+        ]
+        
+        selected = [stage for stage in stages if stage.name in profile.stages]
+        skipped = {stage.name for stage in stages} - profile.stages
+        needed = {dep for stage in selected for dep in stage.deps if dep in skipped}
+        return [Stage(name, list) for name in sorted(needed)] + selected
+    
+    def _run_stages(self, document: PreparedDocument, document_type: str, ml_service, profile: AnalysisProfile):
+        executors = self._get_stage_executors(document)
+        stages = self._build_stages(document, document_type, ml_service, "process" in executors, profile)
+        try:
+            results, timings = StageExecutor(executors).run(stages)
+        except BrokenProcessPool as e:
+            logger.warning(f"Analysis process pool failed, retrying stages in-process: {e}")
+            self._discard_process_pool()
+            executors.pop("process")
+            results, timings = StageExecutor(executors).run(
+                self._build_stages(document, document_type, ml_service, False, profile)
+            )
+        # Report only the stages the mode ran, not the empty stand-ins for skipped ones
+        return results, {name: seconds for name, seconds in timings.items() if name in profile.stages}
     
     def analyze_document(
         self, 
-        text: str, 
+        text: Union[str, PreparedDocument], 
         document_type: str = "general",
-        ml_service=None
+        ml_service=None,
+        analysis_mode: Optional[str] = None
     ) -> ComprehensiveAnalysis:
-        """Perform comprehensive document analysis"""
+        """
+        Perform document analysis at the depth of analysis_mode ("quick",
+        "standard" or "deep", see services.analysis_modes), defaulting to
+        Settings.analysis_mode. Stages outside the mode are never run and
+        their fields are left empty.
+        """
         
         start_time = datetime.now()
+        profile = analysis_profile(analysis_mode or self.settings.analysis_mode)
         
         try:
+            # Normalize, and share the tokens, sentences and lowercase view across stages
+            document = PreparedDocument.of(text)
+            if profile.max_pages:
+                document = document.first_pages(profile.max_pages)
+            
             # 1️⃣ CLASSIFY if needed
+            classification_start = datetime.now()
             if not document_type or document_type.lower() == "general":
-                classification_result = self.document_classifier.classify_document(text)
+                classification_result = self.document_classifier.classify_document(
+                    document,
+                    embedding_scores=(
+                        self._embedding_type_scores(document, ml_service)
+                        if profile.embedding_classification else None
+                    ),
+                    embedding_weight=self.settings.classification_embedding_weight
+                )
                 document_type = classification_result.document_type.value  # Enum to str
                 logger.info(f"Auto-classified document as {document_type} | Confidence: {classification_result.confidence:.2f}")
                 logger.debug(f"Classification details: {classification_result.reasoning}")
+            classification_time = (datetime.now() - classification_start).total_seconds()
             
-            # 2️⃣ Summarize
-            summary = ""
-            if ml_service and ml_service.models_loaded:
-                try:
-                    summary = ml_service.summarize_text(text)
-                except Exception as e:
-                    logger.warning(f"ML summarization failed, falling back to extractive: {e}")
-                    summary = self._generate_extractive_summary(text)
-            else:
-                summary = self._generate_extractive_summary(text)
+            # 2️⃣ Summarize and extract, running independent stages concurrently
+            results, stage_timings = self._run_stages(document, document_type, ml_service, profile)
+            stage_timings = {"classification": classification_time, **stage_timings}
             
-            # 3️⃣ Extract various elements
-            risks = self._identify_risks(text, document_type)
-            clauses = self._extract_clauses(text, document_type)
-            key_terms = self._extract_key_terms(text)
-            action_items = self._generate_action_items(text, document_type, risks, clauses)
-            financial_impact = self.financial_extractor.extract_financial_information(text)
-            compliance_items = self._extract_compliance_items(text, document_type)
-            recommendations = self._generate_recommendations(risks, clauses, document_type, financial_impact)
-            
-            # 4️⃣ Confidence score
-            confidence_score = self._calculate_confidence_score(
-                text, risks, clauses, key_terms, financial_impact
-            )
+            summary = results["summary"]
+            risks = results.get("risks", [])
+            clauses = results.get("clauses", [])
+            key_terms = results.get("key_terms", [])
+            action_items = results.get("action_items", [])
+            financial_impact = results.get("financial_impact", [])
+            compliance_items = results.get("compliance_items", [])
+            recommendations = results.get("recommendations", [])
+            confidence_score = results["confidence_score"]
+            entities = results.get("entities", [])
+            dates = results.get("dates", [])
             
-            # 5️⃣ Metadata
+            # 3️⃣ Metadata
             processing_time = (datetime.now() - start_time).total_seconds()
             metadata = {
                 "document_type": document_type,
-                "text_length": len(text),
-                "word_count": len(text.split()),
+                "analysis_mode": profile.mode.value,
+                "text_length": len(document),
+                "word_count": document.word_count,
                 "processing_time": processing_time,
                 "analysis_date": datetime.now().isoformat(),
+                "stage_timings": {name: round(seconds, 4) for name, seconds in stage_timings.items()},
                 "feature_counts": {
                     "risks": len(risks),
                     "clauses": len(clauses),
@@ -105,17 +271,40 @@ class DocumentAnalysisService:
                 compliance_items=compliance_items,
                 recommendations=recommendations,
                 confidence_score=confidence_score,
-                analysis_metadata=metadata
+                analysis_metadata=metadata,
+                entities=entities,
+                dates=dates
             )
         
+        except PoolSaturatedError:
+            # Left as is, so the endpoint can answer 503 and the client retry
+            raise
         except Exception as e:
             logger.error(f"Document analysis failed: {str(e)}")
             raise Exception(f"Analysis failed: {str(e)}")
     
-    def _generate_extractive_summary(self, text: str) -> str:
+    def _summarize(self, document: PreparedDocument, ml_service=None) -> str:
+        """ML summary when models are loaded, extractive summary otherwise"""
+        if ml_service and ml_service.models_loaded:
+            try:
+                return ml_service.summarize_text(document)
+            except Exception as e:
+                logger.warning(f"ML summarization failed, falling back to extractive: {e}")
+        return self._generate_extractive_summary(document)
+    
+    def _extract_financial_impact(self, document: PreparedDocument) -> List[FinancialItem]:
+        return self.financial_extractor.extract_financial_information(document)
+    
+    def _extract_entities(self, document: PreparedDocument) -> List[Dict]:
+        return [asdict(entity) for entity in self.entity_extractor.extract_entities(document)]
+    
+    def _extract_dates(self, document: PreparedDocument) -> List[Dict]:
+        return self.date_extractor.extract_dates(document)
+    
+    def _generate_extractive_summary(self, document: PreparedDocument) -> str:
         """Generate a simple extractive summary as fallback"""
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
+        text = document.text
+        sentences = document.sentences(min_chars=20)
         
         if len(sentences) <= 3:
             return text[:500] + "..." if len(text) > 500 else text
@@ -140,56 +329,42 @@ class DocumentAnalysisService:
         
         return '. '.join(summary_sentences) + '.'
     
-    def _identify_risks(self, text: str, document_type: str) -> List[Risk]:
+    def _identify_risks(self, document: PreparedDocument, document_type: str,
+                        severe_only: bool = False) -> List[Risk]:
         """Identify potential risks in the document using modularized risk patterns"""
+        text = document.text
         risks = []
         
         try:
             # Get risk patterns for the specific document type
-            patterns = get_patterns_by_document_type(document_type)
+            # One anchor pass over the text instead of one full scan per pattern
+            scanner = self.pattern_registry.get_risk_scanner(document_type, severe_only)
             
-            for pattern_data in patterns:
-                # Handle different pattern data structures safely
-                if isinstance(pattern_data, dict):
-                    pattern = pattern_data.get('pattern', '')
-                    risk_score = pattern_data.get('score', pattern_data.get('risk_score', 5))  # Default score of 5
-                    description = pattern_data.get('description', pattern_data.get('title', 'Risk detected'))
-                    category = pattern_data.get('category', 'general')
-                elif isinstance(pattern_data, str):
-                    # Handle simple string patterns
-                    pattern = pattern_data
-                    risk_score = 5  # Default score
-                    description = "Risk pattern detected"
-                    category = 'general'
-                else:
-                    logger.warning(f"Unknown pattern data type: {type(pattern_data)}")
-                    continue
+            for compiled, match in scanner.scan(text):
+                pattern_data = compiled.data
+                risk_score = pattern_data.get('score', pattern_data.get('risk_score', 5))  # Default score of 5
+                if self.settings.risk_levels_from_severity:
+                    # The data modules give each pattern a severity_score
+                    risk_score = pattern_data.get('severity_score', risk_score)
+                description = pattern_data.get('description', pattern_data.get('title', 'Risk detected'))
+                category = pattern_data.get('category', 'general')
                 
-                if not pattern:
-                    continue
+                # Get surrounding context
+                start = max(0, match.start() - 100)
+                end = min(len(text), match.end() + 100)
+                context = text[start:end].strip()
                 
-                try:
-                    matches = re.finditer(pattern, text, re.IGNORECASE)
-                    for match in matches:
-                        # Get surrounding context
-                        start = max(0, match.start() - 100)
-                        end = min(len(text), match.end() + 100)
-                        context = text[start:end].strip()
-                        
-                        # Determine risk level from score
-                        risk_level = get_risk_level_from_score(risk_score)
-                        
-                        risks.append(Risk(
-                            level=risk_level,
-                            title=description,
-                            description=f"Match: '{match.group()}' - Context: {context[:200]}...",
-                            confidence=min(1.0, risk_score / 10.0),
-                            category=category,
-                            location=match.start()
-                        ))
-                except re.error as e:
-                    logger.warning(f"Invalid regex pattern '{pattern}': {e}")
-                    continue
+                # Determine risk level from score
+                risk_level = get_risk_level_from_score(risk_score)
+                
+                risks.append(Risk(
+                    level=risk_level,
+                    title=description,
+                    description=f"Match: '{match.group()}' - Context: {context[:200]}...",
+                    confidence=min(1.0, risk_score / 10.0),
+                    category=category,
+                    location=match.start()
+                ))
                 
         except Exception as e:
             logger.error(f"Error in risk identification: {e}")
@@ -200,50 +375,34 @@ class DocumentAnalysisService:
         
         return risks
     
-    def _extract_clauses(self, text: str, document_type: str) -> List[Clause]:
+    def _extract_clauses(self, document: PreparedDocument, document_type: str) -> List[Clause]:
         """Extract and categorize important clauses using modularized patterns"""
+        text = document.text
         clauses = []
         
         try:
             # Get clause patterns for the specific document type
-            clause_patterns = get_document_specific_clauses(document_type)
+            clause_patterns = self.pattern_registry.get_clause_patterns(document_type)
             
             for clause_type, patterns in clause_patterns.items():
-                for pattern_data in patterns:
-                    # Handle different pattern data structures safely
-                    if isinstance(pattern_data, dict):
-                        pattern = pattern_data.get('pattern', '')
-                        significance = pattern_data.get('significance', 'standard')
-                        title = pattern_data.get('title', f"{clause_type.title()} Clause")
-                    elif isinstance(pattern_data, str):
-                        pattern = pattern_data
-                        significance = 'standard'
-                        title = f"{clause_type.title()} Clause"
-                    else:
-                        continue
-                    
-                    if not pattern:
-                        continue
+                for compiled in patterns:
+                    significance = compiled.data['significance']
+                    title = compiled.data['title']
                     
-                    try:
-                        matches = re.finditer(pattern, text, re.IGNORECASE)
-                        for match in matches:
-                            # Extract larger context (±300 characters)
-                            start = max(0, match.start() - 300)
-                            end = min(len(text), match.end() + 300)
-                            context = text[start:end].strip()
-                            
-                            clauses.append(Clause(
-                                type=clause_type,
-                                title=title,
-                                content=context,
-                                significance=significance,
-                                location=match.start(),
-                                matched_text=match.group()
-                            ))
-                    except re.error as e:
-                        logger.warning(f"Invalid regex pattern '{pattern}': {e}")
-                        continue
+                    for match in compiled.regex.finditer(text):
+                        # Extract larger context (±300 characters)
+                        start = max(0, match.start() - 300)
+                        end = min(len(text), match.end() + 300)
+                        context = text[start:end].strip()
+                        
+                        clauses.append(Clause(
+                            type=clause_type,
+                            title=title,
+                            content=context,
+                            significance=significance,
+                            location=match.start(),
+                            matched_text=match.group()
+                        ))
                         
         except Exception as e:
             logger.error(f"Error in clause extraction: {e}")
@@ -253,15 +412,17 @@ class DocumentAnalysisService:
         
         return clauses
     
-    def _extract_key_terms(self, text: str) -> List[KeyTerm]:
+    def _extract_key_terms(self, document: PreparedDocument) -> List[KeyTerm]:
         """Extract and define key legal terms using modularized legal terms"""
+        text = document.text
         key_terms = []
         
         try:
-            # Get all legal terms
-            legal_terms = LEGAL_TERMS
+            # One pass over the text finds every term with its first location and count
+            occurrences = self.pattern_registry.get_legal_term_index().tally(document.legal_term_occurrences)
             
-            for term, definition_data in legal_terms.items():
+            for term, found in occurrences.items():
+                definition_data = LEGAL_TERMS[term]
                 if isinstance(definition_data, dict):
                     definition = definition_data.get('definition', '')
                     category = definition_data.get('category', 'legal')
@@ -272,28 +433,20 @@ class DocumentAnalysisService:
                     category = 'legal'
                     importance = 'medium'
                 
-                # Search for term in text (case insensitive)
-                pattern = re.escape(term)
-                try:
-                    match = re.search(pattern, text, re.IGNORECASE)
-                    
-                    if match:
-                        # Find context around the term
-                        start = max(0, match.start() - 75)
-                        end = min(len(text), match.end() + 75)
-                        context = text[start:end].strip()
-                        
-                        key_terms.append(KeyTerm(
-                            term=term.title(),
-                            definition=definition,
-                            category=category,
-                            context=context,
-                            importance=importance,
-                            location=match.start()
-                        ))
-                except re.error as e:
-                    logger.warning(f"Invalid regex pattern for term '{term}': {e}")
-                    continue
+                # Find context around the first occurrence
+                start = max(0, found.first_location - 75)
+                end = min(len(text), found.first_location + len(term) + 75)
+                context = text[start:end].strip()
+                
+                key_terms.append(KeyTerm(
+                    term=term.title(),
+                    definition=definition,
+                    category=category,
+                    context=context,
+                    importance=importance,
+                    location=found.first_location,
+                    occurrences=found.count
+                ))
                     
         except Exception as e:
             logger.error(f"Error in key terms extraction: {e}")
@@ -302,12 +455,13 @@ class DocumentAnalysisService:
     
     def _generate_action_items(
         self, 
-        text: str, 
+        document: PreparedDocument, 
         document_type: str, 
         risks: List[Risk], 
         clauses: List[Clause]
     ) -> List[ActionItem]:
         """Generate action items based on document content and analysis results using modularized templates"""
+        text = document.text
         action_items = []
         
         try:
@@ -335,80 +489,69 @@ class DocumentAnalysisService:
                 action_items.append(ActionItem(**action_item_data))
             
             # Extract deadline-related action items from text
-            deadline_patterns = get_deadline_patterns()
+            deadline_patterns = self.pattern_registry.get_deadline_patterns()
             
-            for pattern_data in deadline_patterns:
-                pattern = pattern_data['pattern']
-                priority = pattern_data['priority']
-                category = pattern_data['category']
+            for compiled in deadline_patterns:
+                priority = compiled.data['priority']
+                category = compiled.data['category']
                 
-                try:
-                    matches = re.finditer(pattern, text, re.IGNORECASE)
-                    for i, match in enumerate(matches):
-                        if i >= 5:  # Limit extracted deadlines
-                            break
-                            
-                        try:
-                            days = int(match.group(1))
-                            unit = match.group(2).lower()
-                            
-                            # Convert to days using the utility function
-                            days = days * get_time_multiplier(unit)
-                            
-                            deadline = (datetime.now() + timedelta(days=days)).isoformat()
-                            
-                            action_item_data = {
-                                "id": f"deadline_{category}_{i+1}",
-                                "task": f"Complete requirement: {match.group()[:50]}...",
-                                "deadline": deadline,
-                                "priority": priority,
-                                "status": "pending",
-                                "description": f"Action item extracted from document: {match.group()}",
-                                "category": category
-                            }
-                            action_items.append(ActionItem(**action_item_data))
-                        except (ValueError, IndexError):
-                            continue
-                except re.error as e:
-                    logger.warning(f"Invalid regex pattern '{pattern}': {e}")
-                    continue
+                for i, match in enumerate(compiled.regex.finditer(text)):
+                    if i >= 5:  # Limit extracted deadlines
+                        break
+                        
+                    try:
+                        days = int(match.group(1))
+                        unit = match.group(2).lower()
+                        
+                        # Convert to days using the utility function
+                        days = days * get_time_multiplier(unit)
+                        
+                        deadline = (datetime.now() + timedelta(days=days)).isoformat()
+                        
+                        action_item_data = {
+                            "id": f"deadline_{category}_{i+1}",
+                            "task": f"Complete requirement: {match.group()[:50]}...",
+                            "deadline": deadline,
+                            "priority": priority,
+                            "status": "pending",
+                            "description": f"Action item extracted from document: {match.group()}",
+                            "category": category
+                        }
+                        action_items.append(ActionItem(**action_item_data))
+                    except (ValueError, IndexError):
+                        continue
                     
         except Exception as e:
             logger.error(f"Error in action items generation: {e}")
         
         return action_items
     
-    def _extract_compliance_items(self, text: str, document_type: str) -> List[ComplianceItem]:
+    def _extract_compliance_items(self, document: PreparedDocument, document_type: str) -> List[ComplianceItem]:
         """Extract compliance-related items from the document using modularized patterns"""
+        text = document.text
         compliance_items = []
         
         try:
             # Get compliance patterns for the specific document type
-            compliance_patterns = get_compliance_patterns_for_document_type(document_type)
+            compliance_patterns = self.pattern_registry.get_compliance_patterns(document_type)
             
             for category, patterns in compliance_patterns.items():
-                for pattern_data in patterns:
-                    pattern = pattern_data['pattern']
-                    description = pattern_data['description']
-                    requirement_level = pattern_data['requirement_level']
+                for compiled in patterns:
+                    description = compiled.data['description']
+                    requirement_level = compiled.data['requirement_level']
                     
-                    try:
-                        matches = re.finditer(pattern, text, re.IGNORECASE)
-                        for match in matches:
-                            start = max(0, match.start() - 100)
-                            end = min(len(text), match.end() + 100)
-                            context = text[start:end].strip()
-                            
-                            compliance_items.append(ComplianceItem(
-                                type=category,
-                                description=description,
-                                requirement_level=requirement_level,
-                                context=context,
-                                location=match.start()
-                            ))
-                    except re.error as e:
-                        logger.warning(f"Invalid regex pattern '{pattern}': {e}")
-                        continue
+                    for match in compiled.regex.finditer(text):
+                        start = max(0, match.start() - 100)
+                        end = min(len(text), match.end() + 100)
+                        context = text[start:end].strip()
+                        
+                        compliance_items.append(ComplianceItem(
+                            type=category,
+                            description=description,
+                            requirement_level=requirement_level,
+                            context=context,
+                            location=match.start()
+                        ))
                         
         except Exception as e:
             logger.error(f"Error in compliance extraction: {e}")
@@ -469,7 +612,7 @@ class DocumentAnalysisService:
     
     def _calculate_confidence_score(
         self, 
-        text: str, 
+        document: PreparedDocument, 
         risks: List[Risk], 
         clauses: List[Clause], 
         key_terms: List[KeyTerm], 
@@ -478,8 +621,8 @@ class DocumentAnalysisService:
         """Calculate confidence score based on analysis completeness and text characteristics"""
         
         # Base score from text characteristics
+        text = document.text
         text_length = len(text)
-        word_count = len(text.split())
         
         # Length-based confidence
         if text_length < 500:
@@ -555,19 +698,22 @@ class DocumentAnalysisService:
         
         return deduplicated
     
-    def debug_analysis(self, text: str, document_type: str = "general") -> Dict:
+    def debug_analysis(self, text: Union[str, PreparedDocument], document_type: str = "general") -> Dict:
         """Debug function to understand analysis results"""
         
+        document = PreparedDocument.of(text)
+        text = document.text
+        
         logger.info(f"=== DEBUG ANALYSIS ===")
         logger.info(f"Document type: {document_type}")
         logger.info(f"Text length: {len(text)}")
         logger.info(f"Text preview: {text[:200]}...")
         
         # Test each component separately
-        risks = self._identify_risks(text, document_type)
-        clauses = self._extract_clauses(text, document_type)
-        key_terms = self._extract_key_terms(text)
-        financial_impact = self.financial_extractor.extract_financial_information(text)
+        risks = self._identify_risks(document, document_type)
+        clauses = self._extract_clauses(document, document_type)
+        key_terms = self._extract_key_terms(document)
+        financial_impact = self.financial_extractor.extract_financial_information(document)
         
         # Check for basic patterns
         dollar_matches = re.findall(r'\$[\d,]+(?:\.\d{2})?', text)
@@ -575,7 +721,7 @@ class DocumentAnalysisService:
         
         debug_results = {
             "text_length": len(text),
-            "word_count": len(text.split()),
+            "word_count": document.word_count,
             "text_preview": text[:200],
             "risks_found": len(risks),
             "clauses_found": len(clauses),
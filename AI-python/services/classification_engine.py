@@ -0,0 +1,111 @@
+import logging
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from services.multi_pattern_scanner import LiteralTrie, MultiPatternScanner
+from services.prepared_document import PreparedDocument
+
+logger = logging.getLogger(__name__)
+
+STRONG_WEIGHT = 3
+MODERATE_WEIGHT = 2
+# A context word counts at most this many times, so one repeated word can't decide the type
+CONTEXT_WORD_CAP = 5
+
+
+class ClassificationEngine:
+    """
+    Scores a document against every document type at once.
+
+    Built from the registry's compiled classification patterns:
+
+        indicators   each distinct indicator regex, all run through one
+                     MultiPatternScanner pass over the lowercased text
+        vocabulary   each distinct context word, all counted with one
+                     LiteralTrie pass (as str.count would count them)
+        weights      (types x indicators): 3 per strong and 2 per moderate
+                     listing; (types x vocabulary): 1 per listing
+
+    A document's score vector is then two matrix-vector products, so adding
+    document types grows the weight matrices rather than the passes over the text.
+    """
+
+    def __init__(self, classification_patterns: Dict[Any, Dict[str, Any]]):
+        self.doc_types: List[Any] = list(classification_patterns)
+
+        indicators: Dict[str, int] = {}
+        compiled_indicators = []
+        vocabulary: Dict[str, int] = {}
+        # Per type, the (label, indicator column) of each listed indicator, for reasoning text
+        self._listed: List[List[Tuple[str, int]]] = []
+        weights: List[Tuple[int, int, int]] = []
+        context: List[Tuple[int, int]] = []
+
+        for row, patterns in enumerate(classification_patterns.values()):
+            listed = []
+            for key, label, weight in (("strong_indicators", "Strong", STRONG_WEIGHT),
+                                       ("moderate_indicators", "Moderate", MODERATE_WEIGHT)):
+                for compiled in patterns[key]:
+                    column = indicators.get(compiled.pattern)
+                    if column is None:
+                        column = indicators[compiled.pattern] = len(compiled_indicators)
+                        compiled_indicators.append(compiled)
+                    weights.append((row, column, weight))
+                    listed.append((f"{label}: {compiled.pattern}", column))
+            self._listed.append(listed)
+            for word in patterns["context_words"]:
+                context.append((row, vocabulary.setdefault(word.lower(), len(vocabulary))))
+
+        self.indicator_weights = np.zeros((len(self.doc_types), len(compiled_indicators)))
+        for row, column, weight in weights:
+            self.indicator_weights[row, column] += weight
+        self.context_weights = np.zeros((len(self.doc_types), len(vocabulary)))
+        for row, column in context:
+            self.context_weights[row, column] += 1
+
+        self.vocabulary = vocabulary
+        self._scanner = MultiPatternScanner(compiled_indicators)
+        self._indicator_columns = {id(compiled): column for column, compiled in enumerate(compiled_indicators)}
+        self._trie = LiteralTrie(list(vocabulary))
+        logger.info(f"Classification engine: {len(self.doc_types)} types, "
+                    f"{len(compiled_indicators)} indicators, {len(vocabulary)} context words")
+
+    def score(self, document: PreparedDocument) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns:
+            (per-type scores normalized by document length and capped at 1.0,
+             match count of each indicator)
+        """
+        text_lower = document.lower
+        indicator_counts = self.indicator_counts(text_lower)
+        context_counts = np.minimum(self.context_counts(text_lower), CONTEXT_WORD_CAP)
+        raw = self.indicator_weights @ indicator_counts + self.context_weights @ context_counts
+
+        # One point per 100 words reads as full confidence; an empty text scores nothing
+        length_scale = document.word_count * 0.01
+        if not length_scale:
+            return np.zeros(len(self.doc_types)), indicator_counts
+        return np.minimum(raw / length_scale, 1.0), indicator_counts
+
+    def indicator_counts(self, text_lower: str) -> np.ndarray:
+        """Non-overlapping match count of each indicator, as len(regex.findall(text_lower))"""
+        counts = np.zeros(len(self._indicator_columns))
+        for compiled, _ in self._scanner.scan(text_lower):
+            counts[self._indicator_columns[id(compiled)]] += 1
+        return counts
+
+    def context_counts(self, text_lower: str) -> np.ndarray:
+        """Occurrences of each vocabulary word, as text_lower.count(word)"""
+        counts = np.zeros(len(self.vocabulary))
+        # str.count doesn't count an occurrence overlapping the previous one
+        resume_at: Dict[str, int] = {}
+        for word, start in self._trie.finditer(text_lower, lowercase=True):
+            if start >= resume_at.get(word, 0):
+                counts[self.vocabulary[word]] += 1
+                resume_at[word] = start + len(word)
+        return counts
+
+    def matched_patterns(self, type_index: int, indicator_counts: np.ndarray) -> List[str]:
+        """Labels of a type's indicators that matched, strong before moderate"""
+        return [label for label, column in self._listed[type_index] if indicator_counts[column] > 0]
@@ -0,0 +1,123 @@
+import re
+import logging
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Framing written by PdfPlumberExtractor between pages
+PAGE_MARKER = re.compile(r'^--- Page (\d+) ---\n', re.MULTILINE)
+
+# Places a clause can start: a blank line, or a line opening with a
+# section number ("4.", "4.2", "(a)"), "Section 4" or "ARTICLE IV"
+CLAUSE_BOUNDARY = re.compile(
+    r'\n\s*\n'
+    r'|\n(?=[ \t]*(?:\d+(?:\.\d+)*\.?[ \t]|\([a-z0-9]{1,4}\)[ \t]|(?:section|article)[ \t]+[\divxlc]+\b))',
+    re.IGNORECASE
+)
+
+WORD = re.compile(r'\S+')
+
+
+@dataclass
+class TextChunk:
+    """A span of document text to embed; start/end are character offsets into the full text"""
+    index: int
+    text: str
+    start: int
+    end: int
+    page: Optional[int]
+    word_count: int
+
+    def to_dict(self, include_text: bool = True) -> Dict:
+        data = asdict(self)
+        if not include_text:
+            del data["text"]
+        return data
+
+
+class DocumentChunker:
+    """
+    Splits extracted document text into overlapping, embedding-sized chunks.
+
+    Chunks never cross a page marker, and inside a page they are packed from
+    whole clauses/paragraphs where those fit in max_words. Consecutive chunks
+    share up to overlap_words of trailing text so a clause cut at a boundary
+    still appears whole in one of them.
+    """
+
+    def __init__(self, max_words: int = 250, overlap_words: int = 50):
+        if max_words <= 0:
+            raise ValueError("max_words must be positive")
+        if not 0 <= overlap_words < max_words:
+            raise ValueError("overlap_words must be between 0 and max_words")
+        self.max_words = max_words
+        self.overlap_words = overlap_words
+
+    def chunk(self, text: str) -> List[TextChunk]:
+        chunks: List[TextChunk] = []
+        for page, page_start, page_end in self._pages(text):
+            for start, end, word_count in self._pack(text, page_start, page_end):
+                chunks.append(TextChunk(
+                    index=len(chunks),
+                    text=text[start:end],
+                    start=start,
+                    end=end,
+                    page=page,
+                    word_count=word_count
+                ))
+        logger.debug(f"Split {len(text)} chars into {len(chunks)} chunks")
+        return chunks
+
+    def _pages(self, text: str) -> Iterator[Tuple[Optional[int], int, int]]:
+        """Yield (page number, start, end) for each page body; page is None for unframed text"""
+        markers = list(PAGE_MARKER.finditer(text))
+        if not markers:
+            yield None, 0, len(text)
+            return
+        if text[:markers[0].start()].strip():
+            yield None, 0, markers[0].start()
+        for i, marker in enumerate(markers):
+            end = markers[i + 1].start() if i + 1 < len(markers) else len(text)
+            yield int(marker.group(1)), marker.end(), end
+
+    def _units(self, text: str, start: int, end: int) -> List[List[Tuple[int, int]]]:
+        """
+        Word spans of the page grouped by clause. A clause longer than max_words
+        becomes overlapping max_words windows, since packing can only overlap
+        whole units.
+        """
+        units = []
+        unit_start = start
+        step = self.max_words - self.overlap_words
+        boundaries = [m.start() for m in CLAUSE_BOUNDARY.finditer(text, start, end)] + [end]
+        for boundary in boundaries:
+            words = [m.span() for m in WORD.finditer(text, unit_start, boundary)]
+            if len(words) <= self.max_words:
+                units.append(words)
+            else:
+                for i in range(0, len(words) - self.overlap_words, step):
+                    units.append(words[i:i + self.max_words])
+            unit_start = boundary
+        return [unit for unit in units if unit]
+
+    def _pack(self, text: str, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, word count) of chunks covering one page"""
+        units = self._units(text, start, end)
+        i = 0
+        while i < len(units):
+            # Take whole units while they fit
+            j, words = i, 0
+            while j < len(units) and words + len(units[j]) <= self.max_words:
+                words += len(units[j])
+                j += 1
+            yield units[i][0][0], units[j - 1][-1][1], words
+            if j >= len(units):
+                break
+
+            # Back up over trailing units that fit in the overlap, but always advance
+            k, overlap = j, 0
+            while k - 1 > i and overlap + len(units[k - 1]) <= self.overlap_words:
+                k -= 1
+                overlap += len(units[k])
+            i = k
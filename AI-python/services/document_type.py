@@ -1,7 +1,9 @@
 from enum import Enum
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Union
 from pydantic import BaseModel, Field
-import re
+
+from services.pattern_registry import get_pattern_registry
+from services.prepared_document import PreparedDocument
 
 
 class DocumentType(str, Enum):
@@ -542,61 +544,61 @@ class DocumentClassifier:
         }
     }
     
+    @staticmethod
+    def _combine_scores(regex_scores: Dict[DocumentType, float], embedding_scores: Dict[DocumentType, float],
+                        embedding_weight: float) -> Dict[DocumentType, float]:
+        """
+        The same weighted blend for every type, a missing score counting as 0,
+        so a type without regex patterns can't outrank one whose patterns matched
+        on its embedding score alone
+        """
+        return {
+            doc_type: (1 - embedding_weight) * regex_scores.get(doc_type, 0.0)
+                      + embedding_weight * embedding_scores.get(doc_type, 0.0)
+            for doc_type in {**regex_scores, **embedding_scores}
+        }
+    
     @classmethod
-    def classify_document(cls, text: str, confidence_threshold: float = 0.7) -> DocumentClassificationResult:
-        """Classify a document based on its content"""
+    def classify_document(cls, text: Union[str, PreparedDocument],
+                          confidence_threshold: float = 0.7,
+                          embedding_scores: Optional[Dict[DocumentType, float]] = None,
+                          embedding_weight: float = 0.5) -> DocumentClassificationResult:
+        """
+        Classify a document based on its content.
+        
+        embedding_scores, from EmbeddingTypeScorer, are blended into the regex
+        scores with embedding_weight; types without regex patterns blend a
+        regex score of 0.
+        """
         
-        text_lower = text.lower()
-        scores = {}
+        document = PreparedDocument.of(text)
         
-        for doc_type, patterns in cls.CLASSIFICATION_PATTERNS.items():
-            score = 0
-            matched_patterns = []
-            
-            # Check strong indicators (weight: 3)
-            for pattern in patterns["strong_indicators"]:
-                matches = len(re.findall(pattern, text_lower, re.IGNORECASE))
-                if matches > 0:
-                    score += matches * 3
-                    matched_patterns.append(f"Strong: {pattern}")
-            
-            # Check moderate indicators (weight: 2)
-            for pattern in patterns["moderate_indicators"]:
-                matches = len(re.findall(pattern, text_lower, re.IGNORECASE))
-                if matches > 0:
-                    score += matches * 2
-                    matched_patterns.append(f"Moderate: {pattern}")
-            
-            # Check context words (weight: 1)
-            context_score = 0
-            for word in patterns["context_words"]:
-                word_count = text_lower.count(word)
-                context_score += min(word_count, 5)  # Cap at 5 to prevent overwhelming
-            
-            score += context_score
-            
-            # Normalize score based on text length
-            normalized_score = min(score / (len(text.split()) * 0.01), 1.0)
-            scores[doc_type] = {
-                "score": normalized_score,
-                "matched_patterns": matched_patterns
-            }
+        # Every type scored at once from one pass over the indicators and context words
+        engine = get_pattern_registry().get_classification_engine()
+        scores, indicator_counts = engine.score(document)
+        type_scores = dict(zip(engine.doc_types, scores.tolist()))
+        if embedding_scores:
+            type_scores = cls._combine_scores(type_scores, embedding_scores, embedding_weight)
         
-        # Find best match
-        best_type = max(scores.keys(), key=lambda x: scores[x]["score"])
-        best_score = scores[best_type]["score"]
+        # Find best match (max keeps the first of any ties)
+        best_type = max(type_scores, key=type_scores.get)
+        best_score = type_scores[best_type]
         
         # Get alternatives
-        alternatives = [(doc_type, data["score"]) for doc_type, data in scores.items() 
-                      if doc_type != best_type and data["score"] > 0.1]
+        alternatives = [(doc_type, score) for doc_type, score in type_scores.items()
+                        if doc_type != best_type and score > 0.1]
         alternatives.sort(key=lambda x: x[1], reverse=True)
         alternatives = alternatives[:3]  # Top 3 alternatives
         
         # Determine final classification
         if best_score >= confidence_threshold:
             final_type = best_type
+            matched = (engine.matched_patterns(engine.doc_types.index(best_type), indicator_counts)
+                       if best_type in engine.doc_types else [])
             reasoning = f"Classified as {best_type.value} with {best_score:.2f} confidence. "
-            reasoning += f"Matched patterns: {', '.join(scores[best_type]['matched_patterns'][:3])}"
+            reasoning += f"Matched patterns: {', '.join(matched[:3])}"
+            if embedding_scores:
+                reasoning += f". Embedding similarity: {embedding_scores.get(best_type, 0.0):.2f}"
         else:
             final_type = DocumentType.GENERAL
             reasoning = f"Low confidence ({best_score:.2f}) for {best_type.value}. Using general classification."
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from services.worker_pools import BoundedExecutor, PoolSaturatedError
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent embedding requests into batched encoder calls.
+
+    The first request of a batch waits at most max_wait_ms for others to join,
+    and a batch is sent as soon as it reaches max_batch_size. While a batch is
+    encoding, new requests queue up and form the next batch immediately, so
+    under load batches fill without waiting out the window.
+
+    Batches run on pool, within its pending cap: a batch the pool turns away
+    fails each of its requests with PoolSaturatedError.
+    """
+
+    def __init__(
+        self,
+        encode_batch: Callable[[List[str]], List[List[float]]],
+        pool: BoundedExecutor,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        max_pending: int = 256
+    ):
+        self.encode_batch = encode_batch
+        self.pool = pool
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_pending = max_pending
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._pending = 0
+        self._batches = 0
+        self._items = 0
+
+    async def embed(self, text: str) -> List[float]:
+        if self._pending >= self.max_pending:
+            raise PoolSaturatedError("embedding", self.max_pending)
+        self._ensure_worker()
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending += 1
+        try:
+            self._queue.put_nowait((text, future))
+            return await future
+        finally:
+            self._pending -= 1
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            if deadline <= loop.time():
+                break
+            # Not wait_for: before 3.12 it can drop an item dequeued as the timeout fires
+            try:
+                async with asyncio.timeout_at(deadline):
+                    batch.append(await self._queue.get())
+            except TimeoutError:
+                break
+        # Callers that gave up while we waited don't need encoding
+        return [(text, future) for text, future in batch if not future.done()]
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            if not batch:
+                continue
+            try:
+                vectors = await self.pool.run(self.encode_batch, [text for text, _ in batch])
+            except Exception as e:
+                if not isinstance(e, PoolSaturatedError):
+                    logger.error(f"Batched embedding of {len(batch)} texts failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self._batches += 1
+            self._items += len(batch)
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "batches": self._batches,
+            "items": self._items,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0
+        }
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
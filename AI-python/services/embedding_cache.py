@@ -0,0 +1,220 @@
+import os
+import json
+import hashlib
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config.settings import get_settings, MODEL_CONFIGS
+
+logger = logging.getLogger(__name__)
+
+KEY_BYTES = 32  # SHA-256 digest
+
+
+def embedding_key(text: str, model: str, normalize: bool) -> bytes:
+    """
+    Cache key of an embedding input. Whitespace is collapsed first: the
+    tokenizer splits on it, so texts differing only in spacing embed the same.
+    """
+    normalized = " ".join(text.split())
+    return hashlib.sha256(f"{model}\x00{int(normalize)}\x00{normalized}".encode()).digest()
+
+
+class VectorFile:
+    """
+    Fixed-capacity embedding rows in a memory-mapped float32 file, with each
+    row's key in a parallel memory-mapped key file.
+
+    Rows are written as a ring: once full, the oldest row is overwritten. A
+    row's vector is written before its key, so a crash mid-write leaves a row
+    that is simply never found. The key -> row index lives in memory and is
+    rebuilt from the key file on open; meta.json records the dimension and
+    the write cursor. One process should write a directory at a time.
+    """
+
+    def __init__(self, directory: str, capacity: int):
+        self.directory = directory
+        self.capacity = capacity
+        self.dim: Optional[int] = None
+        self.rows = 0
+        self._next_row = 0
+        self._vectors: Optional[np.memmap] = None
+        self._keys: Optional[np.memmap] = None
+        self._index: Dict[bytes, int] = {}
+        os.makedirs(directory, exist_ok=True)
+        self._open_existing()
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    def _open_existing(self):
+        if not os.path.exists(self._meta_path):
+            return
+        try:
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+            if meta["capacity"] != self.capacity:
+                logger.warning(f"Embedding cache at {self.directory} has capacity {meta['capacity']}, "
+                               f"not {self.capacity}; starting it afresh")
+                return
+            self._map(meta["dim"], "r+")
+            self._next_row = meta["next_row"]
+            filled = np.flatnonzero(self._keys.any(axis=1))
+            self._index = {self._keys[row].tobytes(): int(row) for row in filled}
+            self.rows = len(filled)
+            logger.info(f"Opened embedding cache at {self.directory} with {self.rows} vectors")
+        except Exception as e:
+            logger.warning(f"Could not open embedding cache at {self.directory}, starting it afresh: {e}")
+            self._vectors = self._keys = None
+            self._index = {}
+            self.rows = self._next_row = 0
+
+    def _map(self, dim: int, mode: str):
+        self.dim = dim
+        self._vectors = np.memmap(os.path.join(self.directory, "vectors.f32"), dtype=np.float32,
+                                  mode=mode, shape=(self.capacity, dim))
+        self._keys = np.memmap(os.path.join(self.directory, "keys.bin"), dtype=np.uint8,
+                               mode=mode, shape=(self.capacity, KEY_BYTES))
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        row = self._index.get(key)
+        return None if row is None else np.array(self._vectors[row])
+
+    def put_many(self, keys: List[bytes], vectors: np.ndarray):
+        if self._vectors is None:
+            # Sparse files: the capacity costs disk only as rows are written
+            self._map(vectors.shape[1], "w+")
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding has {vectors.shape[1]} dimensions, the cache holds {self.dim}")
+        for key, vector in zip(keys, vectors):
+            if key in self._index:
+                continue
+            row = self._next_row
+            old_key = self._keys[row].tobytes()
+            if self._index.get(old_key) == row:
+                del self._index[old_key]
+                self.rows -= 1
+            self._keys[row] = 0
+            self._vectors[row] = vector
+            self._keys[row] = np.frombuffer(key, dtype=np.uint8)
+            self._index[key] = row
+            self.rows += 1
+            self._next_row = (row + 1) % self.capacity
+        self._vectors.flush()
+        self._keys.flush()
+        with open(self._meta_path, "w") as f:
+            json.dump({"dim": self.dim, "capacity": self.capacity, "next_row": self._next_row}, f)
+
+    @property
+    def bytes(self) -> int:
+        return self.rows * ((self.dim or 0) * 4 + KEY_BYTES)
+
+
+class EmbeddingCache:
+    """
+    Embeddings by input, so identical texts (boilerplate chunks, re-uploaded
+    documents) are encoded once.
+
+    Keys hash the whitespace-normalized text, the model name and the
+    normalize_embeddings flag. Lookups go to an in-process LRU of
+    memory_entries vectors, then to the VectorFile on disk when a directory
+    is given; disk hits are promoted to the LRU.
+    """
+
+    def __init__(self, model: str, normalize: bool, memory_entries: int = 4096,
+                 directory: Optional[str] = None, max_vectors: int = 100_000):
+        self.model = model
+        self.normalize = normalize
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._file: Optional[VectorFile] = None
+        if directory:
+            # A subdirectory per model and flag, since their dimensions can differ
+            name = hashlib.sha256(f"{model}\x00{int(normalize)}".encode()).hexdigest()[:16]
+            try:
+                self._file = VectorFile(os.path.join(directory, name), max_vectors)
+            except OSError as e:
+                logger.warning(f"Embedding cache directory {directory} unusable, caching in memory only: {e}")
+        self._lock = Lock()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+    def keys(self, texts: List[str]) -> List[bytes]:
+        return [embedding_key(text, self.model, self.normalize) for text in texts]
+
+    def get_many(self, keys: List[bytes]) -> List[Optional[np.ndarray]]:
+        """Cached vector for each key, None for misses"""
+        found: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self._memory_hits += 1
+                elif self._file is not None and (vector := self._file.get(key)) is not None:
+                    self._remember(key, vector)
+                    self._disk_hits += 1
+                else:
+                    self._misses += 1
+                found.append(vector)
+        return found
+
+    def put_many(self, keys: List[bytes], vectors: np.ndarray):
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                self._remember(key, np.array(vector, dtype=np.float32))
+            if self._file is not None:
+                try:
+                    self._file.put_many(keys, np.asarray(vectors, dtype=np.float32))
+                except Exception as e:
+                    # The encodings are still good; only persisting them failed
+                    logger.warning(f"Could not write embeddings to the cache file: {e}")
+
+    def _remember(self, key: bytes, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            hits = self._memory_hits + self._disk_hits
+            lookups = hits + self._misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": sum(vector.nbytes for vector in self._memory.values()),
+                "disk_entries": self._file.rows if self._file is not None else 0,
+                "disk_bytes": self._file.bytes if self._file is not None else 0,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+            }
+
+
+_embedding_cache = None
+_embedding_cache_lock = Lock()
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """The shared cache for the configured embedding model, or None when disabled"""
+    global _embedding_cache
+    settings = get_settings()
+    if not settings.embedding_cache_enabled:
+        return None
+    with _embedding_cache_lock:
+        if _embedding_cache is None:
+            config = MODEL_CONFIGS["embedding"]
+            _embedding_cache = EmbeddingCache(
+                config["model_name"],
+                config["normalize_embeddings"],
+                settings.embedding_cache_memory_entries,
+                settings.embedding_cache_dir,
+                settings.embedding_cache_max_vectors
+            )
+    return _embedding_cache
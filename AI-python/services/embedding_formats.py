@@ -0,0 +1,56 @@
+import json
+import struct
+import logging
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from services.document_chunker import TextChunk
+
+logger = logging.getLogger(__name__)
+
+BINARY_DTYPES = {"float32": "<f4", "float16": "<f2"}
+
+
+def encode_binary(
+    chunks: List[TextChunk],
+    embeddings: np.ndarray,
+    dtype: str = "float32",
+    model: Optional[str] = None,
+    include_text: bool = False
+) -> bytes:
+    """
+    Pack chunk embeddings as one little-endian buffer:
+
+        uint32 header length | UTF-8 JSON header | count x dim matrix, row-major
+
+    The header holds dtype, dim, count, model and the chunk metadata in row
+    order, so a client reads the length, parses the header and views the rest
+    as a (count, dim) array without copying.
+    """
+    if dtype not in BINARY_DTYPES:
+        raise ValueError(f"Unsupported dtype '{dtype}', expected one of {list(BINARY_DTYPES)}")
+
+    matrix = np.ascontiguousarray(embeddings, dtype=BINARY_DTYPES[dtype])
+    header = json.dumps({
+        "dtype": dtype,
+        "dim": int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+        "count": len(chunks),
+        "model": model,
+        "chunks": [chunk.to_dict(include_text) for chunk in chunks]
+    }).encode("utf-8")
+    return struct.pack("<I", len(header)) + header + matrix.tobytes()
+
+
+def iter_ndjson(
+    chunks: List[TextChunk],
+    embeddings: np.ndarray,
+    model: Optional[str] = None,
+    include_text: bool = True
+) -> Iterator[bytes]:
+    """Yield one JSON line per chunk with its metadata and embedding"""
+    for chunk, vector in zip(chunks, embeddings):
+        line = chunk.to_dict(include_text)
+        line["model"] = model
+        line["embedding"] = vector.tolist()
+        yield (json.dumps(line) + "\n").encode("utf-8")
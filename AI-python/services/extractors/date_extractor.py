@@ -1,8 +1,10 @@
 import re
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import logging
 
+from services.prepared_document import PreparedDocument
+
 logger = logging.getLogger(__name__)
 
 class DateExtractor:
@@ -67,30 +69,36 @@ class DateExtractor:
             r'ends?.*?(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})',
         ]
     
-    def extract_dates(self, text: str) -> List[Dict]:
-        """Extract all dates from text"""
+    def extract_dates(self, text: Union[str, PreparedDocument]) -> List[Dict]:
+        """Extract all dates from text, each with the page it is on (None for text without page markers)"""
+        document = PreparedDocument.of(text)
         dates = []
         
         # Extract absolute dates
-        dates.extend(self._extract_absolute_dates(text))
+        dates.extend(self._extract_absolute_dates(document))
         
         # Extract relative dates
-        dates.extend(self._extract_relative_dates(text))
+        dates.extend(self._extract_relative_dates(document))
         
         # Extract deadline dates
-        dates.extend(self._extract_deadline_dates(text))
+        dates.extend(self._extract_deadline_dates(document))
         
         # Remove duplicates and sort by location
         dates = self._deduplicate_dates(dates)
         dates.sort(key=lambda x: x.get('location', 0))
+        for date_item in dates:
+            date_item['page'] = document.page_at(date_item['location'])
         
         return dates
     
-    def _extract_absolute_dates(self, text: str) -> List[Dict]:
+    def _extract_absolute_dates(self, document: PreparedDocument) -> List[Dict]:
         """Extract absolute dates in various formats"""
+        text = document.text
         dates = []
         
         for pattern in self.date_patterns:
+            if not document.may_match(pattern):
+                continue
             matches = re.finditer(pattern, text, re.IGNORECASE)
             for match in matches:
                 parsed_date = self._parse_date_match(match)
@@ -111,11 +119,14 @@ class DateExtractor:
         
         return dates
     
-    def _extract_relative_dates(self, text: str) -> List[Dict]:
+    def _extract_relative_dates(self, document: PreparedDocument) -> List[Dict]:
         """Extract relative date expressions"""
+        text = document.text
         dates = []
         
         for pattern in self.relative_patterns:
+            if not document.may_match(pattern):
+                continue
             matches = re.finditer(pattern, text, re.IGNORECASE)
             for match in matches:
                 # Calculate relative date
@@ -137,11 +148,14 @@ class DateExtractor:
         
         return dates
     
-    def _extract_deadline_dates(self, text: str) -> List[Dict]:
+    def _extract_deadline_dates(self, document: PreparedDocument) -> List[Dict]:
         """Extract dates associated with deadlines"""
+        text = document.text
         dates = []
         
         for pattern in self.deadline_patterns:
+            if not document.may_match(pattern):
+                continue
             matches = re.finditer(pattern, text, re.IGNORECASE)
             for match in matches:
                 # Parse the date part
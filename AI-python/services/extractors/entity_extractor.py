@@ -1,9 +1,11 @@
 import re
-from typing import List, Dict, Set, Optional, Tuple
+from typing import List, Dict, Set, Optional, Tuple, Union
 from dataclasses import dataclass
 from collections import defaultdict
 import logging
 
+from services.prepared_document import PreparedDocument
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -17,6 +19,7 @@ class Entity:
     context: str
     normalized_value: Optional[str] = None
     metadata: Optional[Dict] = None
+    page: Optional[int] = None  # None for text without page markers
 
 class EntityExtractor:
     """Service for extracting named entities from legal documents"""
@@ -200,8 +203,10 @@ class EntityExtractor:
             'international', 'global', 'national', 'regional', 'foundation', 'institute'
         }
     
-    def extract_entities(self, text: str, entity_types: Optional[List[str]] = None) -> List[Entity]:
+    def extract_entities(self, text: Union[str, PreparedDocument],
+                         entity_types: Optional[List[str]] = None) -> List[Entity]:
         """Extract entities from text"""
+        document = PreparedDocument.of(text)
         if entity_types is None:
             entity_types = list(self.entity_patterns.keys())
         
@@ -209,7 +214,7 @@ class EntityExtractor:
         
         for entity_type in entity_types:
             if entity_type in self.entity_patterns:
-                entities.extend(self._extract_entities_by_type(text, entity_type))
+                entities.extend(self._extract_entities_by_type(document, entity_type))
         
         # Remove duplicates and overlapping entities
         entities = self._deduplicate_entities(entities)
@@ -219,8 +224,9 @@ class EntityExtractor:
         
         return entities
     
-    def _extract_entities_by_type(self, text: str, entity_type: str) -> List[Entity]:
+    def _extract_entities_by_type(self, document: PreparedDocument, entity_type: str) -> List[Entity]:
         """Extract entities of a specific type"""
+        text = document.text
         entities = []
         patterns = self.entity_patterns.get(entity_type, [])
         
@@ -228,6 +234,8 @@ class EntityExtractor:
             pattern = pattern_data["pattern"]
             confidence = pattern_data["confidence"]
             group = pattern_data.get("group", 0)
+            if not document.may_match(pattern):
+                continue
             
             matches = re.finditer(pattern, text, re.IGNORECASE)
             
@@ -258,7 +266,8 @@ class EntityExtractor:
                         end_position=match.end(),
                         context=context,
                         normalized_value=normalized_value,
-                        metadata=self._get_entity_metadata(entity_text, entity_type, context)
+                        metadata=self._get_entity_metadata(entity_text, entity_type, context),
+                        page=document.page_at(match.start())
                     )
                     
                     entities.append(entity)
@@ -422,10 +431,12 @@ class EntityExtractor:
             summary[entity.entity_type] += 1
         return dict(summary)
     
-    def extract_key_parties(self, text: str) -> Dict[str, List[Entity]]:
+    def extract_key_parties(self, text: Union[str, PreparedDocument]) -> Dict[str, List[Entity]]:
         """Extract key parties from legal document"""
+        document = PreparedDocument.of(text)
+        text = document.text
         # Extract persons and organizations
-        entities = self.extract_entities(text, ["person", "organization"])
+        entities = self.extract_entities(document, ["person", "organization"])
         
         parties = {
             "individuals": self.get_entities_by_type(entities, "person"),
@@ -455,7 +466,8 @@ class EntityExtractor:
                     end_position=match.end(),
                     context=context,
                     normalized_value=entity_text,
-                    metadata={"role": role}
+                    metadata={"role": role},
+                    page=document.page_at(match.start())
                 )
                 role_entities.append(entity)
             
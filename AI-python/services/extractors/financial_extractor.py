@@ -1,7 +1,8 @@
 import re
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from datetime import datetime
 from models.schemas import FinancialItem
+from services.prepared_document import PreparedDocument
 import logging
 
 logger = logging.getLogger(__name__)
@@ -100,18 +101,19 @@ class FinancialExtractor:
         }
 
     
-    def extract_financial_information(self, text: str) -> List[FinancialItem]:
+    def extract_financial_information(self, text: Union[str, PreparedDocument]) -> List[FinancialItem]:
         """Extract all financial information from text"""
+        document = PreparedDocument.of(text)
         financial_items = []
         
         # Extract currency amounts
-        financial_items.extend(self._extract_currency_amounts(text))
+        financial_items.extend(self._extract_currency_amounts(document))
         
         # Extract financial terms with amounts
-        financial_items.extend(self._extract_financial_terms(text))
+        financial_items.extend(self._extract_financial_terms(document))
         
         # Extract payment schedules
-        financial_items.extend(self._extract_payment_schedules(text))
+        financial_items.extend(self._extract_payment_schedules(document))
         
         # Remove duplicates and sort by location (if available)
         financial_items = self._deduplicate_financial_items(financial_items)
@@ -141,12 +143,15 @@ class FinancialExtractor:
             else:
                 raise e
     
-    def _extract_currency_amounts(self, text: str) -> List[FinancialItem]:
+    def _extract_currency_amounts(self, document: PreparedDocument) -> List[FinancialItem]:
         """Extract basic currency amounts"""
+        text = document.text
         items = []
         
         for currency, patterns in self.currency_patterns.items():
             for pattern in patterns:
+                if not document.may_match(pattern):
+                    continue
                 try:
                     matches = re.finditer(pattern, text, re.IGNORECASE)
                     for match in matches:
@@ -173,12 +178,15 @@ class FinancialExtractor:
         
         return items
     
-    def _extract_financial_terms(self, text: str) -> List[FinancialItem]:
+    def _extract_financial_terms(self, document: PreparedDocument) -> List[FinancialItem]:
         """Extract financial terms with associated amounts"""
+        text = document.text
         items = []
         
         for term_type, patterns in self.financial_terms.items():
             for pattern in patterns:
+                if not document.may_match(pattern):
+                    continue
                 try:
                     matches = re.finditer(pattern, text, re.IGNORECASE)
                     for match in matches:
@@ -208,8 +216,9 @@ class FinancialExtractor:
         
         return items
     
-    def _extract_payment_schedules(self, text: str) -> List[FinancialItem]:
+    def _extract_payment_schedules(self, document: PreparedDocument) -> List[FinancialItem]:
         """Extract payment schedule information"""
+        text = document.text
         items = []
         
         # Payment frequency patterns
@@ -0,0 +1,152 @@
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from services.document_chunker import DocumentChunker
+
+logger = logging.getLogger(__name__)
+
+# Rough tokens per word for English legal text under BPE tokenizers, used when
+# the pipeline doesn't expose its tokenizer
+TOKENS_PER_WORD = 1.3
+
+
+@dataclass
+class SummaryLevel:
+    """Timing for one map or reduce pass"""
+    level: int
+    inputs: int
+    input_tokens: int
+    seconds: float
+
+
+@dataclass
+class HierarchicalSummary:
+    summary: str
+    levels: List[SummaryLevel] = field(default_factory=list)
+    sampled: bool = False  # True when the document exceeded the token budget
+
+
+class HierarchicalSummarizer:
+    """
+    Map-reduce summarization over a loaded transformers summarization pipeline.
+
+    The text is split at page and clause boundaries into chunks the model can
+    take whole, the chunks are summarized in batched pipeline calls, and the
+    joined summaries are split and summarized again until they fit in a single
+    pass. Input past token_budget is sampled evenly across the document rather
+    than cut off, and reduction stops early once the joined summaries are short
+    enough to return as they are.
+    """
+
+    def __init__(
+        self,
+        summarizer: Callable,
+        chunk_tokens: int = 900,
+        token_budget: int = 16000,
+        batch_size: int = 4,
+        chunk_max_length: int = 150,
+        chunk_min_length: int = 30,
+        max_length: int = 300,
+        min_length: int = 50,
+        max_levels: int = 4
+    ):
+        self.summarizer = summarizer
+        self.tokenizer = getattr(summarizer, "tokenizer", None)
+        self.chunk_tokens = chunk_tokens
+        self.token_budget = token_budget
+        self.batch_size = batch_size
+        self.chunk_max_length = chunk_max_length
+        self.chunk_min_length = chunk_min_length
+        self.max_length = max_length
+        self.min_length = min_length
+        self.max_levels = max_levels
+        self.chunker = DocumentChunker(
+            max_words=max(1, int(chunk_tokens / TOKENS_PER_WORD)),
+            overlap_words=0
+        )
+
+    def count_tokens(self, text: str) -> int:
+        if self.tokenizer is not None:
+            return len(self.tokenizer.encode(text, add_special_tokens=False))
+        return int(len(text.split()) * TOKENS_PER_WORD)
+
+    def summarize(self, text: str) -> HierarchicalSummary:
+        result = HierarchicalSummary(summary="")
+        chunks = self._split(text)
+        chunks, result.sampled = self._within_budget(chunks)
+
+        for level in range(self.max_levels):
+            if len(chunks) <= 1:
+                break
+            summaries = self._run_level(result, level, chunks, self.chunk_max_length, self.chunk_min_length)
+            combined = "\n".join(summaries)
+            if self.count_tokens(combined) <= self.max_length:
+                # Short enough to be the summary; another pass would only paraphrase it
+                result.summary = combined
+                return result
+            chunks = self._split(combined)
+
+        final_input = "\n".join(chunks)
+        # Short inputs get proportionally short summaries
+        max_length = min(self.max_length, max(self.count_tokens(final_input) // 4, self.min_length))
+        result.summary = self._run_level(
+            result, len(result.levels), [final_input], max_length, self.min_length
+        )[0]
+        return result
+
+    def _split(self, text: str) -> List[str]:
+        """Model-sized chunks, merging neighbouring short pages so each pass is full"""
+        merged: List[str] = []
+        words = 0
+        for chunk in self.chunker.chunk(text):
+            if merged and words + chunk.word_count <= self.chunker.max_words:
+                merged[-1] += "\n" + chunk.text
+                words += chunk.word_count
+            else:
+                merged.append(chunk.text)
+                words = chunk.word_count
+        return merged
+
+    def _within_budget(self, chunks: List[str]):
+        tokens = [self.count_tokens(chunk) for chunk in chunks]
+        if sum(tokens) <= self.token_budget:
+            return chunks, False
+
+        keep = max(1, int(len(chunks) * self.token_budget / sum(tokens)))
+        step = len(chunks) / keep
+        sampled = [chunks[int(i * step)] for i in range(keep)]
+        logger.info(f"Summarizing {keep} of {len(chunks)} chunks to stay within {self.token_budget} tokens")
+        return sampled, True
+
+    def _run_level(self, result: HierarchicalSummary, level: int, texts: List[str],
+                   max_length: int, min_length: int) -> List[str]:
+        start = time.perf_counter()
+        input_tokens = sum(self.count_tokens(text) for text in texts)
+        summaries: List[Optional[str]] = [None] * len(texts)
+
+        # Chunks already shorter than a summary would be pass through unchanged
+        todo = []
+        for i, text in enumerate(texts):
+            if self.count_tokens(text) <= min_length * 2 and len(texts) > 1:
+                summaries[i] = text
+            else:
+                todo.append(i)
+
+        if todo:
+            outputs = self.summarizer(
+                [texts[i] for i in todo],
+                batch_size=self.batch_size,
+                max_length=max_length,
+                min_length=min_length,
+                do_sample=False,
+                truncation=True
+            )
+            for i, output in zip(todo, outputs):
+                summaries[i] = output["summary_text"]
+
+        seconds = time.perf_counter() - start
+        result.levels.append(SummaryLevel(level, len(texts), input_tokens, seconds))
+        logger.info(f"Summary level {level}: {len(texts)} inputs, {input_tokens} tokens in {seconds:.2f}s")
+        return summaries
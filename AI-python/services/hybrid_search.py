@@ -0,0 +1,94 @@
+import logging
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.lexical_index import LexicalIndex
+from services.vector_store import SearchHit, VectorStore
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ("hybrid", "vector", "lexical")
+
+
+@dataclass
+class FusedHit:
+    """A chunk ranked by reciprocal-rank fusion, with its rank and score in each retriever that found it"""
+    doc_id: str
+    chunk_index: int
+    score: float
+    start: int
+    end: int
+    page: Optional[int]
+    text: Optional[str] = None
+    vector_rank: Optional[int] = None
+    vector_score: Optional[float] = None
+    lexical_rank: Optional[int] = None
+    lexical_score: Optional[float] = None
+
+    def to_dict(self, include_text: bool = True) -> Dict:
+        data = asdict(self)
+        if not include_text:
+            del data["text"]
+        return data
+
+
+def reciprocal_rank_fusion(rankings: Dict[str, List[SearchHit]], k: int = 60) -> List[FusedHit]:
+    """
+    Merge ranked hit lists by summing 1 / (k + rank) per chunk (ranks from 1).
+
+    Rankings are keyed "vector" and "lexical". Chunks are identified by
+    (doc_id, chunk_index), which both indexes share since both chunk a
+    document's stored text with the same DocumentChunker.
+    """
+    fused: Dict[Tuple[str, int], FusedHit] = {}
+    for name, hits in rankings.items():
+        for rank, hit in enumerate(hits, start=1):
+            key = (hit.doc_id, hit.chunk_index)
+            entry = fused.get(key)
+            if entry is None:
+                entry = fused[key] = FusedHit(hit.doc_id, hit.chunk_index, 0.0, hit.start, hit.end, hit.page)
+            entry.score += 1.0 / (k + rank)
+            entry.text = entry.text or hit.text
+            setattr(entry, f"{name}_rank", rank)
+            setattr(entry, f"{name}_score", hit.score)
+    return sorted(fused.values(), key=lambda hit: hit.score, reverse=True)
+
+
+class HybridSearcher:
+    """
+    Searches the lexical (BM25) and vector indexes and fuses their rankings.
+
+    Each retriever contributes its top `candidates` chunks, and fusion ranks
+    by position rather than score, so BM25 and cosine scales never need
+    reconciling: an exact clause reference or defined term the embedding
+    misses still ranks through BM25. Documents analyzed but never indexed
+    for vectors are found lexically. Both indexes keep the text of the
+    documents they hold, so every hit carries its chunk text.
+    """
+
+    def __init__(self, lexical_index: LexicalIndex, vector_store: VectorStore,
+                 rrf_k: int = 60, candidates: int = 50):
+        self.lexical_index = lexical_index
+        self.vector_store = vector_store
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+
+    def search(self, query: str, query_embedding: Optional[np.ndarray], top_k: int = 5,
+               doc_ids: Optional[List[str]] = None, exact: bool = False, include_text: bool = True,
+               mode: str = "hybrid") -> List[FusedHit]:
+        """query_embedding may be None in lexical mode, or when the vector store is empty"""
+        depth = top_k if mode != "hybrid" else max(top_k, self.candidates)
+        rankings: Dict[str, List[SearchHit]] = {}
+        if mode in ("hybrid", "vector") and query_embedding is not None:
+            rankings["vector"] = self.vector_store.search(query_embedding, depth, doc_ids, exact, include_text)
+        if mode in ("hybrid", "lexical"):
+            rankings["lexical"] = self.lexical_index.search(query, depth, doc_ids, include_text)
+
+        hits = reciprocal_rank_fusion(rankings, self.rrf_k)[:top_k]
+        if mode != "hybrid":
+            # One ranking: report its own score rather than the fused one
+            for hit in hits:
+                hit.score = getattr(hit, f"{mode}_score")
+        return hits
@@ -0,0 +1,51 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+from services.multi_pattern_scanner import LiteralTrie
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TermOccurrences:
+    """Where a legal term first appears in a document and how often it appears"""
+    term: str
+    first_location: int
+    count: int = 1
+
+
+class LegalTermIndex:
+    """
+    Prebuilt case-insensitive, word-boundary aware index over the LEGAL_TERMS keys.
+
+    find_terms() replaces one re.search per term with a single pass over the text
+    and also counts every occurrence of every term.
+    """
+
+    def __init__(self, legal_terms: Dict[str, Any]):
+        self.legal_terms = legal_terms
+        # Folded key -> original key, keeping the first spelling of any duplicates
+        self._terms: Dict[str, str] = {}
+        for term in legal_terms:
+            self._terms.setdefault(term.lower(), term)
+        self._trie = LiteralTrie(list(self._terms), word_boundary=True)
+
+    def occurrences(self, text: str) -> Iterator[Tuple[str, int]]:
+        """Yield (LEGAL_TERMS key, start) for every occurrence, in order of start position"""
+        for folded, start in self._trie.finditer(text):
+            yield self._terms[folded], start
+
+    def find_terms(self, text: str) -> Dict[str, TermOccurrences]:
+        """Occurrences keyed by LEGAL_TERMS key, in LEGAL_TERMS order"""
+        return self.tally(self.occurrences(text))
+
+    def tally(self, occurrences: Iterable[Tuple[str, int]]) -> Dict[str, TermOccurrences]:
+        """find_terms() from (term, start) pairs already found by occurrences()"""
+        found: Dict[str, TermOccurrences] = {}
+        for term, start in occurrences:
+            if term in found:
+                found[term].count += 1
+            else:
+                found[term] = TermOccurrences(term=term, first_location=start)
+        return {term: found[term] for term in self.legal_terms if term in found}
@@ -0,0 +1,283 @@
+import math
+import logging
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import get_settings
+from services.document_chunker import TextChunk
+from services.prepared_document import PreparedDocument
+from services.vector_store import SearchHit
+
+logger = logging.getLogger(__name__)
+
+# Stripped from both ends of a token, keeping inner dots and hyphens: "12.3." -> "12.3", "(a)" -> "a"
+TOKEN_PUNCTUATION = "\"'()[]{}<>,.;:!?*`§"
+
+MAX_TF = 65535  # term frequencies are stored as uint16
+
+
+def chunk_terms(document: PreparedDocument, chunks: List[TextChunk]) -> List[Counter]:
+    """
+    Term counts of each chunk (offsets into document.text) as the lexical index sees them.
+
+    Terms come from the document's shared views rather than a new pass over
+    each chunk: the whitespace token_spans classification counts words by,
+    read off the lowercase view and stripped of surrounding punctuation, so
+    "Section 12.3," gives "section" and "12.3"; and, as one term each, the
+    multi-word terms among the legal_term_occurrences the key terms stage
+    finds, so "liquidated damages" matches as a phrase as well as word by word.
+    """
+    spans = document.token_spans
+    starts = [start for start, _ in spans]
+    # lower() can change the length of some non-ASCII text; only then lowercase token by token
+    lower = document.lower if len(document.lower) == len(document.text) else None
+    phrases = [(start, term.lower()) for term, start in document.legal_term_occurrences if " " in term]
+    phrase_starts = [start for start, _ in phrases]
+
+    counts = []
+    for chunk in chunks:
+        terms: Counter = Counter()
+        for start, end in spans[bisect_left(starts, chunk.start):bisect_left(starts, chunk.end)]:
+            token = lower[start:end] if lower is not None else document.text[start:end].lower()
+            token = token.strip(TOKEN_PUNCTUATION)
+            if token:
+                terms[token] += 1
+        for _, phrase in phrases[bisect_left(phrase_starts, chunk.start):bisect_left(phrase_starts, chunk.end)]:
+            terms[phrase] += 1
+        counts.append(terms)
+    return counts
+
+
+def query_terms(query: str) -> Counter:
+    document = PreparedDocument(query)
+    return chunk_terms(document, [TextChunk(0, document.text, 0, len(document.text), None, document.word_count)])[0]
+
+
+class LexicalIndex:
+    """
+    BM25 over document chunks, in an inverted index grown as documents are added.
+
+    Each term's postings are two parallel arrays of chunk IDs and term
+    frequencies; adding a document appends its chunks under fresh IDs, so
+    nothing already indexed is rebuilt. A search reads the postings of the
+    query's terms straight into NumPy, counting document frequencies over the
+    live chunks as it goes. Deleting a document only masks its chunks (a
+    document is one contiguous ID range); the postings are rewritten without
+    them once they outnumber the live ones. Past max_chunks the oldest
+    documents are dropped.
+
+    Each document's text is kept with its entry, so hits carry their chunk
+    text for as long as the document stays searchable, whatever happens to
+    it in the document store (which /embed and the embedding endpoints
+    consume from). max_chunks bounds that text along with the postings.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, max_chunks: Optional[int] = None):
+        self.k1 = k1
+        self.b = b
+        self.max_chunks = max_chunks
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        # doc_id -> (first chunk ID, chunk count, text), oldest first
+        self._documents: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+        self._size = 0  # chunk IDs handed out
+        self._capacity = 0
+        self._alive = np.zeros(0, dtype=bool)
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._chunk_index = np.zeros(0, dtype=np.int32)
+        self._start = np.zeros(0, dtype=np.int64)
+        self._end = np.zeros(0, dtype=np.int64)
+        self._page = np.zeros(0, dtype=np.int32)  # -1 for chunks outside page framing
+        self._chunk_docs: List[Optional[str]] = []
+        self._live_chunks = 0
+        self._live_length = 0.0
+        self._posting_count = 0
+        self._text_bytes = 0
+        self._lock = Lock()
+        self._searches = 0
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._documents
+
+    def _grow(self, needed: int):
+        if needed <= self._capacity:
+            return
+        capacity = max(needed, self._capacity * 2, 1024)
+        grow = capacity - self._capacity
+        self._alive = np.concatenate([self._alive, np.zeros(grow, dtype=bool)])
+        self._lengths = np.concatenate([self._lengths, np.zeros(grow, dtype=np.float32)])
+        self._chunk_index = np.concatenate([self._chunk_index, np.zeros(grow, dtype=np.int32)])
+        self._start = np.concatenate([self._start, np.zeros(grow, dtype=np.int64)])
+        self._end = np.concatenate([self._end, np.zeros(grow, dtype=np.int64)])
+        self._page = np.concatenate([self._page, np.full(grow, -1, dtype=np.int32)])
+        self._chunk_docs.extend([None] * grow)
+        self._capacity = capacity
+
+    def add(self, doc_id: str, document: PreparedDocument, chunks: List[TextChunk]) -> int:
+        """
+        Index a document's chunks, replacing any it had; returns the number
+        indexed. Chunk offsets are into document.text, which may run past the
+        last chunk (an analysis text with table summaries appended, say).
+        """
+        # Tokenized outside the lock, so concurrent adds only serialize on the appends
+        terms_by_chunk = chunk_terms(document, chunks)
+        text = document.text[:chunks[-1].end] if chunks else ""
+        with self._lock:
+            self._delete(doc_id)
+            first = self._size
+            self._grow(first + len(chunks))
+            for chunk_id, (chunk, terms) in enumerate(zip(chunks, terms_by_chunk), start=first):
+                length = sum(terms.values())
+                self._alive[chunk_id] = True
+                self._lengths[chunk_id] = length
+                self._chunk_index[chunk_id] = chunk.index
+                self._start[chunk_id] = chunk.start
+                self._end[chunk_id] = chunk.end
+                self._page[chunk_id] = -1 if chunk.page is None else chunk.page
+                self._chunk_docs[chunk_id] = doc_id
+                self._live_length += length
+                for term, count in terms.items():
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        postings = self._postings[term] = (array("i"), array("H"))
+                    postings[0].append(chunk_id)
+                    postings[1].append(min(count, MAX_TF))
+                self._posting_count += len(terms)
+            self._documents[doc_id] = (first, len(chunks), text)
+            self._text_bytes += len(text)
+            self._size += len(chunks)
+            self._live_chunks += len(chunks)
+
+            if self.max_chunks is not None:
+                while self._live_chunks > self.max_chunks and len(self._documents) > 1:
+                    self._delete(next(iter(self._documents)))
+            return len(chunks)
+
+    def delete(self, doc_id: str) -> bool:
+        with self._lock:
+            return self._delete(doc_id)
+
+    def _delete(self, doc_id: str) -> bool:
+        entry = self._documents.pop(doc_id, None)
+        if entry is None:
+            return False
+        first, count, text = entry
+        self._text_bytes -= len(text)
+        self._alive[first:first + count] = False
+        self._live_chunks -= count
+        self._live_length -= float(self._lengths[first:first + count].sum())
+        for chunk_id in range(first, first + count):
+            self._chunk_docs[chunk_id] = None
+        if self._size - self._live_chunks > max(self._live_chunks, 10_000):
+            self._compact()
+        return True
+
+    def _compact(self):
+        """Renumber live chunks from 0 and drop deleted ones, and terms left without any, from the postings"""
+        live = np.flatnonzero(self._alive[:self._size])
+        new_ids = np.full(self._size, -1, dtype=np.int32)
+        new_ids[live] = np.arange(len(live), dtype=np.int32)
+        self._posting_count = 0
+        for term, (ids, tfs) in list(self._postings.items()):
+            old = np.frombuffer(ids, dtype=np.int32)
+            keep = self._alive[old]
+            if not keep.any():
+                del self._postings[term]
+                continue
+            self._postings[term] = (array("i", new_ids[old[keep]].tobytes()),
+                                    array("H", np.frombuffer(tfs, dtype=np.uint16)[keep].tobytes()))
+            self._posting_count += int(keep.sum())
+        for values in (self._lengths, self._chunk_index, self._start, self._end, self._page):
+            values[:len(live)] = values[live]
+        self._alive[:] = False
+        self._alive[:len(live)] = True
+        self._chunk_docs = [self._chunk_docs[chunk_id] for chunk_id in live] + [None] * (self._capacity - len(live))
+        self._documents = OrderedDict(
+            (doc_id, (int(new_ids[first]), count, text))
+            for doc_id, (first, count, text) in self._documents.items()
+        )
+        self._size = len(live)
+        logger.info(f"Compacted lexical index to {self._size} chunks")
+
+    def search(self, query: str, top_k: int = 5, doc_ids: Optional[List[str]] = None,
+               include_text: bool = True) -> List[SearchHit]:
+        """The top_k chunks by BM25 score for the query, best first; chunks matching no term are left out"""
+        terms = query_terms(query)
+        with self._lock:
+            self._searches += 1
+            if not terms or not self._live_chunks or top_k <= 0:
+                return []
+            average_length = self._live_length / self._live_chunks
+            ids, weights = [], []
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                term_ids = np.frombuffer(postings[0], dtype=np.int32)
+                df = int(np.count_nonzero(self._alive[term_ids]))
+                if not df:
+                    continue
+                idf = math.log(1 + (self._live_chunks - df + 0.5) / (df + 0.5))
+                tf = np.frombuffer(postings[1], dtype=np.uint16).astype(np.float32)
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[term_ids] / average_length)
+                ids.append(term_ids)
+                weights.append(idf * tf * (self.k1 + 1) / (tf + norm))
+            if not ids:
+                return []
+
+            scores = np.bincount(np.concatenate(ids), weights=np.concatenate(weights), minlength=self._size)
+            scores[~self._alive[:self._size]] = 0
+            if doc_ids is not None:
+                allowed = np.zeros(self._size, dtype=bool)
+                for doc_id in doc_ids:
+                    if doc_id in self._documents:
+                        first, count, _ = self._documents[doc_id]
+                        allowed[first:first + count] = True
+                scores[~allowed] = 0
+            candidates = np.flatnonzero(scores)
+            top_k = min(top_k, len(candidates))
+            if top_k == 0:
+                return []
+            best = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            hits = []
+            for chunk_id in best:
+                doc_id = self._chunk_docs[chunk_id]
+                start, end = int(self._start[chunk_id]), int(self._end[chunk_id])
+                hits.append(SearchHit(
+                    doc_id=doc_id,
+                    chunk_index=int(self._chunk_index[chunk_id]),
+                    score=round(float(scores[chunk_id]), 6),
+                    start=start,
+                    end=end,
+                    page=None if self._page[chunk_id] < 0 else int(self._page[chunk_id]),
+                    text=self._documents[doc_id][2][start:end] if include_text else None
+                ))
+            return hits
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "documents": len(self._documents),
+                "chunks": self._live_chunks,
+                "terms": len(self._postings),
+                "postings": self._posting_count,
+                "text_bytes": self._text_bytes,
+                "searches": self._searches
+            }
+
+
+_lexical_index = None
+_lexical_index_lock = Lock()
+
+def get_lexical_index() -> LexicalIndex:
+    global _lexical_index
+    with _lexical_index_lock:
+        if _lexical_index is None:
+            settings = get_settings()
+            _lexical_index = LexicalIndex(settings.bm25_k1, settings.bm25_b, settings.lexical_index_max_chunks)
+    return _lexical_index
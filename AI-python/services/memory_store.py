@@ -1,46 +1,448 @@
 
 __all__ = ['memory_store']
 
-from threading import Lock
+import os
+import sys
+import time
+import pickle
+import shutil
+import hashlib
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate bytes held by a stored record: its containers, strings, arrays and DataFrames"""
+    if hasattr(value, "memory_usage") and hasattr(value, "columns"):  # pandas DataFrame
+        return int(value.memory_usage(index=True, deep=True).sum())
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SpillStore:
+    """
+    Records evicted from memory, pickled one file per document, oldest
+    dropped first past max_bytes.
+
+    Each process spills to its own pid-<PID> subdirectory of directory,
+    created on the first spill: every worker process imports the services
+    package, and so builds a store of its own, but must never touch the
+    parent's files. Subdirectories of exited processes, whose indexes died
+    with them, are removed by remove_stale() at app startup.
+
+    Its lock only guards the index; pickling and file reads, writes and
+    removals happen outside it. Every spill writes a file of its own, so a
+    record spilled again while an older copy is being read or removed never
+    shares that copy's path.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.directory = os.path.join(root, f"pid-{os.getpid()}")
+        self.max_bytes = max_bytes
+        # doc_id -> (file path, file size, expires_at), oldest spill first
+        self._index: "OrderedDict[str, Tuple[str, int, float]]" = OrderedDict()
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self._serial = itertools.count()
+
+    def _path(self, doc_id: str) -> str:
+        digest = hashlib.sha256(doc_id.encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}-{next(self._serial)}.pkl")
+
+    @staticmethod
+    def remove_stale(root: str) -> int:
+        """Delete the spill subdirectories of processes no longer running; returns how many"""
+        if not os.path.isdir(root):
+            return 0
+        removed = 0
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            if not (name.startswith("pid-") and name[4:].isdigit() and os.path.isdir(path)):
+                continue
+            pid = int(name[4:])
+            if pid != os.getpid() and not _process_alive(pid):
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def write(self, doc_id: str, value: Any) -> Tuple[str, int]:
+        """Pickle a record to a file of its own; returns its path and size, for register()"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(doc_id)
+        # Written under a temporary name so a crash never leaves half a file behind the real one
+        partial = f"{path}.tmp"
+        with open(partial, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        size = os.path.getsize(partial)
+        os.replace(partial, path)
+        return path, size
+
+    def register(self, doc_id: str, path: str, size: int, expires_at: float) -> List[str]:
+        """Index a written record; returns the files of older records dropped to fit it, for remove()"""
+        with self._lock:
+            self._index[doc_id] = (path, size, expires_at)
+            self.bytes += size
+            dropped = []
+            while self.bytes > self.max_bytes and len(self._index) > 1:
+                dropped.append(self._pop(next(iter(self._index))))
+            return dropped
+
+    def claim(self, doc_id: str) -> Optional[Tuple[str, float]]:
+        """Drop a record from the index and return its (path, expires_at), for read()"""
+        with self._lock:
+            entry = self._index.get(doc_id)
+            if entry is None:
+                return None
+            self._pop(doc_id)
+            return entry[0], entry[2]
+
+    def read(self, doc_id: str, path: str) -> Optional[Any]:
+        """Load a claimed record and delete its file; None when unreadable"""
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Could not read spilled document {doc_id}: {e}")
+            return None
+        finally:
+            self._remove([path])
+
+    def forget(self, doc_id: str) -> Optional[str]:
+        """Drop a record from the index only; returns its file path for remove()"""
+        with self._lock:
+            return self._pop(doc_id)
+
+    def remove(self, paths: List[Optional[str]]):
+        """Delete the files of records already dropped from the index"""
+        self._remove(paths)
+
+    def expire(self, now: float) -> int:
+        with self._lock:
+            expired = [
+                self._pop(doc_id) for doc_id, (_, _, expires_at) in list(self._index.items()) if expires_at < now
+            ]
+        self._remove(expired)
+        return len(expired)
+
+    def _pop(self, doc_id: str) -> Optional[str]:
+        """Drop a record from the index (lock held); returns its file path, if it was there"""
+        entry = self._index.pop(doc_id, None)
+        if entry is None:
+            return None
+        self.bytes -= entry[1]
+        return entry[0]
+
+    def _remove(self, paths):
+        for path in paths:
+            if path is None:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def __contains__(self, doc_id: str) -> bool:
+        with self._lock:
+            return doc_id in self._index
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+
+class _Load:
+    """A spilled record being read back outside the lock, which other lookups wait for"""
+
+    __slots__ = ("done", "cancelled")
 
-class MemoryStore:
     def __init__(self):
-        self._store = {}
-        self._lock = Lock()
-        self._last_doc_id = None 
+        self.done = threading.Event()
+        self.cancelled = False  # deleted or saved again before it was back in memory
+
+
+class MemoryStore:
+    """
+    Extracted documents kept between /analyze and the /embed calls that read them.
+
+    Each record's size is estimated when it is saved, and the records together
+    stay within max_bytes: past it, the least recently used are spilled to
+    spill_dir when one is configured, and dropped otherwise. Records expire
+    ttl seconds after they were saved, in memory or on disk. The most recent
+    record is never evicted by the budget, so a document larger than the whole
+    budget can still be embedded straight after its analysis.
+
+    Size estimates, pickling and disk IO run outside the lock, so one slow
+    spill never stalls other requests' lookups. Endpoints still call in from
+    a worker pool rather than the event loop.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, ttl: Optional[float] = None,
+                 spill_dir: Optional[str] = None, spill_max_bytes: int = 1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # doc_id -> (record, size, expires_at), least recently used first
+        self._store: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._spill = SpillStore(spill_dir, spill_max_bytes) if spill_dir else None
+        # Evicted records while they are written out, and spilled ones while they
+        # are read back; both happen outside the lock
+        self._spilling: Dict[str, Tuple[Any, int, float]] = {}
+        self._loading: Dict[str, _Load] = {}
+        self._forgotten: List[str] = []  # spill files to remove once the lock is released
+        self._lock = threading.Lock()
+        self._last_doc_id = None
+        self._hits = 0
+        self._misses = 0
+        self._spills = 0
+        self._spill_hits = 0
+        self._evictions = 0
+        self._expirations = 0
 
     def save(self, doc_id, text):
+        size = estimate_size(text)  # walks every DataFrame; not under the lock
         with self._lock:
-            self._store[doc_id] = text
+            now = time.time()
+            self._discard(doc_id)
+            expires_at = now + self.ttl if self.ttl else float("inf")
+            self._store[doc_id] = (text, size, expires_at)
+            self._bytes += size
             self._last_doc_id = doc_id
+            self._expire(now)
+            evicted = self._enforce_budget()
+        if self._spill is not None:
+            expired = self._spill.expire(now)
+            if expired:
+                with self._lock:
+                    self._expirations += expired
+        self._spill_out(evicted)
 
     def get(self, doc_id):
-        with self._lock:
-            return self._store.get(doc_id)
-    
+        while True:
+            with self._lock:
+                record, load, claimed = self._get(doc_id)
+            self._remove_forgotten()
+            if load is None:
+                return record
+            if claimed is None:
+                # Another request is reading it back from disk
+                load.done.wait()
+                continue
+            record = self._load(doc_id, load, *claimed)
+            if not load.cancelled:
+                return record
+
+    def get_many(self, doc_ids) -> Dict[str, Any]:
+        """Look up several documents in one call; missing ones map to None"""
+        return {doc_id: self.get(doc_id) for doc_id in dict.fromkeys(doc_ids)}
+
     def get_last(self):
         """Get the most recently saved document"""
-        with self._lock:
-            if self._last_doc_id and self._last_doc_id in self._store:
-                return self._store[self._last_doc_id]
-            return None
-    
+        doc_id = self.get_last_doc_id()
+        return self.get(doc_id) if doc_id else None
+
     def get_last_doc_id(self):
         """Get the ID of the most recently saved document"""
         with self._lock:
             return self._last_doc_id
-        
+
+    def delete(self, doc_id) -> bool:
+        with self._lock:
+            if doc_id == self._last_doc_id:
+                self._last_doc_id = None
+            deleted = self._discard(doc_id)
+        self._remove_forgotten()
+        return deleted
+
     def delete_last(self):
         """Delete the most recently saved document"""
         with self._lock:
-            if self._last_doc_id and self._last_doc_id in self._store:
-                del self._store[self._last_doc_id]
+            deleted = bool(self._last_doc_id) and self._discard(self._last_doc_id)
+            if deleted:
                 self._last_doc_id = None
-                return True
+        self._remove_forgotten()
+        return deleted
+
+    def _get(self, doc_id) -> Tuple[Any, Optional["_Load"], Optional[Tuple[str, float]]]:
+        """
+        Look a record up with the lock held: (record, None, None) when it is in
+        memory or missing, (None, load, None) while another request reads it
+        back from disk, and (None, load, (path, expires_at)) once it has been
+        claimed from disk for the caller to _load without the lock.
+        """
+        now = time.time()
+        entry = self._store.get(doc_id)
+        if entry is None and doc_id in self._spilling:
+            # Evicted, and still being written out: take it straight back
+            entry = self._store[doc_id] = self._spilling.pop(doc_id)
+            self._bytes += entry[1]
+        if entry is not None:
+            if entry[2] < now:
+                self._discard(doc_id)
+                self._expirations += 1
+                self._misses += 1
+                return None, None, None
+            self._store.move_to_end(doc_id)
+            self._hits += 1
+            return entry[0], None, None
+
+        load = self._loading.get(doc_id)
+        if load is not None:
+            return None, load, None
+        claimed = self._spill.claim(doc_id) if self._spill is not None else None
+        if claimed is None:
+            self._misses += 1
+            return None, None, None
+        if claimed[1] < now:
+            self._forgotten.append(claimed[0])
+            self._expirations += 1
+            self._misses += 1
+            return None, None, None
+        load = self._loading[doc_id] = _Load()
+        return None, load, claimed
+
+    def _load(self, doc_id, load: "_Load", path: str, expires_at: float):
+        """Read a claimed record back into memory as the most recently used one"""
+        evicted = []
+        try:
+            value = self._spill.read(doc_id, path)
+            size = estimate_size(value) if value is not None else 0
+            with self._lock:
+                if self._loading.get(doc_id) is load:
+                    del self._loading[doc_id]
+                if load.cancelled:
+                    return None  # deleted or saved again meanwhile; get() looks again
+                if value is None:
+                    self._misses += 1
+                    return None
+                self._store[doc_id] = (value, size, expires_at)
+                self._bytes += size
+                evicted = self._enforce_budget(keep=doc_id)
+                self._spill_hits += 1
+                self._hits += 1
+                return value
+        finally:
+            load.done.set()
+            self._spill_out(evicted)
+
+    def _discard(self, doc_id) -> bool:
+        load = self._loading.pop(doc_id, None)
+        if load is not None:
+            load.cancelled = True
+            return True
+        if self._spilling.pop(doc_id, None) is not None:
+            return True
+        entry = self._store.pop(doc_id, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+            return True
+        forgotten = self._spill.forget(doc_id) if self._spill is not None else None
+        if forgotten is None:
             return False
+        self._forgotten.append(forgotten)
+        return True
 
-# Create a global instance to persist across requests
-# memory_store = MemoryStore()
+    def _remove_forgotten(self):
+        """Delete the spill files of records dropped under the lock, after releasing it"""
+        if self._spill is None:
+            return
+        with self._lock:
+            forgotten, self._forgotten = self._forgotten, []
+        self._spill.remove(forgotten)
 
+    def _expire(self, now: float):
+        expired = [doc_id for doc_id, (_, _, expires_at) in self._store.items() if expires_at < now]
+        for doc_id in expired:
+            self._discard(doc_id)
+        self._expirations += len(expired)
 
+    def _enforce_budget(self, keep=None) -> List[str]:
+        """
+        Evict least recently used records until within max_bytes, sparing the
+        last saved one and keep. Lock held; returns the IDs the caller must
+        pass to _spill_out once it has released the lock.
+        """
+        if self.max_bytes is None:
+            return []
+        spared = {self._last_doc_id, keep}
+        evicted = []
+        for doc_id in list(self._store):
+            if self._bytes <= self.max_bytes:
+                break
+            if doc_id in spared:
+                continue
+            entry = self._store.pop(doc_id)
+            self._bytes -= entry[1]
+            if self._spill is not None:
+                self._spilling[doc_id] = entry
+                evicted.append(doc_id)
+            else:
+                self._evictions += 1
+        return evicted
 
+    def _spill_out(self, doc_ids: List[str]):
+        """Write evicted records to disk without holding the lock"""
+        for doc_id in doc_ids:
+            with self._lock:
+                entry = self._spilling.get(doc_id)
+            if entry is None:
+                continue  # read back or deleted already
+            try:
+                path, size = self._spill.write(doc_id, entry[0])
+            except Exception as e:
+                logger.warning(f"Could not spill document {doc_id}, dropping it: {e}")
+                with self._lock:
+                    if self._spilling.get(doc_id) is entry:
+                        del self._spilling[doc_id]
+                        self._evictions += 1
+                continue
+            with self._lock:
+                if self._spilling.get(doc_id) is entry:
+                    del self._spilling[doc_id]
+                    dropped = self._spill.register(doc_id, path, size, entry[2])
+                    self._evictions += len(dropped)
+                    self._spills += 1
+                else:
+                    dropped = [path]  # read back or deleted while it was being written
+                self._forgotten.extend(dropped)
+        self._remove_forgotten()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._store) + len(self._spilling) + len(self._loading),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "spilled_entries": len(self._spill) if self._spill is not None else 0,
+                "spilled_bytes": self._spill.bytes if self._spill is not None else 0,
+                "spills": self._spills,
+                "spill_hits": self._spill_hits,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0
+            }
+
+# Create a global instance to persist across requests
+# memory_store = MemoryStore()
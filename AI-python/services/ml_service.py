@@ -1,8 +1,12 @@
 from transformers import pipeline
 from sentence_transformers import SentenceTransformer
 import torch
-from typing import List, Optional
+import numpy as np
+from typing import List, Optional, Union
 from config.settings import get_settings, MODEL_CONFIGS
+from services.embedding_cache import EmbeddingCache, get_embedding_cache
+from services.hierarchical_summarizer import HierarchicalSummarizer, HierarchicalSummary
+from services.prepared_document import PreparedDocument
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,6 +21,8 @@ class MLService:
         # Model placeholders
         self.embedder: Optional[SentenceTransformer] = None
         self.summarizer = None
+        self.hierarchical_summarizer: Optional[HierarchicalSummarizer] = None
+        self.embedding_cache: Optional[EmbeddingCache] = get_embedding_cache()
         
     def load_models(self):
         """Load all ML models"""
@@ -41,59 +47,98 @@ class MLService:
             logger.error(f"Error loading models: {str(e)}")
             raise Exception(f"Failed to load ML models: {str(e)}")
     
+    def _truncate_for_embedding(self, text: str) -> str:
+        # Truncate text if too long
+        max_length = 512  # Most models have token limits
+        words = text.split()
+        if len(words) > max_length:
+            text = ' '.join(words[:max_length])
+        return text
+    
     def get_embedding(self, text: str) -> List[float]:
         """Generate embedding for text"""
         if not self.embedder:
             raise Exception("Embedding model not loaded")
         
+        return self.get_embedding_matrix([text])[0].tolist()
+    
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts in batched forward passes"""
+        return self.get_embedding_matrix(texts).tolist()
+    
+    def get_embedding_matrix(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts in batches, returning a (len(texts), dim) float32 array.
+        
+        Texts already in the embedding cache aren't encoded again; the misses
+        (each distinct text once) are encoded together in one call.
+        """
+        if not self.embedder:
+            raise Exception("Embedding model not loaded")
+        
         try:
-            # Truncate text if too long
-            max_length = 512  # Most models have token limits
-            if len(text.split()) > max_length:
-                text = ' '.join(text.split()[:max_length])
+            texts = [self._truncate_for_embedding(text) for text in texts]
+            if self.embedding_cache is None:
+                return self._encode(texts)
             
-            embedding = self.embedder.encode(
-                text,
-                normalize_embeddings=MODEL_CONFIGS["embedding"]["normalize_embeddings"]
-            )
-            return embedding.tolist()
+            keys = self.embedding_cache.keys(texts)
+            vectors = self.embedding_cache.get_many(keys)
+            misses = {}  # key -> first index of a text that missed
+            for i, (key, vector) in enumerate(zip(keys, vectors)):
+                if vector is None:
+                    misses.setdefault(key, i)
+            if misses:
+                encoded = self._encode([texts[i] for i in misses.values()])
+                self.embedding_cache.put_many(list(misses), encoded)
+                by_key = dict(zip(misses, encoded))
+                vectors = [by_key[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+            return np.stack(vectors).astype(np.float32, copy=False) if vectors else self._encode([])
             
         except Exception as e:
-            logger.error(f"Error generating embedding: {str(e)}")
+            logger.error(f"Error generating embeddings: {str(e)}")
             raise Exception(f"Embedding generation failed: {str(e)}")
     
-    def summarize_text(self, text: str) -> str:
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            # encode([]) returns an empty list, which has no row width to reshape to
+            return np.zeros((0, self.embedder.get_sentence_embedding_dimension()), dtype=np.float32)
+        embeddings = self.embedder.encode(
+            texts,
+            batch_size=self.settings.embedding_batch_size,
+            normalize_embeddings=MODEL_CONFIGS["embedding"]["normalize_embeddings"]
+        )
+        return np.asarray(embeddings, dtype=np.float32).reshape(len(texts), -1)
+    
+    def summarize_text(self, text: Union[str, PreparedDocument]) -> str:
         """Generate summary for text"""
         if not self.summarizer:
             raise Exception("Summarization model not loaded")
         
         try:
-            # Check text length
-            word_count = len(text.split())
-            if word_count < self.settings.min_summary_length:
-                raise Exception("Text too short for summarization")
-            
-            # Adjust max_length based on input length
-            max_length = min(
-                self.settings.max_summary_length,
-                max(word_count // 4, self.settings.min_summary_length)
-            )
-            
-            # Handle very long texts by chunking
-            if word_count > 1000:
-                # Take first 1000 words for summarization
-                text = ' '.join(text.split()[:1000])
-            
-            summary_result = self.summarizer(
-                text,
-                max_length=max_length,
-                min_length=self.settings.min_summary_length,
-                do_sample=False,
-                truncation=True
-            )
-            
-            return summary_result[0]['summary_text']
+            return self.summarize_document(text).summary
             
         except Exception as e:
             logger.error(f"Error generating summary: {str(e)}")
-            raise Exception(f"Summarization failed: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Summarization failed: {str(e)}")
+    
+    def summarize_document(self, text: Union[str, PreparedDocument]) -> HierarchicalSummary:
+        """Summarize text of any length by map-reduce, with per-level timings"""
+        if not self.summarizer:
+            raise Exception("Summarization model not loaded")
+        
+        # Check text length
+        document = PreparedDocument.of(text)
+        if document.word_count < self.settings.min_summary_length:
+            raise Exception("Text too short for summarization")
+        
+        if self.hierarchical_summarizer is None:
+            self.hierarchical_summarizer = HierarchicalSummarizer(
+                self.summarizer,
+                chunk_tokens=self.settings.summary_chunk_tokens,
+                token_budget=self.settings.summary_token_budget,
+                batch_size=self.settings.summary_batch_size,
+                max_length=self.settings.max_summary_length,
+                min_length=self.settings.min_summary_length,
+                max_levels=self.settings.summary_max_levels
+            )
+        return self.hierarchical_summarizer.summarize(document.text)
\ No newline at end of file
@@ -0,0 +1,225 @@
+import re
+import logging
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+
+# Characters that re.IGNORECASE equates with an ASCII letter although lower() does not
+_IGNORECASE_FIXES = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
+
+def ignorecase_fold(text: str) -> str:
+    """Lowercase text so ASCII anchors occur in it wherever re.IGNORECASE would match them"""
+    return (text if text.isascii() else text.translate(_IGNORECASE_FIXES)).lower()
+
+
+def _fold_case(text: str) -> Optional[str]:
+    """
+    Lowercase text so case-sensitive ASCII anchors match it exactly where
+    re.IGNORECASE would. Returns None if folding would shift character offsets.
+    """
+    folded = ignorecase_fold(text)
+    return folded if len(folded) == len(text) else None
+
+
+def _literal_prefixes(items) -> Optional[Set[str]]:
+    """
+    Literal strings one of which every match of the parsed sequence must start with.
+
+    Returns None when no such set can be derived (e.g. the pattern starts with a
+    character class), in which case the pattern has to be run over the full text.
+    Only ASCII literals are used so lower() agrees with re.IGNORECASE folding.
+    """
+    prefix = ""
+    for op, av in items:
+        if op is sre_parse.LITERAL and av < 128:
+            prefix += chr(av).lower()
+            continue
+        if prefix:
+            break
+        if op is sre_parse.AT:
+            # Zero-width assertions such as \b are re-checked by regex.match(text, pos)
+            continue
+        if op is sre_parse.SUBPATTERN:
+            return _literal_prefixes(av[-1])
+        if op is sre_parse.BRANCH:
+            prefixes = set()
+            for branch in av[1]:
+                branch_prefixes = _literal_prefixes(branch)
+                if not branch_prefixes:
+                    return None
+                prefixes |= branch_prefixes
+            return prefixes
+        return None
+    return {prefix} if prefix else None
+
+
+@lru_cache(maxsize=1024)
+def required_prefixes(pattern: str, flags: int = re.IGNORECASE) -> Optional[Set[str]]:
+    """
+    The anchors MultiPatternScanner derives for a pattern: lowercase ASCII
+    literals one of which every match starts with, or None when there are none
+    """
+    try:
+        return _literal_prefixes(sre_parse.parse(pattern, flags))
+    except Exception as e:
+        logger.debug(f"No anchors derived for {pattern!r}: {e}")
+        return None
+
+
+def _trie_regex(words: List[str]) -> str:
+    """Build a regex alternation shaped like a trie so the engine tries the longest word first"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        is_end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if is_end:
+            body = f"(?:{body})?" if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class LiteralTrie:
+    """
+    Finds every occurrence of a set of ASCII literals, case-insensitively, in one pass.
+
+    Occurrences may overlap and a shorter literal that is a prefix of a longer one
+    is reported wherever the longer one is found. With word_boundary=True a literal
+    only counts when it starts and ends on a word boundary.
+    """
+
+    def __init__(self, words: List[str], word_boundary: bool = False):
+        words = sorted({word.lower() for word in words if word})
+        for word in words:
+            if not word.isascii():
+                raise ValueError(f"LiteralTrie only supports ASCII literals: {word!r}")
+        self.words = words
+
+        def ends_on_boundary(word: str, end: int) -> bool:
+            return end == len(word) or _is_word_char(word[end - 1]) != _is_word_char(word[end])
+
+        # Literals matched at the same start as a longer literal, read off the longer one
+        self._implied: Dict[str, List[str]] = {
+            word: [
+                other for other in words
+                if word.startswith(other) and (not word_boundary or ends_on_boundary(word, len(other)))
+            ]
+            for word in words
+        }
+
+        pattern = _trie_regex(words) if words else None
+        if pattern and word_boundary:
+            pattern = rf"\b(?:{pattern})\b"
+        self._regex = re.compile(pattern) if pattern else None
+        self._regex_ignorecase = re.compile(pattern, re.IGNORECASE) if pattern else None
+
+    def finditer(self, text: str, lowercase: bool = False) -> Iterator[Tuple[str, int]]:
+        """
+        Yield (literal, start) for every occurrence, in order of start position.
+
+        With lowercase=True the text is already lowercased and literals match it
+        exactly, as str.find would, rather than as re.IGNORECASE would.
+        """
+        if self._regex is None:
+            return
+
+        # Searching lowercased text case-sensitively is several times faster than IGNORECASE
+        folded = text if lowercase else _fold_case(text)
+        if folded is not None:
+            search, haystack, implied_by = self._regex.search, folded, self._implied.__getitem__
+        else:
+            search, haystack, implied_by = self._regex_ignorecase.search, text, self._implied_by
+
+        # Restart one character after each hit so overlapping occurrences are not skipped
+        pos = 0
+        while True:
+            match = search(haystack, pos)
+            if not match:
+                break
+            for word in implied_by(match.group()):
+                yield word, match.start()
+            pos = match.start() + 1
+
+    def _implied_by(self, matched: str) -> List[str]:
+        implied = self._implied.get(matched.lower())
+        if implied is None:
+            # Non-ASCII case folds (e.g. the Kelvin sign for "k") don't round-trip through lower()
+            word = next(w for w in self._implied if re.fullmatch(re.escape(w), matched, re.IGNORECASE))
+            implied = self._implied[word]
+        return implied
+
+
+class MultiPatternScanner:
+    """
+    Evaluates a list of registry CompiledPatterns with one shared pass over the text.
+
+    Each pattern is reduced to the literal anchors its matches must start with.
+    A LiteralTrie over the case-folded text finds every anchor occurrence, and the
+    full pattern is then only tried with regex.match() at those positions. Because
+    a match can only start where one of its anchors starts, this yields exactly
+    what regex.finditer(text) would, in the same order. Patterns without a usable
+    anchor fall back to finditer over the whole text.
+    """
+
+    def __init__(self, patterns: List[Any]):
+        self.patterns = patterns
+        self._anchors: List[Optional[Set[str]]] = []
+
+        for compiled in patterns:
+            self._anchors.append(required_prefixes(compiled.pattern, compiled.regex.flags))
+
+        self._trie = LiteralTrie([anchor for anchors in self._anchors if anchors for anchor in anchors])
+
+    @property
+    def anchored_count(self) -> int:
+        return sum(1 for anchors in self._anchors if anchors)
+
+    def find_anchors(self, text: str) -> Dict[str, List[int]]:
+        """Sorted start positions of every anchor in the text, found in one pass"""
+        positions: Dict[str, List[int]] = defaultdict(list)
+        for anchor, start in self._trie.finditer(text):
+            positions[anchor].append(start)
+        return positions
+
+    def scan(self, text: str) -> Iterator[Tuple[Any, re.Match]]:
+        """Yield (pattern, match) pairs, pattern by pattern, identical to calling finditer on each"""
+        positions = self.find_anchors(text)
+
+        for compiled, anchors in zip(self.patterns, self._anchors):
+            if anchors is None:
+                for match in compiled.regex.finditer(text):
+                    yield compiled, match
+                continue
+
+            candidates = sorted({pos for anchor in anchors for pos in positions.get(anchor, ())})
+            index = 0
+            while index < len(candidates):
+                match = compiled.regex.match(text, candidates[index])
+                if match:
+                    yield compiled, match
+                    # finditer resumes at the end of the previous match
+                    index = bisect_left(candidates, match.end(), index + 1)
+                else:
+                    index += 1
@@ -0,0 +1,250 @@
+import hashlib
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+import pypdfium2 as pdfium
+
+from config.settings import get_settings
+from services.analysis_cache import CacheBackend, InMemoryCacheBackend
+from services.text_engines import PDFIUM_LOCK, pdfium_input
+
+try:
+    import pytesseract
+except ImportError:  # OCR is skipped, with a warning, until it is installed
+    pytesseract = None
+
+logger = logging.getLogger(__name__)
+
+
+def ocr_page_image(mode: str, size: Tuple[int, int], pixels: bytes, language: str) -> Tuple[str, float]:
+    """
+    Run tesseract on a rendered page. Module-level so it can run on the PDF
+    process pool; the image travels as raw pixels, which pickle cheaply.
+
+    Returns:
+        (text, seconds spent in tesseract)
+    """
+    from PIL import Image
+
+    start = time.perf_counter()
+    text = pytesseract.image_to_string(Image.frombytes(mode, size, pixels), lang=language)
+    return text, time.perf_counter() - start
+
+
+class PageOCR:
+    """
+    OCR for pages whose text layer is empty or near-empty, such as scanned pages.
+
+    Only those pages are rendered (with pdfium) and OCRed, so the born-digital
+    pages of a mixed document cost nothing extra. OCR output is cached by a
+    hash of the rendered image, which also makes repeated pages within one
+    document (blank backs, identical exhibits) a single OCR run.
+    """
+
+    def __init__(self, cache: Optional[CacheBackend] = None, dpi: int = 300,
+                 language: str = "eng", min_chars: int = 20):
+        self.cache = cache
+        self.dpi = dpi
+        self.language = language
+        self.min_chars = min_chars
+        self._available: Optional[bool] = None
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    @property
+    def available(self) -> bool:
+        """Whether pytesseract and the tesseract binary are both installed"""
+        if self._available is None:
+            if pytesseract is None:
+                logger.warning("OCR unavailable, scanned pages will have no text: pytesseract is not installed")
+                self._available = False
+                return False
+            try:
+                pytesseract.get_tesseract_version()
+                self._available = True
+            except Exception as e:
+                logger.warning(f"OCR unavailable, scanned pages will have no text: {e}")
+                self._available = False
+        return self._available
+
+    def needs_ocr(self, page_result: Dict[str, Any]) -> bool:
+        if page_result.get("timed_out"):
+            return False
+        text = page_result.get("text") or ""
+        return sum(1 for char in text if not char.isspace()) < self.min_chars
+
+    def ocr_pages(self, source, page_results: List[Dict[str, Any]], executor=None):
+        """
+        OCR the pages in page_results that need it, in place.
+
+        A page that is OCRed gets the OCR text (when it has more to say than
+        the text layer did), "text_engine": "ocr", and an "ocr" record with its
+        status and render / OCR timings. OCR runs on executor when given (the
+        PDF process pool), otherwise inline. Pages are rendered one at a time as
+        workers free up, so at most one rendered image per worker is held.
+        """
+        pending = [page_result for page_result in page_results if self.needs_ocr(page_result)]
+        if not pending:
+            return
+        if not self.available:
+            for page_result in pending:
+                page_result["ocr"] = {"status": "unavailable"}
+            return
+
+        ocred = 0
+        waiting: Dict[str, List[Dict[str, Any]]] = {}  # image key -> pages awaiting its OCR
+        in_flight: Dict[Future, str] = {}
+        limit = max(1, getattr(executor, "workers", 1))
+        with PDFIUM_LOCK:
+            document = pdfium.PdfDocument(pdfium_input(source))
+        try:
+            for page_result in pending:
+                start = time.perf_counter()
+                with PDFIUM_LOCK:
+                    image = self._render(document, page_result["page"] - 1)
+                key = self._cache_key(image)
+                page_result["ocr"] = {"render_seconds": time.perf_counter() - start}
+                
+                if key in waiting:
+                    # Same image as a page whose OCR is still running
+                    waiting[key].append(page_result)
+                    continue
+                cached = self._cache_get(key)
+                if cached is not None:
+                    self._apply(page_result, cached, "cached", 0.0)
+                    continue
+                
+                ocred += 1
+                if executor is None:
+                    outcome = self._outcome(key, lambda: ocr_page_image(
+                        image.mode, image.size, image.tobytes(), self.language
+                    ))
+                    self._finish(key, [page_result], outcome)
+                    continue
+                
+                # Rendered pages are large; hold at most one per worker in flight
+                while len(in_flight) >= limit:
+                    self._collect(in_flight, waiting)
+                waiting[key] = [page_result]
+                # Errors from submit itself, such as a saturated pool, propagate unchanged
+                in_flight[executor.submit(
+                    ocr_page_image, image.mode, image.size, image.tobytes(), self.language
+                )] = key
+            
+            while in_flight:
+                self._collect(in_flight, waiting)
+        finally:
+            for future in in_flight:
+                future.cancel()
+            with PDFIUM_LOCK:
+                document.close()
+        
+        logger.info(f"OCRed {ocred} of {len(pending)} pages with little or no text layer")
+
+    def _render(self, document: pdfium.PdfDocument, page_index: int):
+        page = document[page_index]
+        try:
+            return page.render(scale=self.dpi / 72, grayscale=True).to_pil()
+        finally:
+            page.close()
+
+    def _collect(self, in_flight: Dict[Future, str], waiting: Dict[str, List[Dict[str, Any]]]):
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            key = in_flight.pop(future)
+            self._finish(key, waiting.pop(key), self._outcome(key, future.result))
+
+    def _finish(self, key: str, pages: List[Dict[str, Any]], outcome: Tuple[Optional[str], float]):
+        text, seconds = outcome
+        if text is not None:
+            self._cache_set(key, text)
+        for i, page_result in enumerate(pages):
+            if text is None:
+                self._apply(page_result, None, "failed", seconds)
+            else:
+                # Repeats of the image within this document reuse the first page's OCR
+                self._apply(page_result, text, "ocr" if i == 0 else "cached", seconds if i == 0 else 0.0)
+
+    def _outcome(self, key: str, run) -> Tuple[Optional[str], float]:
+        try:
+            return run()
+        except Exception as e:
+            # One unreadable page shouldn't fail the whole document
+            logger.warning(f"OCR failed for page image {key[:12]}: {e}")
+            return None, 0.0
+
+    def _apply(self, page_result: Dict[str, Any], text: Optional[str], status: str, seconds: float):
+        record = page_result["ocr"]
+        record.update({"status": status, "ocr_seconds": seconds})
+        text = (text or "").strip()
+        record["chars"] = len(text)
+        if len(text) > len((page_result.get("text") or "").strip()):
+            page_result["text"] = text
+            page_result["text_engine"] = "ocr"
+
+    def _cache_key(self, image) -> str:
+        digest = hashlib.sha256(image.tobytes())
+        digest.update(f"{image.mode}|{image.size}|{self.language}".encode())
+        return digest.hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        value = self.cache.get(key) if self.cache is not None else None
+        with self._lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return value
+
+    def _cache_set(self, key: str, text: str):
+        if self.cache is not None:
+            self.cache.set(key, text)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "available": self._available,
+                "cache_entries": len(self.cache) if self.cache is not None else 0,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def summarize_ocr(page_results: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Per-page OCR records and their totals, or None when no page needed OCR"""
+    pages = [{"page": page_result["page"], **page_result["ocr"]}
+             for page_result in page_results if "ocr" in page_result]
+    if not pages:
+        return None
+    return {
+        "pages_needing_ocr": len(pages),
+        "pages_ocred": sum(1 for page in pages if page["status"] == "ocr"),
+        "cache_hits": sum(1 for page in pages if page["status"] == "cached"),
+        "render_seconds": sum(page.get("render_seconds", 0.0) for page in pages),
+        "ocr_seconds": sum(page.get("ocr_seconds", 0.0) for page in pages),
+        "pages": pages
+    }
+
+
+_page_ocr = None
+_page_ocr_lock = Lock()
+
+def get_page_ocr() -> PageOCR:
+    """The shared PageOCR, whose cache outlives any one request"""
+    global _page_ocr
+    with _page_ocr_lock:
+        if _page_ocr is None:
+            settings = get_settings()
+            _page_ocr = PageOCR(
+                InMemoryCacheBackend(settings.ocr_cache_entries, settings.cache_ttl),
+                settings.ocr_dpi,
+                settings.ocr_language,
+                settings.ocr_min_chars
+            )
+    return _page_ocr
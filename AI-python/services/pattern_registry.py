@@ -0,0 +1,229 @@
+import re
+import hashlib
+import logging
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import data.risk_patterns
+from data.risk_patterns import RISK_PATTERNS, DOCUMENT_SPECIFIC_RISKS
+from data.clause_patterns import DOCUMENT_SPECIFIC_CLAUSES
+from data.compliance_patterns import COMPLIANCE_PATTERNS, DOCUMENT_TYPE_COMPLIANCE
+from data.action_items import DEADLINE_PATTERNS
+from data.legal_terms import LEGAL_TERMS
+from services.multi_pattern_scanner import MultiPatternScanner
+from services.legal_term_index import LegalTermIndex
+from services.classification_engine import ClassificationEngine
+
+logger = logging.getLogger(__name__)
+
+# Every analyzer matched case-insensitively before the registry existed
+DEFAULT_FLAGS = re.IGNORECASE
+
+# Lowest severity_score that get_risk_level_from_score reads as high (8+ is critical)
+SEVERE_RISK_SCORE = 6
+
+
+@dataclass(frozen=True)
+class CompiledPattern:
+    """A pattern from the data modules compiled once, with its original entry"""
+    regex: re.Pattern
+    source: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def pattern(self) -> str:
+        return self.regex.pattern
+
+
+class PatternRegistry:
+    """
+    Compiles every regex pattern from the data modules once and serves
+    per-document-type views of them to the analyzers.
+
+    Invalid patterns raise ValueError when the registry is built, so a bad
+    data file fails at startup instead of logging re.error on every request.
+    """
+
+    def __init__(self):
+        self._risk_general: List[CompiledPattern] = []
+        self._risk_by_doc_type: Dict[str, List[CompiledPattern]] = {}
+        self._clauses_by_doc_type: Dict[str, Dict[str, List[CompiledPattern]]] = {}
+        self._compliance_by_category: Dict[str, List[CompiledPattern]] = {}
+        self._deadlines: List[CompiledPattern] = []
+        self._classification: Dict[Any, Dict[str, Any]] = {}
+        self._risk_scanners: Dict[str, MultiPatternScanner] = {}
+        self._severe_risk_scanners: Dict[str, MultiPatternScanner] = {}
+        self._legal_term_index: Optional[LegalTermIndex] = None
+        self._classification_engine: Optional[ClassificationEngine] = None
+        self._build()
+
+    def _build(self):
+        for level, pattern_list in RISK_PATTERNS.items():
+            self._risk_general.extend(
+                self._compile_entry(entry, f"risk:{level}") for entry in pattern_list
+            )
+        for doc_type, pattern_list in DOCUMENT_SPECIFIC_RISKS.items():
+            self._risk_by_doc_type[doc_type] = [
+                self._compile_entry(entry, f"risk:{doc_type}") for entry in pattern_list
+            ]
+        for doc_type in ["", *DOCUMENT_SPECIFIC_RISKS]:
+            patterns = self.get_patterns_by_document_type(doc_type)
+            self._risk_scanners[doc_type] = MultiPatternScanner(patterns)
+            self._severe_risk_scanners[doc_type] = MultiPatternScanner([
+                compiled for compiled in patterns
+                if compiled.data.get("severity_score", 0) >= SEVERE_RISK_SCORE
+            ])
+
+        for doc_type, clause_types in DOCUMENT_SPECIFIC_CLAUSES.items():
+            self._clauses_by_doc_type[doc_type] = {
+                clause_type: [
+                    self._compile_entry(
+                        {
+                            "pattern": pattern,
+                            "significance": clause_data.get("significance", "standard"),
+                            "title": f"{clause_type.title()} Clause",
+                        },
+                        f"clause:{doc_type}:{clause_type}"
+                    )
+                    for pattern in clause_data.get("patterns", [])
+                ]
+                for clause_type, clause_data in clause_types.items()
+            }
+
+        for category, pattern_list in COMPLIANCE_PATTERNS.items():
+            self._compliance_by_category[category] = [
+                self._compile_entry(entry, f"compliance:{category}") for entry in pattern_list
+            ]
+
+        self._deadlines = [
+            self._compile_entry(entry, "deadline") for entry in DEADLINE_PATTERNS
+        ]
+
+        self._legal_term_index = LegalTermIndex(LEGAL_TERMS)
+
+        # Imported here because the classifier itself reads from the registry
+        from services.document_type import DocumentClassifier
+
+        for doc_type, patterns in DocumentClassifier.CLASSIFICATION_PATTERNS.items():
+            self._classification[doc_type] = {
+                "strong_indicators": [
+                    self._compile(pattern, f"classification:{doc_type.value}:strong")
+                    for pattern in patterns["strong_indicators"]
+                ],
+                "moderate_indicators": [
+                    self._compile(pattern, f"classification:{doc_type.value}:moderate")
+                    for pattern in patterns["moderate_indicators"]
+                ],
+                "context_words": list(patterns["context_words"]),
+            }
+        self._classification_engine = ClassificationEngine(self._classification)
+
+        logger.info(f"Pattern registry built with {self.pattern_count} compiled patterns")
+
+    def _compile_entry(self, entry: Any, source: str) -> CompiledPattern:
+        """Compile a data-module entry, which is either a dict with 'pattern' or a bare string"""
+        if isinstance(entry, str):
+            return self._compile(entry, source, {"pattern": entry})
+        if not isinstance(entry, dict) or not entry.get("pattern"):
+            raise ValueError(f"Pattern entry in {source} has no 'pattern': {entry!r}")
+        return self._compile(entry["pattern"], source, entry, entry.get("flags", 0))
+
+    def _compile(
+        self,
+        pattern: str,
+        source: str,
+        data: Optional[Dict[str, Any]] = None,
+        flags: int = 0
+    ) -> CompiledPattern:
+        try:
+            regex = re.compile(pattern, DEFAULT_FLAGS | flags)
+        except re.error as e:
+            raise ValueError(f"Invalid regex pattern in {source}: {pattern!r}: {e}") from e
+        return CompiledPattern(regex=regex, source=source, data=data or {"pattern": pattern})
+
+    @property
+    def pattern_count(self) -> int:
+        count = len(self._risk_general) + len(self._deadlines)
+        count += sum(len(patterns) for patterns in self._risk_by_doc_type.values())
+        count += sum(
+            len(patterns)
+            for clause_types in self._clauses_by_doc_type.values()
+            for patterns in clause_types.values()
+        )
+        count += sum(len(patterns) for patterns in self._compliance_by_category.values())
+        count += sum(
+            len(patterns["strong_indicators"]) + len(patterns["moderate_indicators"])
+            for patterns in self._classification.values()
+        )
+        return count
+
+    def get_patterns_by_document_type(self, doc_type: str) -> List[CompiledPattern]:
+        """Risk patterns for a document type: every severity level plus the type-specific risks"""
+        return self._risk_general + self._risk_by_doc_type.get(doc_type, [])
+
+    def get_risk_scanner(self, doc_type: str, severe_only: bool = False) -> MultiPatternScanner:
+        """
+        Single-pass scanner over get_patterns_by_document_type(doc_type), or
+        over just its high and critical patterns when severe_only
+        """
+        scanners = self._severe_risk_scanners if severe_only else self._risk_scanners
+        return scanners.get(doc_type, scanners[""])
+
+    def get_clause_patterns(self, doc_type: str) -> Dict[str, List[CompiledPattern]]:
+        """Clause patterns grouped by clause type for a document type"""
+        return self._clauses_by_doc_type.get(doc_type, {})
+
+    def get_compliance_patterns(self, doc_type: str) -> Dict[str, List[CompiledPattern]]:
+        """Compliance patterns grouped by the categories relevant to a document type"""
+        relevant_categories = DOCUMENT_TYPE_COMPLIANCE.get(
+            doc_type.lower(), DOCUMENT_TYPE_COMPLIANCE["general"]
+        )
+        return {
+            category: self._compliance_by_category[category]
+            for category in relevant_categories
+            if category in self._compliance_by_category
+        }
+
+    def get_deadline_patterns(self) -> List[CompiledPattern]:
+        return self._deadlines
+
+    def get_legal_term_index(self) -> LegalTermIndex:
+        return self._legal_term_index
+
+    def get_classification_patterns(self) -> Dict[Any, Dict[str, Any]]:
+        """Compiled indicators and context words keyed by DocumentType"""
+        return self._classification
+
+    def get_classification_engine(self) -> ClassificationEngine:
+        """Scores every document type from get_classification_patterns() in one pass"""
+        return self._classification_engine
+
+
+_registry = None
+
+def get_pattern_registry() -> PatternRegistry:
+    global _registry
+    if _registry is None:
+        _registry = PatternRegistry()
+    return _registry
+
+
+_data_version = None
+
+def pattern_data_version() -> str:
+    """
+    Hash of the data modules and the classification indicators, for keying
+    anything derived from them (such as cached analyses) so it goes stale
+    when a pattern changes.
+    """
+    global _data_version
+    if _data_version is None:
+        sources = sorted(Path(data.risk_patterns.__file__).parent.glob("*.py"))
+        sources.append(Path(__file__).with_name("document_type.py"))
+        digest = hashlib.sha256()
+        for path in sources:
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+        _data_version = digest.hexdigest()[:16]
+    return _data_version
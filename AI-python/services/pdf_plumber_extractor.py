@@ -1,24 +1,104 @@
 # pdf_extractor.py
 
 
+import io
+import os
+import signal
+import threading
 import pdfplumber
+from pdfplumber.table import TableSettings
 import logging
 import pandas as pd
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import Executor
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union, BinaryIO
 import re
+import time
+from collections import Counter
+
+from config.settings import get_settings
+from services.table_prefilter import timed_check
+from services.page_ocr import get_page_ocr, summarize_ocr
+from services.text_engines import PdfplumberTextEngine, open_text_engine, validate_text_engine
 
 logger = logging.getLogger(__name__)
 
+# A path, the PDF's bytes, or a seekable binary stream such as an upload's spooled file
+PdfSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+
+class PageTimeoutError(Exception):
+    """Raised inside a page's extraction once it runs past the per-page timeout"""
+
+
+class PageDeadline:
+    """
+    Raises PageTimeoutError in its block after `seconds`, using SIGALRM.
+
+    Signals are only delivered to the main thread, which is where process-pool
+    workers run their tasks; elsewhere (or without a timeout) this is a no-op.
+    pdfplumber wraps errors raised mid-parse, so check `expired` rather than
+    the exception type.
+    """
+
+    def __init__(self, seconds: Optional[float]):
+        self.seconds = seconds
+        self.expired = False
+        self._previous = None
+        self._armed = bool(seconds) and hasattr(signal, "setitimer") \
+            and threading.current_thread() is threading.main_thread()
+
+    def _expire(self, signum, frame):
+        self.expired = True
+        raise PageTimeoutError(f"Page extraction exceeded {self.seconds}s")
+
+    def __enter__(self):
+        if self._armed:
+            self._previous = signal.signal(signal.SIGALRM, self._expire)
+            signal.setitimer(signal.ITIMER_REAL, self.seconds)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._armed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous)
+        return False
+
+
+def open_pdf(source: PdfSource) -> pdfplumber.PDF:
+    """Open a PDF from any PdfSource; in-memory sources never touch the filesystem"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        # BytesIO shares a bytes object's buffer rather than copying it
+        source = io.BytesIO(source)
+    elif hasattr(source, "seek"):
+        source.seek(0)
+    return pdfplumber.open(source)
+
+
+def describe_source(source: PdfSource) -> str:
+    if isinstance(source, (str, os.PathLike)):
+        return str(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return f"<{len(source)} bytes in memory>"
+    return f"<{type(source).__name__} stream>"
+
 class PdfPlumberExtractor:
     """Enhanced utility to extract text and tables from PDF files using pdfplumber."""
 
-    def __init__(self, table_settings: Optional[Dict] = None):
+    def __init__(self, table_settings: Optional[Dict] = None, table_prefilter: Optional[bool] = None,
+                 text_engine: Optional[str] = None):
         """
         Initialize with optional table detection settings.
         
         Args:
             table_settings: Dictionary of table detection parameters
+            table_prefilter: Skip table detection on pages that can't hold a
+                table (see services.table_prefilter); defaults to Settings.table_prefilter
+            text_engine: Engine for page text (see services.text_engines);
+                defaults to Settings.pdf_text_engine. Tables always use pdfplumber.
         """
+        settings = get_settings()
+        self.table_prefilter = settings.table_prefilter if table_prefilter is None else table_prefilter
+        self.text_engine = validate_text_engine(text_engine or settings.pdf_text_engine)
         # Default table detection settings - can be customized
         self.table_settings = table_settings or {
             "vertical_strategy": "lines",
@@ -31,25 +111,25 @@ class PdfPlumberExtractor:
             "intersection_tolerance": 3,
         }
     
-    def extract_text(self, file_path: str) -> str:
+    def extract_text(self, source: PdfSource) -> str:
         """Extract raw text from PDF at given file path."""
         try:
             full_text = []
-            with pdfplumber.open(file_path) as pdf:
+            with open_pdf(source) as pdf:
                 for page in pdf.pages:
                     page_text = page.extract_text()
                     if page_text:
                         full_text.append(page_text)
 
             combined = "\n".join(full_text).strip()
-            logger.info(f"Extracted {len(combined)} characters of text from PDF: {file_path}")
+            logger.info(f"Extracted {len(combined)} characters of text from PDF: {describe_source(source)}")
             return combined
 
         except Exception as e:
             logger.error(f"Failed to extract text with pdfplumber: {e}")
             raise RuntimeError(f"PDF extraction failed: {e}")
     
-    def extract_tables(self, file_path: str) -> List[pd.DataFrame]:
+    def extract_tables(self, source: PdfSource) -> List[pd.DataFrame]:
         """
         Extract all tables from PDF as pandas DataFrames.
         
@@ -58,7 +138,7 @@ class PdfPlumberExtractor:
         """
         tables = []
         try:
-            with pdfplumber.open(file_path) as pdf:
+            with open_pdf(source) as pdf:
                 for page_num, page in enumerate(pdf.pages):
                     page_tables = page.extract_tables(self.table_settings)
                     
@@ -69,14 +149,301 @@ class PdfPlumberExtractor:
                             df.name = f"Page_{page_num + 1}_Table_{table_num + 1}"
                             tables.append(df)
                             
-            logger.info(f"Extracted {len(tables)} tables from PDF: {file_path}")
+            logger.info(f"Extracted {len(tables)} tables from PDF: {describe_source(source)}")
             return tables
             
         except Exception as e:
             logger.error(f"Failed to extract tables with pdfplumber: {e}")
             raise RuntimeError(f"Table extraction failed: {e}")
     
-    def extract_structured_content(self, file_path: str) -> Dict[str, Any]:
+    def extract(
+        self,
+        source: PdfSource,
+        text: bool = True,
+        tables: bool = False,
+        invoice_tables: bool = False,
+        coordinates: bool = False,
+        page_timeout: Optional[float] = None,
+        ocr: bool = False,
+        max_pages: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Open the PDF once and build every requested product from one walk over its pages.
+        
+        Args:
+            text: Page-framed text ("--- Page N ---") under "text"
+            tables: Tables as DataFrames under "tables" / "table_count"
+            invoice_tables: Invoice-like tables under "invoice_tables" / "invoice_table_count"
+            coordinates: Add each table's bounding box as "bbox"
+            page_timeout: Seconds allowed per page (main thread only); slower pages are skipped
+            ocr: OCR pages with an empty or near-empty text layer (see services.page_ocr),
+                summarized under "ocr"
+            max_pages: Only read the first max_pages pages ("pages" still counts them all)
+        
+        Invoice tables and coordinates come from the same table detection pass,
+        so asking for them doesn't detect tables a second time.
+        
+        Returns:
+            Dictionary with "pages", "metadata" and the requested products
+        """
+        find_tables = tables or invoice_tables or coordinates
+        try:
+            shard = self.extract_page_range(source, 0, max_pages, text, find_tables, coordinates, page_timeout)
+            if text and ocr:
+                get_page_ocr().ocr_pages(source, shard["page_results"])
+            return self._merge_pages(shard["pages"], shard["metadata"], shard["page_results"],
+                                     text, find_tables, invoice_tables)
+            
+        except Exception as e:
+            logger.error(f"Failed to extract PDF content: {e}")
+            raise RuntimeError(f"PDF extraction failed: {e}")
+    
+    def extract_parallel(
+        self,
+        source: PdfSource,
+        executor: Executor,
+        shards: int,
+        text: bool = True,
+        tables: bool = False,
+        invoice_tables: bool = False,
+        coordinates: bool = False,
+        page_timeout: Optional[float] = None,
+        min_pages_per_shard: int = 8,
+        ocr: bool = False,
+        max_pages: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Like extract(), with contiguous page ranges extracted in parallel on executor.
+        
+        Each shard opens the PDF once in its worker, so source must be bytes or a
+        path when executor is a process pool. Shards are merged back in page
+        order, giving the same result as extract(). Pages that need OCR are
+        OCRed on the same executor once every shard is in.
+        """
+        find_tables = tables or invoice_tables or coordinates
+        try:
+            with open_pdf(source) as pdf:
+                pages = len(pdf.pages)
+                metadata = pdf.metadata or {}
+        except Exception as e:
+            logger.error(f"Failed to open PDF: {e}")
+            raise RuntimeError(f"PDF extraction failed: {e}")
+        
+        end = pages if max_pages is None else min(pages, max_pages)
+        shards = max(1, min(shards, end // max(1, min_pages_per_shard)))
+        bounds = [end * i // shards for i in range(shards + 1)]
+        futures = []
+        try:
+            # Errors from submit itself, such as a saturated pool, propagate unchanged
+            for i in range(shards):
+                futures.append(executor.submit(
+                    extract_page_range, source, bounds[i], bounds[i + 1],
+                    text, find_tables, coordinates, page_timeout, self.text_engine
+                ))
+            try:
+                page_results = [
+                    page_result
+                    for future in futures
+                    for page_result in future.result()["page_results"]
+                ]
+            except Exception as e:
+                logger.error(f"Failed to extract PDF content in parallel: {e}")
+                raise RuntimeError(f"PDF extraction failed: {e}")
+        finally:
+            for future in futures:
+                future.cancel()
+        
+        logger.info(f"Extracted {end} of {pages} pages in {shards} shards")
+        if text and ocr:
+            get_page_ocr().ocr_pages(source, page_results, executor)
+        return self._merge_pages(pages, metadata, page_results, text, find_tables, invoice_tables)
+    
+    def extract_page_range(
+        self,
+        source: PdfSource,
+        start: int = 0,
+        end: Optional[int] = None,
+        text: bool = True,
+        tables: bool = False,
+        coordinates: bool = False,
+        page_timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Per-page text and tables for pages [start, end), zero-based.
+        
+        Pages are read through iter_pages(), so each page's layout is released
+        as soon as it is extracted, and tables stay raw rows: these results
+        cross from PDF worker processes to the caller, and DataFrames are only
+        built once the shards are merged.
+        
+        Returns:
+            Dictionary with the document's "pages" and "metadata", and
+            "page_results" holding one entry per page in the range
+        """
+        info: Dict[str, Any] = {}
+        page_results = list(self.iter_pages(source, start, end, text, tables, coordinates, page_timeout, info))
+        return {**info, "page_results": page_results}
+    
+    def iter_pages(
+        self,
+        source: PdfSource,
+        start: int = 0,
+        end: Optional[int] = None,
+        text: bool = True,
+        tables: bool = False,
+        coordinates: bool = False,
+        page_timeout: Optional[float] = None,
+        info: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield each page's text and tables as soon as it is extracted.
+        
+        A page's parsed layout is released before the next page is parsed, so
+        memory stays flat as the page count grows instead of holding every page
+        until the document is closed. Tables are yielded as raw rows only
+        ("rows"), leaving DataFrame construction to consumers that need it.
+        info, if given, receives the document's "pages" and "metadata" once
+        it is open. extract() and the /analyze shards read pages this way.
+        
+        Memory budget: peak RSS stays within 64 MiB above what the process used
+        before extraction (the PDF's bytes included), whatever the page count.
+        benchmarks/bench_pdf_memory.py checks this; on its 600-page bundle
+        streaming peaks about 8 MB higher, where walking pdf.pages without
+        releasing them peaks 1.5 GB higher.
+        """
+        with open_pdf(source) as pdf, self._open_text_engine(source, text) as engine:
+            if info is not None:
+                info.update(pages=len(pdf.pages), metadata=pdf.metadata or {})
+            yield from self._iter_open_pages(pdf, engine, start, end, text, tables, coordinates, page_timeout)
+    
+    def _open_text_engine(self, source: PdfSource, text: bool):
+        # Without text there's nothing for a second engine to read
+        return open_text_engine(self.text_engine, source) if text else PdfplumberTextEngine(source)
+    
+    def _iter_open_pages(self, pdf: pdfplumber.PDF, engine, start: int, end: Optional[int], text: bool,
+                         tables: bool, coordinates: bool, page_timeout: Optional[float]) -> Iterator[Dict[str, Any]]:
+        tset = TableSettings.resolve(self.table_settings)
+        total_pages = len(pdf.pages)
+        end = total_pages if end is None else min(end, total_pages)
+        
+        for page_num in range(start, end):
+            page = pdf.pages[page_num]
+            deadline = PageDeadline(page_timeout)
+            try:
+                with deadline:
+                    page_result = self._extract_page(page, page_num, engine, tset, text, tables, coordinates)
+            except Exception:
+                if not deadline.expired:
+                    raise
+                logger.warning(f"Page {page_num + 1} took longer than {page_timeout}s, skipping it")
+                page_result = {"page": page_num + 1, "text": None, "tables": [], "timed_out": True}
+            finally:
+                # Drop the page's chars, layout and text map caches
+                page.close()
+            yield page_result
+    
+    def _extract_page(self, page, page_num: int, engine, tset: TableSettings, text: bool,
+                      tables: bool, coordinates: bool) -> Dict[str, Any]:
+        page_result = {"page": page_num + 1, "text": None, "tables": []}
+        
+        if text:
+            page_result["text"], page_result["text_engine"] = engine.page_text(page_num, page)
+        
+        if tables:
+            if self.table_prefilter:
+                detection = timed_check(page, tset)
+            else:
+                detection = {"ran": True, "reason": "prefilter off", "prefilter_seconds": 0.0}
+            page_result["table_detection"] = detection
+            if not detection["ran"]:
+                return page_result
+            
+            start = time.perf_counter()
+            for table_num, table in enumerate(page.find_tables(tset)):
+                table_data = table.extract(**(tset.text_settings or {}))
+                if table_data and len(table_data) > 0:
+                    table_info = {"page": page_num + 1, "table_number": table_num + 1, "rows": table_data}
+                    if coordinates:
+                        table_info["bbox"] = table.bbox  # Bounding box coordinates
+                    page_result["tables"].append(table_info)
+            detection["detection_seconds"] = time.perf_counter() - start
+        
+        return page_result
+    
+    @staticmethod
+    def _table_frame(table: Dict[str, Any]) -> Dict[str, Any]:
+        """A streamed table ("rows") as extract() returns it, with a DataFrame and its "raw_data" rows"""
+        rows = table["rows"]
+        df = pd.DataFrame(rows[1:], columns=rows[0])
+        df.name = f"Page_{table['page']}_Table_{table['table_number']}"
+        frame = {"page": table["page"], "table_number": table["table_number"], "dataframe": df, "raw_data": rows}
+        if "bbox" in table:
+            frame["bbox"] = table["bbox"]  # Bounding box coordinates
+        return frame
+    
+    def _summarize_table_detection(self, page_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Per-page prefilter decisions and their totals.
+        
+        Time saved can't be measured on a page that was skipped, so it is
+        estimated from the pages where detection ran and found nothing.
+        """
+        decisions = [
+            {"page": page_result["page"], **page_result["table_detection"]}
+            for page_result in page_results if "table_detection" in page_result
+        ]
+        ran = [decision for decision in decisions if decision["ran"]]
+        wasted = [
+            page_result["table_detection"]["detection_seconds"]
+            for page_result in page_results
+            if page_result.get("table_detection", {}).get("ran") and not page_result["tables"]
+        ]
+        skipped = len(decisions) - len(ran)
+        return {
+            "pages_checked": len(decisions),
+            "pages_skipped": skipped,
+            "prefilter_seconds": sum(decision["prefilter_seconds"] for decision in decisions),
+            "detection_seconds": sum(decision.get("detection_seconds", 0.0) for decision in ran),
+            "estimated_seconds_saved": skipped * sum(wasted) / len(wasted) if wasted else None,
+            "decisions": decisions
+        }
+    
+    def _merge_pages(self, pages: int, metadata: Dict, page_results: List[Dict[str, Any]],
+                     text: bool, tables: bool, invoice_tables: bool) -> Dict[str, Any]:
+        """Assemble per-page results, in page order, into the extract() result"""
+        result: Dict[str, Any] = {"pages": pages, "metadata": metadata}
+        all_tables = [self._table_frame(table) for page_result in page_results for table in page_result["tables"]]
+        
+        if text:
+            result["text"] = "\n\n".join(
+                f"--- Page {page_result['page']} ---\n{page_result['text']}"
+                for page_result in page_results if page_result["text"]
+            )
+            # Pages per engine; pdfium pages that fell back count under pdfplumber, OCRed pages under ocr
+            result["text_engines"] = dict(Counter(
+                page_result["text_engine"] for page_result in page_results if "text_engine" in page_result
+            ))
+        if tables:
+            result["tables"] = all_tables
+            result["table_count"] = len(all_tables)
+            result["table_detection"] = self._summarize_table_detection(page_results)
+        if invoice_tables:
+            result["invoice_tables"] = self._match_invoice_tables(all_tables)
+            result["invoice_table_count"] = len(result["invoice_tables"])
+        
+        ocr = summarize_ocr(page_results)
+        if ocr:
+            result["ocr"] = ocr
+        
+        timed_out = [page_result["page"] for page_result in page_results if page_result.get("timed_out")]
+        if timed_out:
+            result["timed_out_pages"] = timed_out
+        
+        logger.info(f"Extracted {pages} pages: {len(result.get('text', ''))} chars, "
+                    f"{len(all_tables)} tables, {result.get('invoice_table_count', 0)} invoice tables")
+        return result
+    
+    def extract_structured_content(self, source: PdfSource) -> Dict[str, Any]:
         """
         Extract both text and tables in a structured format.
         
@@ -84,44 +451,7 @@ class PdfPlumberExtractor:
             Dictionary containing extracted text, tables, and metadata
         """
         try:
-            result = {
-                "text": "",
-                "tables": [],
-                "table_count": 0,
-                "pages": 0,
-                "metadata": {}
-            }
-            
-            with pdfplumber.open(file_path) as pdf:
-                result["pages"] = len(pdf.pages)
-                result["metadata"] = pdf.metadata or {}
-                
-                full_text = []
-                all_tables = []
-                
-                for page_num, page in enumerate(pdf.pages):
-                    # Extract text
-                    page_text = page.extract_text()
-                    if page_text:
-                        full_text.append(f"--- Page {page_num + 1} ---\n{page_text}")
-                    
-                    # Extract tables
-                    page_tables = page.extract_tables(self.table_settings)
-                    for table_num, table in enumerate(page_tables):
-                        if table and len(table) > 0:
-                            df = pd.DataFrame(table[1:], columns=table[0])
-                            df.name = f"Page_{page_num + 1}_Table_{table_num + 1}"
-                            all_tables.append({
-                                "page": page_num + 1,
-                                "table_number": table_num + 1,
-                                "dataframe": df,
-                                "raw_data": table
-                            })
-                
-                result["text"] = "\n\n".join(full_text)
-                result["tables"] = all_tables
-                result["table_count"] = len(all_tables)
-                
+            result = self.extract(source, text=True, tables=True)
             logger.info(f"Extracted structured content: {len(result['text'])} chars, {result['table_count']} tables")
             return result
             
@@ -129,47 +459,50 @@ class PdfPlumberExtractor:
             logger.error(f"Failed to extract structured content: {e}")
             raise RuntimeError(f"Structured extraction failed: {e}")
     
-    def find_invoice_tables(self, file_path: str) -> List[Dict[str, Any]]:
+    def _match_invoice_tables(self, tables: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Pick the tables whose headers look like an invoice's"""
+        invoice_tables = []
+        
+        # Common invoice table headers to look for
+        invoice_patterns = [
+            r'item|description|product|service',
+            r'qty|quantity|amount',
+            r'price|rate|cost|unit',
+            r'total|subtotal|sum',
+            r'tax|vat|gst'
+        ]
+        
+        for table_info in tables:
+            df = table_info["dataframe"]
+            
+            # Check if this looks like an invoice table
+            headers = [str(col).lower() for col in df.columns if col]
+            header_text = " ".join(headers)
+            
+            # Count matches with invoice patterns
+            matches = sum(1 for pattern in invoice_patterns 
+                        if re.search(pattern, header_text, re.IGNORECASE))
+            
+            if matches >= 2:  # At least 2 invoice-like headers
+                invoice_tables.append({
+                    "page": table_info["page"],
+                    "table_number": table_info["table_number"],
+                    "dataframe": df,
+                    "confidence": matches / len(invoice_patterns),
+                    "headers": headers
+                })
+        
+        return invoice_tables
+    
+    def find_invoice_tables(self, source: PdfSource) -> List[Dict[str, Any]]:
         """
         Specifically look for invoice-like tables with common patterns.
         
         Returns:
             List of dictionaries containing potential invoice tables
         """
-        invoice_tables = []
-        
         try:
-            structured_content = self.extract_structured_content(file_path)
-            
-            # Common invoice table headers to look for
-            invoice_patterns = [
-                r'item|description|product|service',
-                r'qty|quantity|amount',
-                r'price|rate|cost|unit',
-                r'total|subtotal|sum',
-                r'tax|vat|gst'
-            ]
-            
-            for table_info in structured_content["tables"]:
-                df = table_info["dataframe"]
-                
-                # Check if this looks like an invoice table
-                headers = [str(col).lower() for col in df.columns if col]
-                header_text = " ".join(headers)
-                
-                # Count matches with invoice patterns
-                matches = sum(1 for pattern in invoice_patterns 
-                            if re.search(pattern, header_text, re.IGNORECASE))
-                
-                if matches >= 2:  # At least 2 invoice-like headers
-                    invoice_tables.append({
-                        "page": table_info["page"],
-                        "table_number": table_info["table_number"],
-                        "dataframe": df,
-                        "confidence": matches / len(invoice_patterns),
-                        "headers": headers
-                    })
-            
+            invoice_tables = self.extract(source, text=False, invoice_tables=True)["invoice_tables"]
             logger.info(f"Found {len(invoice_tables)} potential invoice tables")
             return invoice_tables
             
@@ -177,39 +510,116 @@ class PdfPlumberExtractor:
             logger.error(f"Failed to find invoice tables: {e}")
             raise RuntimeError(f"Invoice table detection failed: {e}")
     
-    def extract_with_coordinates(self, file_path: str) -> List[Dict[str, Any]]:
+    def extract_with_coordinates(self, source: PdfSource) -> List[Dict[str, Any]]:
         """
         Extract tables with their coordinate information for precise positioning.
         
         Returns:
             List of dictionaries containing table data and coordinates
         """
-        tables_with_coords = []
-        
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    # Find tables with coordinates
-                    tables = page.find_tables(self.table_settings)
-                    
-                    for table_num, table in enumerate(tables):
-                        # Extract the table data
-                        table_data = table.extract()
-                        
-                        if table_data and len(table_data) > 0:
-                            df = pd.DataFrame(table_data[1:], columns=table_data[0])
-                            
-                            tables_with_coords.append({
-                                "page": page_num + 1,
-                                "table_number": table_num + 1,
-                                "dataframe": df,
-                                "bbox": table.bbox,  # Bounding box coordinates
-                                "raw_data": table_data
-                            })
-            
+            tables_with_coords = self.extract(source, text=False, coordinates=True)["tables"]
             logger.info(f"Extracted {len(tables_with_coords)} tables with coordinates")
             return tables_with_coords
             
         except Exception as e:
             logger.error(f"Failed to extract tables with coordinates: {e}")
             raise RuntimeError(f"Coordinate extraction failed: {e}")
+
+
+def summarize_tables(tables: List[Dict[str, Any]]) -> List[str]:
+    """One-line description of each extracted table, appended to the analysis text"""
+    table_summaries = []
+    for table_info in tables:
+        df = table_info["dataframe"]
+        summary = f"Table from Page {table_info['page']}: {len(df)} rows, {len(df.columns)} columns"
+        
+        # Add column names if available
+        if not df.empty:
+            columns = [str(col) for col in df.columns if col and str(col).strip()]
+            if columns:
+                summary += f" (Columns: {', '.join(columns[:5])}{'...' if len(columns) > 5 else ''})"
+        
+        table_summaries.append(summary)
+    return table_summaries
+
+
+def extract_page_range(
+    source: PdfSource,
+    start: int,
+    end: int,
+    text: bool = True,
+    tables: bool = False,
+    coordinates: bool = False,
+    page_timeout: Optional[float] = None,
+    text_engine: Optional[str] = None
+) -> Dict[str, Any]:
+    """PdfPlumberExtractor.extract_page_range as a picklable function for process-pool shards"""
+    return PdfPlumberExtractor(text_engine=text_engine).extract_page_range(source, start, end, text, tables, coordinates, page_timeout)
+
+
+def extract_document_content(
+    source: PdfSource,
+    extract_tables: bool = False,
+    detect_invoice_tables: bool = False,
+    executor: Optional[Executor] = None,
+    shards: int = 1,
+    page_timeout: Optional[float] = None,
+    min_pages_per_shard: int = 8,
+    text_engine: Optional[str] = None,
+    ocr: bool = False,
+    max_pages: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Extract everything /analyze needs from a PDF.
+
+    Module-level so it can be sent to the PDF worker process pool; pass the
+    PDF's bytes or a path, since open streams can't cross to a worker process.
+    With an executor, page ranges are instead sharded across it from here.
+    text_engine overrides Settings.pdf_text_engine for this document; ocr
+    OCRs pages without a usable text layer, such as scanned pages; max_pages
+    reads only the leading pages.
+    """
+    pdf_extractor = PdfPlumberExtractor(text_engine=text_engine)
+    products = dict(
+        text=True,
+        tables=extract_tables or detect_invoice_tables,
+        invoice_tables=detect_invoice_tables,
+        page_timeout=page_timeout,
+        ocr=ocr,
+        max_pages=max_pages
+    )
+    if executor is not None:
+        content = pdf_extractor.extract_parallel(
+            source, executor, shards, min_pages_per_shard=min_pages_per_shard, **products
+        )
+    else:
+        content = pdf_extractor.extract(source, **products)
+    
+    # The DataFrames carry the same cells; don't keep a second copy of every table
+    tables = [
+        {key: value for key, value in table.items() if key != "raw_data"}
+        for table in content.get("tables", [])
+    ]
+    extracted_content = {
+        "text": content["text"].strip(),
+        "tables": tables,
+        "table_count": len(tables),
+        "pages": content["pages"],
+        "table_summaries": summarize_tables(tables),
+        "invoice_table_count": content.get("invoice_table_count", 0),
+        "text_engines": content["text_engines"]
+    }
+    if detect_invoice_tables:
+        extracted_content["invoice_tables"] = content["invoice_tables"]
+    if "table_detection" in content:
+        detection = content["table_detection"]
+        extracted_content["table_detection"] = {
+            key: value for key, value in detection.items() if key != "decisions"
+        }
+    if "ocr" in content:
+        extracted_content["ocr"] = content["ocr"]
+    if content.get("timed_out_pages"):
+        extracted_content["timed_out_pages"] = content["timed_out_pages"]
+    
+    return extracted_content
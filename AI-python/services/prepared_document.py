@@ -0,0 +1,137 @@
+import re
+import logging
+from bisect import bisect_right
+from functools import cached_property
+from typing import List, Optional, Tuple, Union
+
+from services.document_chunker import PAGE_MARKER, WORD
+from services.multi_pattern_scanner import ignorecase_fold, required_prefixes
+
+logger = logging.getLogger(__name__)
+
+# Sentence ends as the extractive summary has always split them
+SENTENCE_END = re.compile(r'[.!?]+')
+
+# Characters that read as spaces; one-for-one, so translating moves no offsets
+SPACE_TRANSLATION = str.maketrans({"\u00a0": " ", "\u2007": " ", "\u202f": " ", "\x00": " "})
+
+
+def normalize_text(text: str) -> str:
+    """LF line endings, with non-breaking spaces and NULs as plain spaces"""
+    return text.replace("\r\n", "\n").replace("\r", "\n").translate(SPACE_TRANSLATION)
+
+
+class PreparedDocument:
+    """
+    A request's document text with the views every analysis stage needs.
+
+    Built once per request and handed to the classifier, the extractors and the
+    summarizer instead of the raw string, so each view is derived once rather
+    than once per consumer. Views are computed on first use:
+
+        lower           lowercase text (for counting; lower() can change the
+                        length of some non-ASCII text, so don't use its offsets)
+        folded          lower, with the characters re.IGNORECASE equates with
+                        ASCII letters folded too (the lower view for ASCII text)
+        token_spans     (start, end) of each whitespace-separated token
+        word_count      len(text.split()), from token_spans
+        sentence_spans  (start, end) of the text between sentence ends
+        page_offsets    (body start, page number) of each "--- Page N ---" page
+        legal_term_occurrences
+                        (LEGAL_TERMS key, start) of every legal term, for the
+                        key terms stage and the lexical search index
+
+    Pickles as the text plus whichever of SHIPPED_VIEWS are already computed,
+    which are small next to the text and slower to rebuild than to receive.
+    lower and token_spans are never shipped: each is as large as the text or
+    larger in pickled form, and a worker rebuilds it in a single C-speed pass.
+    """
+
+    SHIPPED_VIEWS = ("sentence_spans", "page_offsets", "legal_term_occurrences")
+
+    def __init__(self, text: str):
+        self.text = normalize_text(text)
+
+    @classmethod
+    def of(cls, document: Union[str, "PreparedDocument"]) -> "PreparedDocument":
+        return document if isinstance(document, cls) else cls(document)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __getstate__(self):
+        state = {"text": self.text}
+        state.update((name, self.__dict__[name]) for name in self.SHIPPED_VIEWS if name in self.__dict__)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def folded(self) -> str:
+        return self.lower if self.text.isascii() else ignorecase_fold(self.text)
+
+    @cached_property
+    def token_spans(self) -> List[Tuple[int, int]]:
+        return [match.span() for match in WORD.finditer(self.text)]
+
+    @property
+    def word_count(self) -> int:
+        return len(self.token_spans)
+
+    def words(self, limit: Optional[int] = None) -> List[str]:
+        spans = self.token_spans if limit is None else self.token_spans[:limit]
+        return [self.text[start:end] for start, end in spans]
+
+    @cached_property
+    def sentence_spans(self) -> List[Tuple[int, int]]:
+        spans = []
+        start = 0
+        for match in SENTENCE_END.finditer(self.text):
+            spans.append((start, match.start()))
+            start = match.end()
+        spans.append((start, len(self.text)))
+        return spans
+
+    def sentences(self, min_chars: int = 0) -> List[str]:
+        """Stripped sentence texts longer than min_chars"""
+        sentences = (self.text[start:end].strip() for start, end in self.sentence_spans)
+        return [sentence for sentence in sentences if len(sentence) > min_chars]
+
+    @cached_property
+    def page_offsets(self) -> List[Tuple[int, int]]:
+        return [(match.end(), int(match.group(1))) for match in PAGE_MARKER.finditer(self.text)]
+
+    @cached_property
+    def legal_term_occurrences(self) -> List[Tuple[str, int]]:
+        # Imported here because the registry's classifier imports this module
+        from services.pattern_registry import get_pattern_registry
+        return list(get_pattern_registry().get_legal_term_index().occurrences(self.text))
+
+    def first_pages(self, count: int) -> "PreparedDocument":
+        """The document up to page count + 1's marker; unchanged when it has no later page markers"""
+        for match in PAGE_MARKER.finditer(self.text):
+            if int(match.group(1)) > count:
+                return PreparedDocument(self.text[:match.start()].rstrip())
+        return self
+
+    def may_match(self, pattern: str) -> bool:
+        """
+        False when a case-insensitive pattern can't match: none of the literals
+        its matches start with (MultiPatternScanner's anchors, see
+        required_prefixes) is in the folded view. A substring search each
+        instead of a scan with the pattern, which re can't speed up with a
+        literal prefix search under IGNORECASE.
+        """
+        prefixes = required_prefixes(pattern)
+        return prefixes is None or any(prefix in self.folded for prefix in prefixes)
+
+    def page_at(self, offset: int) -> Optional[int]:
+        """Page number holding a character offset, or None before the first page marker"""
+        i = bisect_right(self.page_offsets, (offset, float("inf"))) - 1
+        return self.page_offsets[i][1] if i >= 0 else None
+
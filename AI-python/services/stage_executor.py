@@ -0,0 +1,91 @@
+import time
+import logging
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    """
+    One unit of analysis work.
+
+    The stage is called as fn(*args, *results_of_deps) on the executor named by
+    `executor`; an executor name with no registered executor runs inline on the
+    calling thread. Stages sent to a process pool need a picklable fn.
+    """
+    name: str
+    fn: Callable
+    args: Tuple = ()
+    deps: Tuple[str, ...] = ()
+    executor: str = "inline"
+
+
+def _timed_call(fn: Callable, *args) -> Tuple[Any, float]:
+    """Run fn and measure it where it executes, so timings exclude queueing"""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class StageExecutor:
+    """
+    Runs a DAG of stages, starting each as soon as all of its dependencies are done.
+
+    An executor is anything with Executor.submit, such as a BoundedExecutor;
+    an error from submit itself (PoolSaturatedError, say) cancels the running
+    stages and propagates from run().
+    """
+
+    def __init__(self, executors: Optional[Dict[str, Executor]] = None):
+        self.executors = executors or {}
+
+    def run(self, stages: List[Stage]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """Return (results, timings in seconds), both keyed by stage name"""
+        names = {stage.name for stage in stages}
+        for stage in stages:
+            missing = [dep for dep in stage.deps if dep not in names]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+
+        results: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        pending = {stage.name: stage for stage in stages}
+        running = {}
+
+        try:
+            while pending or running:
+                # Stages with an executor are submitted before inline ones run, so
+                # they overlap the inline work instead of waiting it out
+                ready = sorted(
+                    (stage for stage in pending.values() if all(dep in results for dep in stage.deps)),
+                    key=lambda stage: stage.executor not in self.executors
+                )
+                for stage in ready:
+                    del pending[stage.name]
+                    args = (*stage.args, *(results[dep] for dep in stage.deps))
+                    executor = self.executors.get(stage.executor)
+                    if executor is None:
+                        results[stage.name], timings[stage.name] = _timed_call(stage.fn, *args)
+                    else:
+                        running[executor.submit(_timed_call, stage.fn, *args)] = stage
+
+                if ready and any(stage.executor not in self.executors for stage in ready):
+                    # Inline stages may have unblocked others; schedule before waiting
+                    continue
+                if not running:
+                    if pending:
+                        raise ValueError(f"Stages with unsatisfiable dependencies: {list(pending)}")
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    results[stage.name], timings[stage.name] = future.result()
+        finally:
+            for future in running:
+                future.cancel()
+
+        return results, timings
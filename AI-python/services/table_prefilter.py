@@ -0,0 +1,74 @@
+import re
+import time
+import logging
+from typing import Any, Dict, Tuple
+
+from pdfminer.pdftypes import resolve1
+from pdfplumber.table import TableSettings
+
+logger = logging.getLogger(__name__)
+
+# Content-stream operators that can put an edge on the page: path segments
+# (l, re, c, v, y) and form XObjects (Do), which may draw paths of their own.
+# Matching inside string literals only causes a false "maybe", never a miss.
+EDGE_OPERATORS = re.compile(rb'(?<![^\s\])>])(?:l|re|c|v|y|Do)(?![^\s\[(</])')
+
+LINE_STRATEGIES = ("lines", "lines_strict")
+
+
+def _content_may_draw_edges(page) -> bool:
+    for stream in page.page_obj.contents:
+        stream = resolve1(stream)
+        data = stream.get_data() if hasattr(stream, "get_data") else b""
+        if EDGE_OPERATORS.search(data):
+            return True
+    return False
+
+
+def _count_edges(page, orientation: str, strategy: str, min_length: float) -> int:
+    edge_type = "line" if strategy == "lines_strict" else None
+    return sum(
+        1 for edge in page.edges
+        if edge["orientation"] == orientation
+        and (edge_type is None or edge["object_type"] == edge_type)
+        and edge["width" if orientation == "h" else "height"] >= min_length
+    )
+
+
+def check_page(page, tset: TableSettings) -> Tuple[bool, str]:
+    """
+    Decide whether table detection could find anything on a page.
+
+    Only skips when it is certain: for the "lines" strategies a table cell needs
+    two horizontal and two vertical edges, so a page whose content stream draws
+    no paths at all, or whose edges (before merging, at the same prefilter
+    length pdfplumber uses) don't reach two per axis, has no tables. "text" and
+    explicit strategies always run detection.
+
+    Returns:
+        (run detection, reason)
+    """
+    if tset.explicit_vertical_lines or tset.explicit_horizontal_lines:
+        return True, "explicit lines"
+    strategies = {"v": tset.vertical_strategy, "h": tset.horizontal_strategy}
+    line_axes = [axis for axis, strategy in strategies.items() if strategy in LINE_STRATEGIES]
+    if not line_axes:
+        return True, "text strategy"
+
+    # Checked before touching page.edges, which would parse the whole page
+    if not _content_may_draw_edges(page):
+        return False, "no vector paths"
+
+    for axis in line_axes:
+        count = _count_edges(page, axis, strategies[axis], tset.edge_min_length_prefilter)
+        if count < 2:
+            name = "horizontal" if axis == "h" else "vertical"
+            return False, f"{count} {name} edge{'' if count == 1 else 's'}"
+    return True, "edges on both axes"
+
+
+def timed_check(page, tset: TableSettings) -> Dict[str, Any]:
+    """check_page, as the per-page record kept under "table_detection" """
+    start = time.perf_counter()
+    run, reason = check_page(page, tset)
+    return {"ran": run, "reason": reason, "prefilter_seconds": time.perf_counter() - start}
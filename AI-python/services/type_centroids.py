@@ -0,0 +1,202 @@
+import hashlib
+import logging
+import os
+from threading import Lock
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config.settings import get_settings, MODEL_CONFIGS
+from services.document_chunker import DocumentChunker
+from services.document_type import DocumentType
+from services.prepared_document import PreparedDocument
+
+logger = logging.getLogger(__name__)
+
+
+def unit_rows(matrix: np.ndarray) -> np.ndarray:
+    """Each row scaled to unit length (zero rows stay zero)"""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+def document_vector(chunk_embeddings: np.ndarray) -> np.ndarray:
+    """One unit vector for a document: the normalized mean of its chunk embeddings"""
+    return unit_rows(np.asarray(chunk_embeddings, dtype=np.float32).mean(axis=0))
+
+
+def head_chunks(document: PreparedDocument, chunker: DocumentChunker, max_chunks: int) -> List[str]:
+    """Texts of the document's first max_chunks chunks"""
+    # Only chunk as much of the text as the first chunks can cover
+    spans = document.token_spans[:max_chunks * chunker.max_words]
+    if not spans:
+        return []
+    chunks = chunker.chunk(document.text[:spans[-1][1]])
+    return [chunk.text for chunk in chunks[:max_chunks]]
+
+
+class TypeCentroids:
+    """
+    Per-DocumentType centroid vectors in the embedding model's space.
+
+    Built offline by scripts/build_type_centroids.py from labeled example
+    documents and saved as one .npz file:
+
+        doc_types        DocumentType values, one per row
+        vectors          (types x dim) float32 unit vectors, the normalized
+                         mean of each type's example document vectors
+        self_similarity  mean cosine similarity of each type's examples to
+                         their own centroid
+        model            the embedding model the vectors came from
+
+    A document's score for a type is its cosine similarity to the centroid
+    divided by that type's self_similarity, capped at 1.0: a document as close
+    to the centroid as the type's own examples were scores 1.0. That puts the
+    scores on the same 0-1 scale as the regex classifier's, whatever the
+    model's typical similarity range is.
+    """
+
+    def __init__(self, doc_types: List[str], vectors: np.ndarray, self_similarity: np.ndarray, model: str):
+        self.doc_types = list(doc_types)
+        self.vectors = unit_rows(np.asarray(vectors, dtype=np.float32))
+        self.self_similarity = np.asarray(self_similarity, dtype=np.float32)
+        self.model = model
+
+    @classmethod
+    def build(cls, example_vectors: Dict[str, np.ndarray], model: str) -> "TypeCentroids":
+        """Centroids from each type's (examples x dim) matrix of document vectors"""
+        doc_types = sorted(example_vectors)
+        vectors, self_similarity = [], []
+        for doc_type in doc_types:
+            examples = unit_rows(np.asarray(example_vectors[doc_type], dtype=np.float32))
+            centroid = unit_rows(examples.mean(axis=0))
+            vectors.append(centroid)
+            self_similarity.append(float((examples @ centroid).mean()))
+        return cls(doc_types, np.stack(vectors), np.asarray(self_similarity), model)
+
+    @classmethod
+    def load(cls, path: str) -> "TypeCentroids":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                [str(doc_type) for doc_type in data["doc_types"]],
+                data["vectors"],
+                data["self_similarity"],
+                str(data["model"])
+            )
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                doc_types=np.asarray(self.doc_types),
+                vectors=self.vectors,
+                self_similarity=self.self_similarity,
+                model=np.asarray(self.model)
+            )
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+    def scores(self, vector: np.ndarray) -> Dict[str, float]:
+        """Calibrated 0-1 score of a document vector for each type"""
+        similarity = self.vectors @ vector
+        calibrated = similarity / np.maximum(self.self_similarity, 1e-6)
+        return dict(zip(self.doc_types, np.clip(calibrated, 0.0, 1.0).tolist()))
+
+
+class EmbeddingTypeScorer:
+    """
+    Scores a document against TypeCentroids from the embeddings of its first
+    chunks: the opening pages are where a document says what it is, and a
+    bounded number of chunks keeps this to one batched embedding call.
+    """
+
+    def __init__(self, centroids: TypeCentroids, max_chunks: int = 4,
+                 max_words: int = 250, overlap_words: int = 50):
+        self.centroids = centroids
+        self.max_chunks = max_chunks
+        self.chunker = DocumentChunker(max_words, overlap_words)
+
+    def score(self, document: PreparedDocument, embed_matrix) -> Dict[DocumentType, float]:
+        """
+        Args:
+            embed_matrix: callable embedding a list of texts into a
+                (texts x dim) array, such as MLService.get_embedding_matrix
+
+        Returns:
+            Calibrated score per DocumentType with a centroid; empty for an empty document
+        """
+        texts = head_chunks(document, self.chunker, self.max_chunks)
+        if not texts:
+            return {}
+        vector = document_vector(embed_matrix(texts))
+        if vector.shape[-1] != self.centroids.dim:
+            raise ValueError(f"Embedding has {vector.shape[-1]} dimensions, centroids have {self.centroids.dim}")
+        return {DocumentType(doc_type): score for doc_type, score in self.centroids.scores(vector).items()}
+
+
+def load_type_centroids(path: str, model: str) -> Optional[TypeCentroids]:
+    """Centroids from path, or None (with a warning) when missing or built for another model"""
+    if not os.path.exists(path):
+        logger.warning(f"No document type centroids at {path}, classifying with regex patterns only")
+        return None
+    try:
+        centroids = TypeCentroids.load(path)
+    except Exception as e:
+        logger.warning(f"Could not load document type centroids from {path}: {e}")
+        return None
+    if centroids.model != model:
+        # Vectors from different models aren't comparable
+        logger.warning(f"Document type centroids at {path} were built with {centroids.model}, "
+                       f"not {model}; classifying with regex patterns only")
+        return None
+    unknown = [doc_type for doc_type in centroids.doc_types if doc_type not in DocumentType._value2member_map_]
+    if unknown:
+        logger.warning(f"Document type centroids at {path} have unknown types {unknown}")
+        return None
+    logger.info(f"Loaded {len(centroids.doc_types)} document type centroids from {path}")
+    return centroids
+
+
+_type_scorer = None
+_type_scorer_loaded = False
+_type_scorer_lock = Lock()
+
+def get_embedding_type_scorer() -> Optional[EmbeddingTypeScorer]:
+    """The shared scorer, or None when classification is regex-only or has no centroids"""
+    global _type_scorer, _type_scorer_loaded
+    with _type_scorer_lock:
+        if not _type_scorer_loaded:
+            settings = get_settings()
+            if settings.classifier_mode == "hybrid":
+                centroids = load_type_centroids(settings.type_centroids_path, MODEL_CONFIGS["embedding"]["model_name"])
+                if centroids is not None:
+                    _type_scorer = EmbeddingTypeScorer(
+                        centroids,
+                        settings.classification_max_chunks,
+                        settings.chunk_max_words,
+                        settings.chunk_overlap_words
+                    )
+            _type_scorer_loaded = True
+    return _type_scorer
+
+
+_centroids_versions: Dict[str, str] = {}
+
+def type_centroids_version(path: str) -> str:
+    """
+    Hash of the centroids file at path ("none" without one), for keying
+    cached analyses so they go stale when the centroids are rebuilt. Read
+    once per process, as the centroids themselves are.
+    """
+    version = _centroids_versions.get(path)
+    if version is None:
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                version = hashlib.sha256(f.read()).hexdigest()[:16]
+        else:
+            version = "none"
+        _centroids_versions[path] = version
+    return version
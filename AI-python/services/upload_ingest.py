@@ -0,0 +1,78 @@
+import os
+import hashlib
+import logging
+import tempfile
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from fastapi import UploadFile
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class IngestedUpload:
+    """
+    An uploaded document, either held in memory or spooled once to disk.
+
+    `source` is what the PDF extractor should open: the bytes themselves, or
+    the path of the spool file for uploads past the in-memory limit.
+    """
+    sha256: str
+    size: int
+    content: Optional[bytes] = None
+    path: Optional[str] = None
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        return self.content if self.content is not None else self.path
+
+    def cleanup(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+            self.path = None
+
+
+async def ingest_upload(file: UploadFile, max_in_memory_bytes: int, suffix: str = "") -> IngestedUpload:
+    """
+    Read an upload in chunks, hashing as it streams.
+
+    Uploads up to max_in_memory_bytes stay in memory and never touch the
+    filesystem. Past that, what was read so far and the rest of the stream
+    go to a single spool file, without buffering the whole upload first.
+    """
+    digest = hashlib.sha256()
+    chunks = []
+    size = 0
+    spool = None
+
+    try:
+        while True:
+            chunk = await file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+            if spool is None and size > max_in_memory_bytes:
+                spool = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+                spool.writelines(chunks)
+                chunks = []
+            if spool is not None:
+                spool.write(chunk)
+            else:
+                chunks.append(chunk)
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            os.remove(spool.name)
+        raise
+
+    if spool is not None:
+        spool.close()
+        logger.info(f"Spooled {size} byte upload to {spool.name}")
+        return IngestedUpload(sha256=digest.hexdigest(), size=size, path=spool.name)
+
+    content = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+    return IngestedUpload(sha256=digest.hexdigest(), size=size, content=content)
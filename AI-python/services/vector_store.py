@@ -0,0 +1,466 @@
+import os
+import json
+import logging
+from dataclasses import dataclass, asdict
+from threading import Lock
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config.settings import get_settings
+from services.document_chunker import TextChunk
+from services.type_centroids import unit_rows
+
+logger = logging.getLogger(__name__)
+
+ASSIGN_BATCH_ROWS = 16384  # rows scored against the centroids per matmul while assigning
+
+
+@dataclass
+class SearchHit:
+    """A chunk matching a query; start/end are character offsets into its document's text"""
+    doc_id: str
+    chunk_index: int
+    score: float
+    start: int
+    end: int
+    page: Optional[int]
+    text: Optional[str] = None
+
+    def to_dict(self, include_text: bool = True) -> Dict:
+        data = asdict(self)
+        if not include_text:
+            del data["text"]
+        return data
+
+
+class IVFIndex:
+    """
+    Inverted-file index: every row is filed under its nearest of nlist k-means
+    centroids, and a query scores only the rows filed under its nprobe
+    nearest centroids. Rows are never removed from the lists; the store masks
+    deleted ones and rebuilds the lists when it compacts.
+    """
+
+    def __init__(self, centroids: np.ndarray, trained_rows: int):
+        self.centroids = centroids
+        self.trained_rows = trained_rows
+        self._lists: List[List[np.ndarray]] = [[] for _ in range(len(centroids))]
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, nlist: int, iterations: int = 10, seed: int = 0) -> "IVFIndex":
+        """Spherical k-means over a sample of unit vectors (64 per centroid)"""
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(vectors), nlist * 64)
+        sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))])
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(assignments, kind="stable")
+            counts = np.bincount(assignments, minlength=nlist)
+            filled = np.flatnonzero(counts)
+            sums = np.add.reduceat(sample[order], np.concatenate(([0], np.cumsum(counts)[:-1]))[filled], axis=0)
+            centroids[filled] = unit_rows(sums)
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                centroids[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+        return cls(centroids.astype(np.float32), len(vectors))
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), ASSIGN_BATCH_ROWS):
+            block = np.asarray(vectors[start:start + ASSIGN_BATCH_ROWS])
+            assignments[start:start + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+        return assignments
+
+    def add(self, rows: np.ndarray, assignments: np.ndarray):
+        order = np.argsort(assignments, kind="stable")
+        lists, starts = np.unique(assignments[order], return_index=True)
+        for list_id, part in zip(lists, np.split(rows[order], starts[1:])):
+            self._lists[list_id].append(part)
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Rows filed under the nprobe centroids nearest the query"""
+        nprobe = min(nprobe, self.nlist)
+        probed = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        parts = [part for list_id in probed for part in self._lists[list_id]]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+class VectorStore:
+    """
+    Chunk embeddings of indexed documents, searchable by cosine similarity.
+
+    Vectors are unit-normalized rows of one contiguous float32 matrix, so an
+    exact search is a single matmul followed by a top-k partition. Past
+    ivf_threshold live rows an IVFIndex is trained, and searches score only
+    the rows under the query's nprobe nearest centroids unless exact is asked
+    for. Adding a document replaces its earlier chunks; deleted rows are
+    masked, and reclaimed once they are half the matrix.
+
+    With a directory, the matrix is a memory-mapped file (vectors.f32) that
+    grows by doubling, chunk metadata is an append-only log (chunks.jsonl,
+    which also holds the text) and meta.json records the committed row count,
+    so a store reopens where it left off. The IVF index is retrained on open.
+    Without one, everything lives in memory.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ivf_threshold: int = 100_000, nprobe: int = 16):
+        self.directory = directory
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.dim: Optional[int] = None
+        self.rows = 0
+        self._matrix: Optional[np.ndarray] = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._chunk_index = np.zeros(0, dtype=np.int32)
+        self._start = np.zeros(0, dtype=np.int64)
+        self._end = np.zeros(0, dtype=np.int64)
+        self._page = np.zeros(0, dtype=np.int32)  # -1 for chunks outside page framing
+        self._row_docs: List[Optional[str]] = []
+        self._texts: List[Optional[str]] = []  # in memory only; with a directory, see _offsets
+        self._offsets = np.zeros(0, dtype=np.int64)  # row -> byte offset of its line in chunks.jsonl
+        self._doc_rows: Dict[str, np.ndarray] = {}
+        self._ivf: Optional[IVFIndex] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._lock = Lock()
+        self._searches = 0
+        self._ivf_searches = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._open_existing()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    # Storage
+
+    def _open_existing(self):
+        if not os.path.exists(self._path("meta.json")):
+            return
+        with open(self._path("meta.json")) as f:
+            meta = json.load(f)
+        committed = meta["rows"]
+        self.dim = meta["dim"]
+        self._matrix = np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="r+",
+                                 shape=(meta["capacity"], self.dim))
+        self._resize_metadata(meta["capacity"])
+
+        # Replaying adds and deletes in order leaves each document's latest rows
+        doc_rows: Dict[str, List[int]] = {}
+        uncommitted = False
+        with open(self._path("chunks.jsonl"), "rb") as f:
+            offset = 0
+            for line in f:
+                record = json.loads(line)
+                if "deleted" in record:
+                    for row in doc_rows.pop(record["deleted"], []):
+                        self._alive[row] = False
+                        self._row_docs[row] = None
+                elif record["row"] >= committed:
+                    uncommitted = True  # written after the last commit of meta.json
+                else:
+                    self._set_row(record["row"], record["doc_id"], record, None, offset)
+                    doc_rows.setdefault(record["doc_id"], []).append(record["row"])
+                offset += len(line)
+        self._doc_rows = {doc_id: np.array(rows, dtype=np.int64) for doc_id, rows in doc_rows.items()}
+        self.rows = committed
+        logger.info(f"Opened vector store at {self.directory}: {len(self._doc_rows)} documents, "
+                    f"{self.live_rows} chunks")
+        if uncommitted or self.live_rows * 2 < self.rows:
+            self._compact()
+        self._maybe_train()
+
+    def _grow(self, needed: int):
+        capacity = len(self._alive)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 1024)
+        if self.directory:
+            if self._matrix is not None:
+                self._matrix.flush()
+                self._matrix = None
+            with open(self._path("vectors.f32"), "ab") as f:
+                f.truncate(new_capacity * self.dim * 4)  # sparse until rows are written
+            self._matrix = np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="r+",
+                                     shape=(new_capacity, self.dim))
+        else:
+            matrix = np.empty((new_capacity, self.dim), dtype=np.float32)
+            if self._matrix is not None:
+                matrix[:self.rows] = self._matrix[:self.rows]
+            self._matrix = matrix
+        self._resize_metadata(new_capacity)
+
+    def _resize_metadata(self, capacity: int):
+        grow = capacity - len(self._alive)
+        self._alive = np.concatenate([self._alive, np.zeros(grow, dtype=bool)])
+        self._chunk_index = np.concatenate([self._chunk_index, np.zeros(grow, dtype=np.int32)])
+        self._start = np.concatenate([self._start, np.zeros(grow, dtype=np.int64)])
+        self._end = np.concatenate([self._end, np.zeros(grow, dtype=np.int64)])
+        self._page = np.concatenate([self._page, np.full(grow, -1, dtype=np.int32)])
+        self._offsets = np.concatenate([self._offsets, np.zeros(grow, dtype=np.int64)])
+        self._assignments = np.concatenate([self._assignments, np.full(grow, -1, dtype=np.int32)])
+        self._row_docs.extend([None] * grow)
+        self._texts.extend([None] * grow)
+
+    def _set_row(self, row: int, doc_id: str, chunk: Dict, text: Optional[str], offset: int):
+        self._alive[row] = True
+        self._chunk_index[row] = chunk["chunk_index"]
+        self._start[row] = chunk["start"]
+        self._end[row] = chunk["end"]
+        self._page[row] = -1 if chunk["page"] is None else chunk["page"]
+        self._offsets[row] = offset
+        self._row_docs[row] = doc_id
+        self._texts[row] = text
+
+    def _forget(self, doc_id: str) -> bool:
+        rows = self._doc_rows.pop(doc_id, None)
+        if rows is None:
+            return False
+        self._alive[rows] = False
+        for row in rows:
+            self._row_docs[row] = None
+            self._texts[row] = None
+        return True
+
+    def _append_log(self, records: List[Dict]) -> List[int]:
+        """Append records to chunks.jsonl; returns the byte offset of each line"""
+        offsets = []
+        with open(self._path("chunks.jsonl"), "ab") as f:
+            for record in records:
+                offsets.append(f.tell())
+                f.write(json.dumps(record).encode() + b"\n")
+        return offsets
+
+    def _commit(self):
+        with open(self._path("meta.json"), "w") as f:
+            json.dump({"dim": self.dim, "rows": self.rows, "capacity": len(self._alive)}, f)
+
+    def _compact(self):
+        """Move live rows to the front of the matrix and rewrite the log without deleted ones"""
+        live = np.flatnonzero(self._alive[:self.rows])
+        texts = self._read_texts(live)
+        for start in range(0, len(live), ASSIGN_BATCH_ROWS):
+            # Sources are never before their destinations, so earlier blocks can't clobber later ones
+            block = live[start:start + ASSIGN_BATCH_ROWS]
+            self._matrix[start:start + len(block)] = self._matrix[block]
+        for array in (self._chunk_index, self._start, self._end, self._page, self._assignments):
+            array[:len(live)] = array[live]
+        self._alive[:] = False
+        self._alive[:len(live)] = True
+        row_docs = [self._row_docs[row] for row in live]
+        capacity = len(self._alive)
+        self._row_docs = row_docs + [None] * (capacity - len(live))
+        self._texts = [None] * capacity
+        self.rows = len(live)
+        doc_rows: Dict[str, List[int]] = {}
+        for row, doc_id in enumerate(row_docs):
+            doc_rows.setdefault(doc_id, []).append(row)
+        self._doc_rows = {doc_id: np.array(rows, dtype=np.int64) for doc_id, rows in doc_rows.items()}
+
+        if self.directory:
+            self._matrix.flush()
+            temporary = self._path("chunks.jsonl.tmp")
+            with open(temporary, "wb") as f:
+                for row, text in enumerate(texts):
+                    self._offsets[row] = f.tell()
+                    f.write(json.dumps(self._record(row, text)).encode() + b"\n")
+            os.replace(temporary, self._path("chunks.jsonl"))
+            self._commit()
+        else:
+            self._texts[:len(live)] = texts
+
+        if self._ivf is not None:
+            self._ivf = IVFIndex(self._ivf.centroids, self._ivf.trained_rows)
+            self._ivf.add(np.arange(self.rows), self._assignments[:self.rows])
+        logger.info(f"Compacted vector store to {self.rows} chunks")
+
+    def _record(self, row: int, text: Optional[str]) -> Dict:
+        page = int(self._page[row])
+        return {
+            "row": row,
+            "doc_id": self._row_docs[row],
+            "chunk_index": int(self._chunk_index[row]),
+            "start": int(self._start[row]),
+            "end": int(self._end[row]),
+            "page": None if page < 0 else page,
+            "text": text
+        }
+
+    def _read_texts(self, rows: np.ndarray) -> List[Optional[str]]:
+        if not self.directory:
+            return [self._texts[row] for row in rows]
+        texts = []
+        with open(self._path("chunks.jsonl"), "rb") as f:
+            for row in rows:
+                f.seek(self._offsets[row])
+                texts.append(json.loads(f.readline())["text"])
+        return texts
+
+    # IVF
+
+    def _maybe_train(self):
+        """Train the IVF index at ivf_threshold live rows, and retrain it each time they quadruple"""
+        live = self.live_rows
+        if live < self.ivf_threshold or (self._ivf is not None and live < self._ivf.trained_rows * 4):
+            return
+        if live * 2 < self.rows:
+            self._compact()
+        nlist = max(1, int(np.sqrt(self.rows)))
+        self._ivf = IVFIndex.train(self._matrix[:self.rows], nlist)
+        self._assignments[:self.rows] = self._ivf.assign(self._matrix[:self.rows])
+        self._ivf.add(np.arange(self.rows), self._assignments[:self.rows])
+        logger.info(f"Trained IVF index over {self.rows} chunks with {nlist} lists")
+
+    # Public API
+
+    @property
+    def live_rows(self) -> int:
+        return int(self._alive[:self.rows].sum())
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_rows
+
+    def add(self, doc_id: str, chunks: List[TextChunk], embeddings: np.ndarray) -> int:
+        """Index a document's chunks, replacing any it had; returns the number indexed"""
+        if not chunks:
+            # Nothing to reshape (an empty array has no row width); just drop what it had
+            with self._lock:
+                self._delete(doc_id)
+            return 0
+        embeddings = unit_rows(np.asarray(embeddings, dtype=np.float32).reshape(len(chunks), -1))
+        with self._lock:
+            if self.dim is None:
+                self.dim = embeddings.shape[1]
+            if embeddings.shape[1] != self.dim:
+                raise ValueError(f"Embeddings have {embeddings.shape[1]} dimensions, the store holds {self.dim}")
+            self._delete(doc_id)
+
+            rows = np.arange(self.rows, self.rows + len(chunks))
+            self._grow(self.rows + len(chunks))
+            self._matrix[rows[0]:rows[-1] + 1] = embeddings
+            records = [
+                {"row": int(row), "doc_id": doc_id, "chunk_index": chunk.index, "start": chunk.start,
+                 "end": chunk.end, "page": chunk.page, "text": chunk.text}
+                for row, chunk in zip(rows, chunks)
+            ]
+            offsets = [0] * len(chunks)
+            if self.directory:
+                self._matrix.flush()
+                offsets = self._append_log(records)
+            for row, record, chunk, offset in zip(rows, records, chunks, offsets):
+                self._set_row(row, doc_id, record, None if self.directory else chunk.text, offset)
+            self._doc_rows[doc_id] = rows
+            self.rows += len(chunks)
+            if self.directory:
+                self._commit()
+
+            if self._ivf is not None:
+                self._assignments[rows] = self._ivf.assign(embeddings)
+                self._ivf.add(rows, self._assignments[rows])
+            self._maybe_train()
+            return len(chunks)
+
+    def delete(self, doc_id: str) -> bool:
+        with self._lock:
+            return self._delete(doc_id)
+
+    def _delete(self, doc_id: str) -> bool:
+        if not self._forget(doc_id):
+            return False
+        if self.directory:
+            self._append_log([{"deleted": doc_id}])
+        if self.live_rows * 2 < self.rows:
+            self._compact()
+        return True
+
+    def search(self, query: np.ndarray, top_k: int = 5, doc_ids: Optional[List[str]] = None,
+               exact: bool = False, include_text: bool = True) -> List[SearchHit]:
+        """
+        The top_k chunks most similar to the query embedding, best first.
+
+        doc_ids restricts the search to those documents (always scored
+        exactly); exact skips the IVF index.
+        """
+        query = unit_rows(np.asarray(query, dtype=np.float32).ravel())
+        with self._lock:
+            self._searches += 1
+            if self.dim is None or top_k <= 0:
+                return []
+            if query.shape[0] != self.dim:
+                raise ValueError(f"Query has {query.shape[0]} dimensions, the store holds {self.dim}")
+
+            candidates = None
+            if doc_ids is not None:
+                parts = [self._doc_rows[doc_id] for doc_id in doc_ids if doc_id in self._doc_rows]
+                candidates = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+            elif self._ivf is not None and not exact:
+                probed = self._ivf.candidates(query, self.nprobe)
+                probed = probed[self._alive[probed]]
+                if len(probed) >= top_k:
+                    candidates = probed
+                    self._ivf_searches += 1
+
+            if candidates is None:
+                scores = self._matrix[:self.rows] @ query
+                scores[~self._alive[:self.rows]] = -np.inf
+                rows = np.arange(self.rows)
+            else:
+                scores = self._matrix[candidates] @ query
+                rows = candidates
+
+            top_k = min(top_k, int(np.isfinite(scores).sum()))
+            if top_k == 0:
+                return []
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            hit_rows = rows[best]
+            texts = self._read_texts(hit_rows) if include_text else [None] * len(hit_rows)
+            return [
+                SearchHit(
+                    doc_id=self._row_docs[row],
+                    chunk_index=int(self._chunk_index[row]),
+                    score=round(float(score), 6),
+                    start=int(self._start[row]),
+                    end=int(self._end[row]),
+                    page=None if self._page[row] < 0 else int(self._page[row]),
+                    text=text
+                )
+                for row, score, text in zip(hit_rows, scores[best], texts)
+            ]
+
+    def similarity_search(self, query_embedding: List[float], top_k: int = 3) -> List[SearchHit]:
+        return self.search(np.asarray(query_embedding, dtype=np.float32), top_k)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "documents": len(self._doc_rows),
+                "chunks": self.live_rows,
+                "rows": self.rows,
+                "dim": self.dim,
+                "matrix_bytes": self.rows * (self.dim or 0) * 4,
+                "ivf_lists": self._ivf.nlist if self._ivf is not None else 0,
+                "searches": self._searches,
+                "ivf_searches": self._ivf_searches
+            }
+
+
+_vector_store = None
+_vector_store_lock = Lock()
+
+def get_vector_store() -> VectorStore:
+    global _vector_store
+    with _vector_store_lock:
+        if _vector_store is None:
+            settings = get_settings()
+            _vector_store = VectorStore(
+                settings.vector_store_dir,
+                settings.vector_store_ivf_threshold,
+                settings.vector_store_nprobe
+            )
+    return _vector_store
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturatedError(Exception):
+    """Raised instead of queueing when a worker pool already has its maximum pending tasks"""
+
+    def __init__(self, pool_name: str, max_pending: int):
+        self.pool_name = pool_name
+        self.max_pending = max_pending
+        super().__init__(f"The {pool_name} worker pool is at capacity ({max_pending} pending tasks)")
+
+
+class BoundedExecutor:
+    """
+    An executor that async endpoints can await, with a cap on running plus queued tasks.
+
+    Past the cap, run() raises PoolSaturatedError right away so the endpoint can
+    shed load instead of letting requests pile up behind a slow model or PDF.
+    """
+
+    def __init__(self, name: str, executor: Executor, workers: int, max_pending: int):
+        self.name = name
+        self.executor = executor
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._rejected = 0
+        self._lock = Lock()
+
+    async def run(self, fn: Callable, *args) -> Any:
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Submit from synchronous code, with the same cap and accounting as run()"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PoolSaturatedError(self.name, self.max_pending)
+            self._pending += 1
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future: Optional[Future] = None):
+        with self._lock:
+            self._pending -= 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "rejected": self._rejected
+            }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class WorkerPools:
+    """
+    The pools that keep CPU-bound work off the event loop.
+
+    inference: threads for torch models (torch releases the GIL while it computes)
+    pdf:       processes for pdfplumber parsing, which is pure Python; large
+               PDFs are split into page-range shards across them
+    analysis:  threads that drive DocumentAnalysisService, whose regex stages
+               run on its own process pool, and PDF extraction sharding
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self.inference = BoundedExecutor(
+            "inference",
+            ThreadPoolExecutor(max_workers=settings.inference_workers, thread_name_prefix="inference"),
+            settings.inference_workers,
+            settings.inference_max_pending
+        )
+        self.pdf = BoundedExecutor(
+            "pdf",
+            ProcessPoolExecutor(
+                max_workers=settings.pdf_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            ),
+            settings.pdf_workers,
+            settings.pdf_max_pending
+        )
+        self.analysis = BoundedExecutor(
+            "analysis",
+            ThreadPoolExecutor(max_workers=settings.analysis_workers, thread_name_prefix="analysis"),
+            settings.analysis_workers,
+            settings.analysis_max_pending
+        )
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {pool.name: pool.stats() for pool in (self.inference, self.pdf, self.analysis)}
+
+    def shutdown(self):
+        for pool in (self.inference, self.pdf, self.analysis):
+            pool.shutdown()
+
+
+_worker_pools = None
+_worker_pools_lock = Lock()
+
+def get_worker_pools() -> WorkerPools:
+    global _worker_pools
+    with _worker_pools_lock:
+        if _worker_pools is None:
+            _worker_pools = WorkerPools()
+        return _worker_pools